@@ -0,0 +1,10 @@
+import os
+
+from .utilities import cgroup
+
+# Polars sizes its thread pool when it is first imported, so the pool is capped at the
+# container's CPU quota before any module imports it. POLARS_MAX_THREADS still wins.
+os.environ.setdefault(
+    "POLARS_MAX_THREADS",
+    str(cgroup.get_thread_count(os.environ.get("BORDERLANDS_RUNTIME_CPUS"))),
+)
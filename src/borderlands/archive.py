@@ -0,0 +1,194 @@
+"""
+Module for compacting the daily Oryx snapshots into monthly archives.
+"""
+
+import datetime
+import io
+import shutil
+import tempfile
+from pathlib import Path
+
+import polars as pl
+from prefect import task
+from prefecto.logging import get_prefect_or_default_logger
+
+from . import paths
+from .blocks import blocks
+from .definitions import EquipmentLoss
+from .schema import Tag, profiles
+from .utilities import io_, misc, multipart
+
+
+def iter_months(start: datetime.date, end: datetime.date):
+    """Iterates over the first day of each month between `start` and `end`, inclusive.
+
+    Args:
+        start (datetime.date): A date in the first month.
+        end (datetime.date): A date in the last month.
+
+    Yields:
+        datetime.date: The first day of each month.
+    """
+    dt = datetime.date(start.year, start.month, 1)
+    while dt <= end:
+        yield dt
+        dt = datetime.date(dt.year + dt.month // 12, dt.month % 12 + 1, 1)
+
+
+@task
+def list_daily_snapshots(dt: datetime.date) -> list[str]:
+    """Lists the keys of the daily Oryx snapshots in the month of `dt`.
+
+    Args:
+        dt (datetime.date): A date in the month to list.
+
+    Returns:
+        list[str]: The sorted snapshot keys.
+    """
+    folder = f"oryx/{misc.build_datetime_key(dt, 'month')}/"
+    objects = io_.list_bucket.fn(blocks.bucket, folder=folder)
+    return sorted(obj["Key"] for obj in objects if obj["Key"].endswith(".parquet"))
+
+
+@task
+def download_snapshot(key: str) -> pl.DataFrame:
+    """Downloads an Oryx snapshot.
+
+    Args:
+        key (str): The key of the snapshot.
+
+    Returns:
+        pl.DataFrame: The snapshot following `EquipmentLoss`.
+    """
+    with io.BytesIO() as buffer:
+        blocks.bucket.download_object_to_file_object(key, buffer)
+        buffer.seek(0)
+        return pl.read_parquet(buffer, columns=EquipmentLoss.columns())
+
+
+def scan_snapshots(keys: list[str]) -> pl.LazyFrame:
+    """Lazily scans the daily snapshots as one frame.
+
+    Args:
+        keys (list[str]): The keys of the snapshots.
+
+    Returns:
+        pl.LazyFrame: The snapshots following `EquipmentLoss`.
+    """
+    return pl.concat(
+        [
+            io_.scan_parquet(blocks.bucket, key).select(EquipmentLoss.columns())
+            for key in keys
+        ],
+        how="vertical_relaxed",
+    )
+
+
+def get_row_group_size(lf: pl.LazyFrame) -> int:
+    """Gets a row group size that keeps each row group within one or two `as_of_date`s.
+
+    Args:
+        lf (pl.LazyFrame): The snapshots.
+
+    Returns:
+        int: The number of rows in the largest daily snapshot.
+    """
+    count = (
+        lf.group_by(EquipmentLoss.as_of_date.name)
+        .len()
+        .select(pl.col("len").max())
+        .collect()
+        .item()
+    )
+    return max(int(count or 0), 1)
+
+
+@task
+def compact_snapshots(keys: list[str], dt: datetime.date) -> str:
+    """Folds the daily snapshots into the month's archive, sorted by the `as_of_date`
+    and the dimensions so that each row group covers a narrow range of dates. The
+    snapshots are scanned lazily and the sorted archive is streamed to a local file
+    before it is uploaded, so the month is never held in memory.
+
+    Args:
+        keys (list[str]): The keys of the daily snapshots.
+        dt (datetime.date): A date in the month of the archive.
+
+    Returns:
+        str: The key the archive was uploaded to.
+    """
+    logger = get_prefect_or_default_logger()
+    lf = scan_snapshots(keys)
+    row_group_size = get_row_group_size(lf)
+    lf = lf.sort(
+        [EquipmentLoss.as_of_date.name] + EquipmentLoss.columns(include=[Tag.dimension])
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "archive.parquet"
+        profiles.ARCHIVE.sink(lf, path, row_group_size=row_group_size)
+        key = paths.create_archive_key(dt)
+        with (
+            open(path, "rb") as f,
+            multipart.MultipartWriter(blocks.bucket, key) as writer,
+        ):
+            shutil.copyfileobj(f, writer, multipart.DEFAULT_PART_SIZE)
+    logger.info("Compacted %s snapshots into '%s'", len(keys), writer.key)
+    return writer.key
+
+
+@task
+def delete_snapshots(keys: list[str]) -> None:
+    """Deletes the daily snapshots that were compacted.
+
+    Args:
+        keys (list[str]): The keys of the snapshots.
+    """
+    logger = get_prefect_or_default_logger()
+    client = blocks.bucket.credentials.get_s3_client()
+    # DeleteObjects accepts up to 1000 keys per request
+    for i in range(0, len(keys), 1000):
+        client.delete_objects(
+            Bucket=blocks.bucket.bucket_name,
+            Delete={"Objects": [{"Key": key} for key in keys[i : i + 1000]]},
+        )
+    logger.info("Deleted %s compacted snapshots", len(keys))
+
+
+@task
+def read_archive(start: datetime.date, end: datetime.date) -> pl.DataFrame:
+    """Reads the archived snapshots between `start` and `end`, inclusive. Only the
+    archives of the months in the range are scanned, and only their row groups in the
+    range are downloaded. Days whose content did not
+    change have no snapshot; the latest earlier `as_of_date` holds their content.
+
+    Args:
+        start (datetime.date): The first `as_of_date` to read.
+        end (datetime.date): The last `as_of_date` to read.
+
+    Returns:
+        pl.DataFrame: The snapshots in the date range.
+    """
+    logger = get_prefect_or_default_logger()
+    archives = {
+        obj["Key"] for obj in io_.list_bucket.fn(blocks.bucket, folder="archive/oryx/")
+    }
+    frames = [pl.LazyFrame(schema=EquipmentLoss.schema())]
+    for dt in iter_months(start, end):
+        key = paths.create_archive_key(dt)
+        if key not in archives:
+            logger.warning("No archive found at '%s'", key)
+            continue
+        frames.append(
+            io_.scan_parquet(blocks.bucket, key).select(EquipmentLoss.columns())
+        )
+    # Compared as datetimes, so the row group statistics skip the other days
+    since = datetime.datetime.combine(start, datetime.time())
+    until = datetime.datetime.combine(end + datetime.timedelta(days=1), datetime.time())
+    return (
+        pl.concat(frames, how="vertical_relaxed")
+        .filter(
+            (EquipmentLoss.as_of_date.col >= since)
+            & (EquipmentLoss.as_of_date.col < until)
+        )
+        .collect()
+    )
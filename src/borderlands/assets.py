@@ -4,17 +4,41 @@ Module for loading static assets in the pipeline's folder.
 
 from __future__ import annotations
 
+import functools
 import json
-from typing import Dict
+from pathlib import Path
+from typing import Callable, Dict
 
 import polars as pl
 from prefect import task
+from prefect.context import TaskRunContext
+from prefect.utilities.hashing import hash_objects
 
 from .blocks import blocks
+from .utilities import cache, results
+
+
+@functools.lru_cache(maxsize=16)
+def read_cached_asset(path: Path) -> bytes:
+    """Reads an asset from the local cache and keeps it in memory. Cache entries are
+    named by their content, so a path always holds the same asset version.
+
+    Parameters
+    ----------
+    path : Path
+        Path to the cache entry
+
+    Returns
+    -------
+    bytes
+        Asset
+    """
+    return path.read_bytes()
 
 
 def get_asset(asset_name: str) -> bytes:
-    """Gets the asset from the assets folder.
+    """Gets the asset from the assets folder. The asset is revalidated against the
+    bucket on every call, but only downloaded and read when it changed.
 
     Parameters
     ----------
@@ -26,10 +50,61 @@ def get_asset(asset_name: str) -> bytes:
     bytes
         Asset
     """
-    return blocks.bucket.read_path(f"assets/{asset_name}")
+    key = f"assets/{asset_name}"
+    if not cache.settings.enabled:
+        return blocks.bucket.read_path(key)
+    return read_cached_asset(cache.cache.get(blocks.bucket, key))
+
+
+def get_asset_version(asset_name: str) -> str:
+    """Gets the version of the asset in the bucket, without downloading it.
+
+    Parameters
+    ----------
+    asset_name : str
+        Name of the asset in the assets folder
+
+    Returns
+    -------
+    str
+        The asset's ETag
+    """
+    client = blocks.bucket.credentials.get_s3_client()
+    head = client.head_object(
+        Bucket=blocks.bucket.bucket_name,
+        Key=blocks.bucket._resolve_path(f"assets/{asset_name}"),
+    )
+    return head["ETag"]
+
+
+def asset_cache_key(asset_name: str) -> Callable[[TaskRunContext, dict], str | None]:
+    """Makes a task cache key that changes when the asset does.
+
+    Parameters
+    ----------
+    asset_name : str
+        Name of the asset the task loads
+
+    Returns
+    -------
+    Callable[[TaskRunContext, dict], str | None]
+        The cache key function
+    """
+
+    def cache_key_fn(context: TaskRunContext, arguments: dict) -> str | None:
+        return hash_objects(
+            results.content_input_hash(context, arguments),
+            get_asset_version(asset_name),
+        )
+
+    return cache_key_fn
 
 
-@task
+@task(
+    **results.cached_result_options(
+        cache_key_fn=asset_cache_key("country_of_production_url_mapping.json")
+    )
+)
 def get_country_of_production_url_mapper() -> Dict[str, str]:
     """Gets the country of production URL mapper from the assets folder.
 
@@ -51,7 +126,12 @@ def get_country_of_production_url_mapper() -> Dict[str, str]:
     return {url: lookup["Alpha-3"] for url, lookup in mapper.items()}
 
 
-@task
+@task(
+    **results.cached_result_options(
+        results.ParquetSerializer(),
+        cache_key_fn=asset_cache_key("category_corrections.csv"),
+    )
+)
 def get_category_corrections() -> pl.DataFrame:
     """Gets the category corrections from the assets folder.
 
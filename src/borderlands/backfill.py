@@ -0,0 +1,284 @@
+"""
+Module for reprocessing the daily Oryx snapshots after the mappings they were
+processed with change.
+"""
+
+from __future__ import annotations
+
+import dataclasses as dc
+import datetime
+import hashlib
+import inspect
+import json
+import multiprocessing
+import re
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
+
+from prefecto.logging import get_prefect_or_default_logger
+
+from . import archive, library, oryx, runtime, snapshots
+from .blocks import blocks
+from .utilities import io_, tasks
+
+# The folder the markers of the reprocessed snapshots are kept in
+BACKFILL_FOLDER = "backfill"
+# Worker processes are replaced after this many snapshots, which returns the memory
+# polars and the allocator hold on to
+SNAPSHOTS_PER_PROCESS = 16
+SNAPSHOT_KEY_PATTERN = re.compile(
+    r"^oryx/year=\d{4}/month=\d{2}/(?P<date>\d{4}-\d{2}-\d{2})\.parquet$"
+)
+
+
+@dc.dataclass(frozen=True)
+class BackfillResult:
+    """A reprocessed snapshot.
+
+    Attributes:
+        key (str): The key of the snapshot.
+        rows (int): The number of losses in the snapshot.
+        changed (bool): Whether reprocessing changed the snapshot's content.
+        content_hash (str): The canonical content hash of the reprocessed snapshot.
+    """
+
+    key: str
+    rows: int
+    changed: bool
+    content_hash: str
+
+
+def get_transforms_version(country_url_mapper: dict[str, str]) -> str:
+    """Hashes the mappings and the code snapshots are reprocessed with. Markers are kept
+    per version, so changing either reprocesses every snapshot again.
+
+    Args:
+        country_url_mapper (dict[str, str]): The country flag URL mapping.
+
+    Returns:
+        str: The first 16 characters of the SHA-256 hex digest.
+    """
+    digest = hashlib.sha256()
+    mappings = {
+        "status": {
+            status.value: keywords
+            for status, keywords in oryx.STATUS_KEYWORD_MAP.items()
+        },
+        "source": oryx.DOMAIN_SOURCE_MAP,
+        "country_of_production": country_url_mapper,
+    }
+    digest.update(json.dumps(mappings, sort_keys=True).encode("utf-8"))
+    for func in (
+        oryx.reassign_mapped_fields,
+        oryx.assign_status,
+        oryx.assign_country_of_production,
+        oryx.assign_evidence_source,
+    ):
+        digest.update(inspect.getsource(inspect.unwrap(func)).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def get_snapshot_date(key: str) -> datetime.date | None:
+    """Gets the date of a daily snapshot from its key.
+
+    Args:
+        key (str): The key of an object under `oryx/`.
+
+    Returns:
+        datetime.date | None: The date, or None if the key is not a daily snapshot.
+    """
+    match = SNAPSHOT_KEY_PATTERN.match(key)
+    if match is None:
+        return None
+    return datetime.date.fromisoformat(match["date"])
+
+
+def get_marker_key(key: str, version: str) -> str:
+    """Gets the key of the marker recording that a snapshot was reprocessed.
+
+    Args:
+        key (str): The key of the snapshot.
+        version (str): The transforms version.
+
+    Returns:
+        str: The key of the marker.
+    """
+    return f"{BACKFILL_FOLDER}/{version}/{key}.json"
+
+
+def list_snapshots(
+    start: datetime.date | None = None, end: datetime.date | None = None
+) -> list[str]:
+    """Lists the keys of the daily snapshots between `start` and `end`, inclusive.
+    Days whose content did not change have no snapshot to list.
+
+    Args:
+        start (datetime.date, optional): The first date to list. Defaults to the first snapshot.
+        end (datetime.date, optional): The last date to list. Defaults to the last snapshot.
+
+    Returns:
+        list[str]: The sorted snapshot keys.
+    """
+    keys = []
+    for obj in io_.list_bucket.fn(blocks.bucket, folder="oryx/"):
+        dt = get_snapshot_date(obj["Key"])
+        if dt is None:
+            continue
+        if (start is None or dt >= start) and (end is None or dt <= end):
+            keys.append(obj["Key"])
+    return sorted(keys)
+
+
+def list_completed(version: str) -> set[str]:
+    """Lists the snapshots already reprocessed with the transforms version.
+
+    Args:
+        version (str): The transforms version.
+
+    Returns:
+        set[str]: The keys of the snapshots.
+    """
+    folder = f"{BACKFILL_FOLDER}/{version}/"
+    return {
+        obj["Key"][len(folder) : -len(".json")]
+        for obj in io_.list_bucket.fn(blocks.bucket, folder=folder)
+        if obj["Key"].endswith(".json")
+    }
+
+
+def backfill_snapshot(
+    key: str, country_url_mapper: dict[str, str], version: str
+) -> BackfillResult:
+    """Reprocesses a snapshot with the current mappings. Snapshots whose content
+    changed are uploaded over the original, which S3 replaces atomically, so readers
+    see either the original or the corrected snapshot. A marker is written once the
+    snapshot is done.
+
+    Args:
+        key (str): The key of the snapshot.
+        country_url_mapper (dict[str, str]): The country flag URL mapping.
+        version (str): The transforms version.
+
+    Returns:
+        BackfillResult: The reprocessed snapshot.
+    """
+    logger = get_prefect_or_default_logger()
+    dt = get_snapshot_date(key)
+    if dt is None:
+        raise ValueError(f"'{key}' is not a daily snapshot")
+
+    original = archive.download_snapshot.fn(key)
+    df = library.reprocess_snapshot(original, country_url_mapper)
+    content_hash = snapshots.compute_content_hash(df)
+    changed = content_hash != snapshots.compute_content_hash(original)
+    if changed:
+        library.upload_oryx(df, datetime.datetime.combine(dt, datetime.time()), key)
+    logger.info("Reprocessed '%s' (%s)", key, "changed" if changed else "unchanged")
+
+    result = BackfillResult(
+        key=key, rows=len(df), changed=changed, content_hash=content_hash
+    )
+    tasks.upload.fn(
+        content=json.dumps(dc.asdict(result), indent=2),
+        key=get_marker_key(key, version),
+        bucket=blocks.bucket,
+    )
+    return result
+
+
+def create_executor(workers: int | None = None) -> ProcessPoolExecutor:
+    """Creates the process pool snapshots are reprocessed in. Each worker holds one
+    snapshot at a time.
+
+    Args:
+        workers (int, optional): The number of processes. Defaults to the runtime profile's.
+
+    Returns:
+        ProcessPoolExecutor: The pool.
+    """
+    # Polars is not fork-safe, so workers are spawned
+    return ProcessPoolExecutor(
+        max_workers=workers or runtime.profile.process_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        max_tasks_per_child=SNAPSHOTS_PER_PROCESS,
+    )
+
+
+def run_backfill(
+    keys: list[str],
+    country_url_mapper: dict[str, str],
+    version: str,
+    executor: Executor | None = None,
+) -> list[BackfillResult]:
+    """Reprocesses the snapshots.
+
+    Args:
+        keys (list[str]): The keys of the snapshots.
+        country_url_mapper (dict[str, str]): The country flag URL mapping.
+        version (str): The transforms version.
+        executor (Executor, optional): The executor to reprocess in. Defaults to reprocessing in the calling thread.
+
+    Returns:
+        list[BackfillResult]: The reprocessed snapshots, sorted by key.
+    """
+    logger = get_prefect_or_default_logger()
+    if executor is None:
+        results = [backfill_snapshot(key, country_url_mapper, version) for key in keys]
+    else:
+        futures = [
+            executor.submit(backfill_snapshot, key, country_url_mapper, version)
+            for key in keys
+        ]
+        results = []
+        for future in as_completed(futures):
+            results.append(future.result())
+            logger.info("Reprocessed %s of %s snapshots", len(results), len(keys))
+    return sorted(results, key=lambda result: result.key)
+
+
+def backfill(
+    start: datetime.date | None = None,
+    end: datetime.date | None = None,
+    workers: int | None = None,
+    force: bool = False,
+) -> tuple[list[BackfillResult], int]:
+    """Reprocesses the daily snapshots between `start` and `end` with the current
+    mappings in a process pool. Snapshots already reprocessed with the same mappings
+    are skipped, so an interrupted backfill resumes where it stopped.
+
+    The latest snapshot pointer keeps the content hash it was written with, so the
+    next daily run sees the corrected content as a change and releases it.
+
+    Args:
+        start (datetime.date, optional): The first date to reprocess. Defaults to the first snapshot.
+        end (datetime.date, optional): The last date to reprocess. Defaults to the last snapshot.
+        workers (int, optional): The number of processes. Defaults to the runtime profile's.
+        force (bool, optional): Whether to reprocess snapshots that were already reprocessed. Defaults to False.
+
+    Returns:
+        tuple[list[BackfillResult], int]: The reprocessed snapshots and the number skipped.
+
+    Examples:
+
+    >>> results, skipped = backfill(datetime.date(2023, 1, 1))
+    """
+    logger = get_prefect_or_default_logger()
+    country_url_mapper = library.get_country_of_production_url_mapper()
+    version = get_transforms_version(country_url_mapper)
+
+    keys = list_snapshots(start, end)
+    completed = set() if force else list_completed(version)
+    pending = [key for key in keys if key not in completed]
+    logger.info(
+        "Reprocessing %s of %s snapshots with transforms version '%s'",
+        len(pending),
+        len(keys),
+        version,
+    )
+
+    results = []
+    if pending:
+        # Load the bucket before spawning, so a missing block fails fast
+        blocks.bucket
+        with create_executor(workers) as executor:
+            results = run_backfill(pending, country_url_mapper, version, executor)
+    return results, len(keys) - len(pending)
@@ -2,6 +2,8 @@
 Storage blocks for the pipeline.
 """
 
+import functools
+
 from prefect_aws import S3Bucket
 from prefecto.blocks import lazy_load
 from pydantic import Field
@@ -25,3 +27,18 @@ class Blocks(BaseSettings):
 
 
 blocks = Blocks()
+
+
+@functools.cache
+def load_bucket(name: str) -> S3Bucket:
+    """Load an S3 bucket block once per process.
+
+    Args:
+        name (str): The name of the block.
+
+    Returns:
+        S3Bucket: The bucket.
+    """
+    if name == blocks.bucket_block_name:
+        return blocks.bucket
+    return S3Bucket.load(name)
@@ -1,11 +1,6 @@
 """
-Module for the CLI tool.
+Module for the CLI tool. Subcommands are registered in `borderlands.cli.entrypoint`
+and imported when invoked.
 """
 
 from borderlands.cli.entrypoint import borderlands
-
-from borderlands.cli.blocks import blocks
-from borderlands.cli.docs import docs
-
-borderlands.add_command(blocks)
-borderlands.add_command(docs)
@@ -0,0 +1,54 @@
+"""
+Command for reprocessing the historical Oryx snapshots.
+"""
+
+import datetime
+
+import click
+
+
+@click.command()
+@click.option(
+    "-s",
+    "--start",
+    type=click.DateTime(formats=["%Y-%m-%d"]),
+    default=None,
+    help="The first snapshot date to reprocess. Defaults to the first snapshot.",
+)
+@click.option(
+    "-e",
+    "--end",
+    type=click.DateTime(formats=["%Y-%m-%d"]),
+    default=None,
+    help="The last snapshot date to reprocess. Defaults to the last snapshot.",
+)
+@click.option(
+    "-w",
+    "--workers",
+    type=click.IntRange(min=1),
+    default=None,
+    help="The processes to reprocess in. Defaults to the runtime profile's.",
+)
+@click.option(
+    "--force",
+    is_flag=True,
+    default=False,
+    help="Reprocess snapshots already reprocessed with the current mappings.",
+)
+def backfill(
+    start: datetime.datetime | None,
+    end: datetime.datetime | None,
+    workers: int | None,
+    force: bool,
+):
+    """Reprocess the daily snapshots with the current mappings."""
+    from borderlands.backfill import backfill
+
+    results, skipped = backfill(
+        start and start.date(), end and end.date(), workers=workers, force=force
+    )
+    changed = sum(result.changed for result in results)
+    click.echo(
+        f"Reprocessed {len(results)} snapshots, {changed} changed."
+        f" Skipped {skipped} already reprocessed."
+    )
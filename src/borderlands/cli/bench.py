@@ -0,0 +1,84 @@
+"""
+Benchmarks for the pipeline.
+"""
+
+from pathlib import Path
+
+import click
+import polars as pl
+import tabulate
+
+from borderlands.blocks import blocks
+from borderlands.definitions import DATASETS
+from borderlands.schema import profiles
+from borderlands.utilities import cache
+
+
+@click.group()
+def bench():
+    """Commands for benchmarking the pipeline."""
+    pass
+
+
+@bench.command()
+@click.option(
+    "-p",
+    "--path",
+    "paths",
+    multiple=True,
+    type=click.Path(exists=True, dir_okay=False, readable=True, path_type=Path),
+    help="A local parquet snapshot to benchmark. Can be repeated.",
+)
+@click.option(
+    "-k",
+    "--key",
+    "keys",
+    multiple=True,
+    type=str,
+    help="The key of a parquet snapshot in the bucket. Can be repeated.",
+)
+@click.option(
+    "-d",
+    "--dataset",
+    "datasets",
+    multiple=True,
+    type=click.Choice(list(DATASETS)),
+    help="Benchmark the latest release of a dataset. Can be repeated.",
+)
+@click.option(
+    "--profile",
+    "names",
+    multiple=True,
+    type=click.Choice(list(profiles.PROFILES)),
+    help="A profile to benchmark. Can be repeated. Defaults to all profiles.",
+)
+@click.option(
+    "-r",
+    "--repeat",
+    type=int,
+    default=3,
+    help="The number of writes to take the median time of.",
+)
+def write_profiles(
+    paths: tuple[Path],
+    keys: tuple[str],
+    datasets: tuple[str],
+    names: tuple[str],
+    repeat: int,
+):
+    """Report the write time and size of each parquet write profile."""
+    selected = [profiles.get_profile(name) for name in names or profiles.PROFILES]
+
+    sources: list[tuple[str, pl.DataFrame]] = []
+    sources.extend((str(path), pl.read_parquet(path)) for path in paths)
+    sources.extend((key, cache.read_parquet(blocks.bucket, key)) for key in keys)
+    sources.extend((name, DATASETS[name].read()) for name in datasets)
+    if not sources:
+        raise click.UsageError("Provide at least one --path, --key, or --dataset.")
+
+    for source, df in sources:
+        click.echo(
+            f"\n{source} ({len(df)} rows, {df.estimated_size()} bytes in memory)"
+        )
+        results = profiles.benchmark(df, selected, repeat=repeat)
+        click.echo(tabulate.tabulate(results, headers="keys", tablefmt="pipe"))
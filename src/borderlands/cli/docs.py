@@ -7,8 +7,10 @@ from pathlib import Path
 
 import click
 
+from borderlands.definitions import loss_history as loss_history_ds
 from borderlands.definitions import media_inventory as media_inventory_ds
 from borderlands.definitions import oryx as oryx_ds
+from borderlands.definitions import oryx_delta as oryx_delta_ds
 from borderlands.schema.dataset import Dataset
 
 PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
@@ -98,3 +100,43 @@ def oryx(path: Path):
 def media_inventory(path: Path):
     """Update the Media Inventory dataset documentation."""
     update_dataset_docs(media_inventory_ds, path)
+
+
+@docs.command()
+@click.option(
+    "-p",
+    "--path",
+    default=PROJECT_ROOT / "docs" / "Datasets" / "Loss History.md",
+    type=click.Path(
+        exists=True,
+        dir_okay=False,
+        readable=True,
+        writable=True,
+        resolve_path=True,
+        path_type=Path,
+    ),
+    help="Path to the dataset.",
+)
+def loss_history(path: Path):
+    """Update the Loss History dataset documentation."""
+    update_dataset_docs(loss_history_ds, path)
+
+
+@docs.command()
+@click.option(
+    "-p",
+    "--path",
+    default=PROJECT_ROOT / "docs" / "Datasets" / "Oryx Delta.md",
+    type=click.Path(
+        exists=True,
+        dir_okay=False,
+        readable=True,
+        writable=True,
+        resolve_path=True,
+        path_type=Path,
+    ),
+    help="Path to the dataset.",
+)
+def oryx_delta(path: Path):
+    """Update the Oryx Delta dataset documentation."""
+    update_dataset_docs(oryx_delta_ds, path)
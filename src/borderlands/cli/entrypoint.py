@@ -3,10 +3,83 @@ CLI tool entrypoint.
 
 """
 
+import importlib
+
 import click
 
 
-@click.group()
+class LazyGroup(click.Group):
+    """A group that imports its subcommands only when they are invoked. Listing the
+    subcommands, as `--help` does, uses the help registered with them instead of
+    importing their modules.
+
+    Args:
+        lazy_subcommands (dict[str, tuple[str, str]], optional): The import path
+            ('module:attribute') and short help of each subcommand by name.
+    """
+
+    def __init__(
+        self, *args, lazy_subcommands: dict[str, tuple[str, str]] | None = None, **kwds
+    ):
+        super().__init__(*args, **kwds)
+        self.lazy_subcommands = lazy_subcommands or {}
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        """Lists the names of the loaded and lazy subcommands."""
+        return sorted({*super().list_commands(ctx), *self.lazy_subcommands})
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        """Gets a subcommand, importing it if it is lazy."""
+        if cmd_name in self.lazy_subcommands and cmd_name not in self.commands:
+            path, _ = self.lazy_subcommands[cmd_name]
+            module, attribute = path.split(":")
+            self.add_command(
+                getattr(importlib.import_module(module), attribute), cmd_name
+            )
+        return super().get_command(ctx, cmd_name)
+
+    def format_commands(self, ctx: click.Context, formatter: click.HelpFormatter):
+        """Writes the subcommands and their help without importing them."""
+        rows = []
+        for name in self.list_commands(ctx):
+            if name in self.commands:
+                rows.append((name, self.commands[name].get_short_help_str()))
+            else:
+                rows.append((name, self.lazy_subcommands[name][1]))
+        if rows:
+            with formatter.section("Commands"):
+                formatter.write_dl(rows)
+
+
+@click.group(
+    cls=LazyGroup,
+    lazy_subcommands={
+        "backfill": (
+            "borderlands.cli.backfill:backfill",
+            "Reprocess the daily snapshots with the current mappings.",
+        ),
+        "bench": (
+            "borderlands.cli.bench:bench",
+            "Commands for benchmarking the pipeline.",
+        ),
+        "blocks": (
+            "borderlands.cli.blocks:blocks",
+            "Commands for working with Prefect blocks.",
+        ),
+        "docs": (
+            "borderlands.cli.docs:docs",
+            "Commands for working with documentation.",
+        ),
+        "sync": (
+            "borderlands.cli.sync:sync",
+            "Download the changes to the dataset releases since the last sync.",
+        ),
+        "worker": (
+            "borderlands.cli.worker:worker",
+            "Keep a warm process that runs the pipeline on demand.",
+        ),
+    },
+)
 def borderlands():
     """CLI tool for the Borderlands project."""
     pass
@@ -0,0 +1,34 @@
+"""
+Commands for mirroring the dataset releases locally.
+"""
+
+from pathlib import Path
+
+import click
+import tabulate
+
+from borderlands.definitions import DATASETS
+from borderlands.sync import LocalMirror, settings
+
+
+@click.command()
+@click.option(
+    "-d",
+    "--dataset",
+    "datasets",
+    multiple=True,
+    type=click.Choice(list(DATASETS)),
+    help="A dataset to sync. Can be repeated. Defaults to all datasets.",
+)
+@click.option(
+    "--directory",
+    type=click.Path(file_okay=False, writable=True, path_type=Path),
+    default=settings.directory,
+    show_default=True,
+    help="The directory to mirror the releases to.",
+)
+def sync(datasets: tuple[str], directory: Path):
+    """Download the changes to the dataset releases since the last sync."""
+    mirror = LocalMirror(directory)
+    results = [mirror.sync(DATASETS[name]) for name in datasets or DATASETS]
+    click.echo(tabulate.tabulate([vars(r) for r in results], headers="keys"))
@@ -0,0 +1,40 @@
+"""
+Command for running the pipeline from a warm, long-lived process.
+"""
+
+import click
+
+
+@click.command()
+@click.option(
+    "-e",
+    "--entrypoint",
+    type=str,
+    default="src/flows/orchestrator.py:borderlands_flow",
+    show_default=True,
+    help="The flow to run, as 'path/to/file.py:flow_function'.",
+)
+@click.option(
+    "-i",
+    "--interval",
+    type=float,
+    default=None,
+    help="The seconds between runs. Without it, runs only start on SIGUSR1.",
+)
+@click.option(
+    "--run-on-start/--no-run-on-start",
+    default=False,
+    help="Whether to run the flow as soon as the worker is warm.",
+)
+def worker(entrypoint: str, interval: float | None, run_on_start: bool):
+    """Keep a warm process that runs the pipeline on demand."""
+    from prefect.flows import load_flow_from_entrypoint
+
+    from borderlands.worker import Worker
+
+    flow = load_flow_from_entrypoint(entrypoint)
+    worker = Worker(flow, interval=interval)
+    worker.warm()
+    worker.install_signal_handlers()
+    click.echo(f"Worker ready to run '{flow.name}'. Send SIGUSR1 to start a run.")
+    worker.run(run_on_start=run_on_start)
@@ -133,6 +133,109 @@ class Media(Schema):
     )
 
 
+class LossHistory(Schema):
+    """Schema for the loss history model."""
+
+    # Dimensions
+    country = Field(
+        pl.Utf8,
+        tags=[Tag.dimension, Tag.inherited],
+        description="The country that suffered the equipment loss.",
+    )
+    category = Field(
+        pl.Utf8,
+        tags=[Tag.dimension, Tag.inherited],
+        description="The equipment category.",
+    )
+    model = Field(
+        pl.Utf8,
+        tags=[Tag.dimension, Tag.inherited],
+        description="The equipment model.",
+    )
+    url_hash = Field(
+        pl.Utf8,
+        tags=[Tag.dimension, Tag.inherited],
+        description="A SHA-256 hash of the `evidence_url`.",
+    )
+    case_id = Field(
+        pl.Int32,
+        tags=[Tag.dimension, Tag.inherited],
+        description="A special ID for discriminating equipment losses when their `country`, `category`, `model`, and `url_hash` are the same.",
+    )
+
+    # Attributes
+    first_seen = Field(
+        pl.Datetime,
+        tags=[Tag.attribute],
+        description="The `as_of_date` of the first snapshot the loss appeared in.",
+    )
+    last_seen = Field(
+        pl.Datetime,
+        tags=[Tag.attribute],
+        description="The `as_of_date` of the latest snapshot the loss appeared in.",
+    )
+    removed = Field(
+        pl.Datetime,
+        tags=[Tag.attribute],
+        description="The `as_of_date` of the first snapshot the loss was missing from. Null if the loss is still listed.",
+    )
+
+
+class OryxDelta(Schema):
+    """Schema for the changes between consecutive Oryx snapshots."""
+
+    # Dimensions
+    country = Field(
+        pl.Utf8,
+        tags=[Tag.dimension, Tag.inherited],
+        description="The country that suffered the equipment loss.",
+    )
+    category = Field(
+        pl.Utf8,
+        tags=[Tag.dimension, Tag.inherited],
+        description="The equipment category.",
+    )
+    model = Field(
+        pl.Utf8,
+        tags=[Tag.dimension, Tag.inherited],
+        description="The equipment model.",
+    )
+    url_hash = Field(
+        pl.Utf8,
+        tags=[Tag.dimension, Tag.inherited],
+        description="A SHA-256 hash of the `evidence_url`.",
+    )
+    case_id = Field(
+        pl.Int32,
+        tags=[Tag.dimension, Tag.inherited],
+        description="A special ID for discriminating equipment losses when their `country`, `category`, `model`, and `url_hash` are the same.",
+    )
+
+    # Attributes
+    change = Field(
+        pl.Utf8,
+        tags=[Tag.attribute],
+        description="How the loss changed. One of 'added', 'removed', or 'modified'.",
+    )
+    changed_columns = Field(
+        pl.List(pl.Utf8),
+        tags=[Tag.attribute],
+        description="The columns whose values changed. Empty unless the loss was modified.",
+    )
+
+    # Metadata
+    previous_as_of_date = Field(
+        pl.Datetime,
+        tags=[Tag.metadata],
+        description="The `as_of_date` of the snapshot the changes are relative to.",
+    )
+    as_of_date = Field(
+        pl.Datetime,
+        tags=[Tag.metadata],
+        description="The `as_of_date` of the snapshot with the changes.",
+    )
+
+
 ##############################################################################
 # DATASETS
 ##############################################################################
@@ -142,6 +245,7 @@ oryx = Dataset(
     host_bucket="s3-bucket-borderlands-core",
     release_path="releases/oryx.parquet",
     schema=EquipmentLoss,
+    partition_by=[EquipmentLoss.country.name, EquipmentLoss.category.name],
     description=(
         "The Oryx dataset is a complete collection of the equipment losses in the Oryx database. The loss cases have been cleaned and transformed into JSON objects."
         "\n\n### Sources"
@@ -157,9 +261,38 @@ media_inventory = Dataset(
     host_bucket="s3-bucket-borderlands-core",
     release_path="releases/media-inventory.parquet",
     schema=Media,
+    partition_by=[Media.evidence_source.name],
     description=(
         "The Media Inventory is a collection of evidence files that were extracted from the Oryx dataset."
         "\n\n### Supported Sources"
         "\n\n - [Postimages](https://postimg.cc/)"
     ),
 )
+
+loss_history = Dataset(
+    label="Loss History",
+    host_bucket="s3-bucket-borderlands-core",
+    release_path="releases/loss-history.parquet",
+    schema=LossHistory,
+    description=(
+        "The Loss History tracks when each equipment loss in the Oryx dataset was first and last seen, and when it was removed from the Oryx pages."
+    ),
+)
+
+oryx_delta = Dataset(
+    label="Oryx Delta",
+    host_bucket="s3-bucket-borderlands-core",
+    release_path="releases/oryx-delta.parquet",
+    schema=OryxDelta,
+    description=(
+        "The Oryx Delta lists the equipment losses that were added to, removed from, or modified in the Oryx dataset since its previous snapshot."
+    ),
+)
+
+# The released datasets by the name they are selected with on the command line
+DATASETS: dict[str, Dataset] = {
+    "oryx": oryx,
+    "media-inventory": media_inventory,
+    "loss-history": loss_history,
+    "oryx-delta": oryx_delta,
+}
@@ -0,0 +1,111 @@
+"""
+Module for computing the changes between consecutive Oryx snapshots.
+"""
+
+import datetime
+
+import polars as pl
+from prefect import task
+from prefecto.logging import get_prefect_or_default_logger
+
+from . import paths
+from .definitions import EquipmentLoss, OryxDelta
+from .schema import Tag
+
+DELTA_SUBFOLDER = "deltas"
+# Suffix of the previous snapshot's columns after joining
+PREVIOUS_SUFFIX = "_previous"
+
+
+def create_delta_key(dt: datetime.datetime) -> str:
+    """Create the key for the Oryx delta.
+
+    Args:
+        dt (datetime.datetime): The datetime to use for the key.
+
+    Returns:
+        str: The key for the Oryx delta.
+    """
+    return f"{DELTA_SUBFOLDER}/{paths.create_oryx_key(dt, ext='parquet')}"
+
+
+@task
+def compute_oryx_delta(
+    previous: pl.DataFrame,
+    current: pl.DataFrame,
+    previous_as_of_date: datetime.datetime,
+    as_of_date: datetime.datetime,
+) -> pl.DataFrame:
+    """Compute the losses added, removed, and modified between two snapshots. Rows are
+    matched with hash joins on the dimensions, and matched rows are modified if any
+    non-metadata column differs.
+
+    Args:
+        previous (pl.DataFrame): The previous snapshot, following `EquipmentLoss`.
+        current (pl.DataFrame): The current snapshot, following `EquipmentLoss`.
+        previous_as_of_date (datetime.datetime): The date of the previous snapshot.
+        as_of_date (datetime.datetime): The date of the current snapshot.
+
+    Returns:
+        pl.DataFrame: The changes, following `OryxDelta`.
+    """
+    logger = get_prefect_or_default_logger()
+    keys = EquipmentLoss.columns(include=[Tag.dimension])
+    compared = [
+        name
+        for name in EquipmentLoss.columns(exclude=[Tag.dimension, Tag.metadata])
+        if name in current.columns and name in previous.columns
+    ]
+    before = previous.lazy().select(keys + compared)
+    after = current.lazy().select(keys + compared)
+    no_changes = pl.lit([], dtype=OryxDelta.changed_columns.dtype)
+
+    added = after.join(before, on=keys, how="anti").select(
+        *keys,
+        pl.lit("added").alias(OryxDelta.change.name),
+        no_changes.alias(OryxDelta.changed_columns.name),
+    )
+    removed = before.join(after, on=keys, how="anti").select(
+        *keys,
+        pl.lit("removed").alias(OryxDelta.change.name),
+        no_changes.alias(OryxDelta.changed_columns.name),
+    )
+    modified = (
+        after.join(before, on=keys, how="inner", suffix=PREVIOUS_SUFFIX)
+        .select(
+            *keys,
+            pl.lit("modified").alias(OryxDelta.change.name),
+            pl.concat_list(
+                [
+                    pl.when(
+                        pl.col(name).ne_missing(pl.col(name + PREVIOUS_SUFFIX))
+                    ).then(pl.lit(name))
+                    for name in compared
+                ]
+            )
+            .list.drop_nulls()
+            .alias(OryxDelta.changed_columns.name),
+        )
+        .filter(pl.col(OryxDelta.changed_columns.name).list.len() > 0)
+    )
+
+    df = (
+        pl.concat([added, removed, modified])
+        .with_columns(
+            pl.lit(
+                previous_as_of_date, dtype=OryxDelta.previous_as_of_date.dtype
+            ).alias(OryxDelta.previous_as_of_date.name),
+            pl.lit(as_of_date, dtype=OryxDelta.as_of_date.dtype).alias(
+                OryxDelta.as_of_date.name
+            ),
+        )
+        .select(OryxDelta.columns())
+        .sort(keys)
+        .collect()
+    )
+    logger.info(
+        "Found %s changed losses: %s",
+        len(df),
+        dict(df[OryxDelta.change.name].value_counts().iter_rows()),
+    )
+    return df
@@ -0,0 +1,113 @@
+"""
+Module for maintaining the history of when equipment losses appear in and disappear
+from the Oryx snapshots.
+"""
+
+import datetime
+
+import polars as pl
+from botocore.exceptions import ClientError
+from prefect import task
+from prefecto.logging import get_prefect_or_default_logger
+
+from . import paths
+from .definitions import EquipmentLoss, LossHistory, loss_history
+from .schema import Tag
+from .utilities import io_
+
+HISTORY_SUBFOLDER = "history"
+
+
+def create_history_key(dt: datetime.datetime) -> str:
+    """Create the key for the loss history.
+
+    Args:
+        dt (datetime.datetime): The datetime to use for the key.
+
+    Returns:
+        str: The key for the loss history.
+    """
+    return f"{HISTORY_SUBFOLDER}/{paths.create_oryx_key(dt, ext='parquet')}"
+
+
+@task
+def get_latest_loss_history() -> pl.DataFrame:
+    """Get the latest loss history release. An empty loss history is returned if it
+    has never been released.
+
+    Returns:
+        pl.DataFrame: The loss history.
+    """
+    logger = get_prefect_or_default_logger()
+    try:
+        return loss_history.read()
+    except ClientError as e:
+        if not io_.is_missing_object_error(e):
+            raise e
+        logger.warning("No %s release found, starting a new one", loss_history.label)
+        return pl.DataFrame(schema=LossHistory.schema())
+
+
+@task
+def update_loss_history(
+    history: pl.DataFrame, current: pl.DataFrame, as_of_date: datetime.datetime
+) -> pl.DataFrame:
+    """Update the loss history with the losses in the current snapshot. Only the
+    dimension keys of the current snapshot are needed, so the history is updated with
+    hash anti/semi-joins against the previous state rather than a scan of every
+    snapshot.
+
+    Args:
+        history (pl.DataFrame): The previous loss history.
+        current (pl.DataFrame): The current snapshot, following `EquipmentLoss`.
+        as_of_date (datetime.datetime): The date of the current snapshot.
+
+    Requires:
+        - `EquipmentLoss.country`
+        - `EquipmentLoss.category`
+        - `EquipmentLoss.model`
+        - `EquipmentLoss.url_hash`
+        - `EquipmentLoss.case_id`
+
+    Returns:
+        pl.DataFrame: The updated loss history.
+    """
+    logger = get_prefect_or_default_logger()
+    keys = LossHistory.columns(include=[Tag.dimension])
+    seen = pl.lit(as_of_date, dtype=LossHistory.last_seen.dtype)
+
+    present = (
+        current.lazy()
+        .select(EquipmentLoss.columns(include=[Tag.dimension]))
+        .unique()
+        .select(keys)
+    )
+    lf = history.lazy().select(LossHistory.columns())
+
+    # Losses that are still listed. Reappearing losses are no longer removed.
+    kept = lf.join(present, on=keys, how="semi").with_columns(
+        seen.alias(LossHistory.last_seen.name),
+        pl.lit(None, dtype=LossHistory.removed.dtype).alias(LossHistory.removed.name),
+    )
+    # Losses that were dropped from the snapshot since the last update
+    dropped = lf.join(present, on=keys, how="anti").with_columns(
+        pl.coalesce(LossHistory.removed.col, seen).alias(LossHistory.removed.name)
+    )
+    # Losses that have never been seen before
+    added = present.join(lf, on=keys, how="anti").with_columns(
+        seen.alias(LossHistory.first_seen.name),
+        seen.alias(LossHistory.last_seen.name),
+        pl.lit(None, dtype=LossHistory.removed.dtype).alias(LossHistory.removed.name),
+    )
+
+    df = (
+        pl.concat([kept, dropped, added.select(LossHistory.columns())])
+        .sort(keys)
+        .collect()
+    )
+    logger.info(
+        "Updated loss history with %s listed and %s removed losses",
+        df[LossHistory.removed.name].null_count(),
+        df[LossHistory.removed.name].is_not_null().sum(),
+    )
+    return df
@@ -0,0 +1,205 @@
+"""
+Plain-Python entry points to the pipeline's steps, for local and batch work such as
+backfills. They call the functions behind the steps' Prefect tasks directly, so no
+flow run, task runs, or persisted results are created, and they log through
+`prefecto.logging`, which falls back to standard logging outside of Prefect runs.
+
+Every function is defined at the module level and takes picklable arguments, so they
+can be submitted to process pools.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import datetime
+from typing import Iterable
+
+import polars as pl
+
+from . import assets, definitions, media, oryx, paths
+from .blocks import blocks
+from .definitions import EquipmentLoss, Media, Tag
+from .utilities import multipart
+
+
+def parse_oryx_web_page(page: str, country: str | None = None) -> pl.DataFrame:
+    """Parses an Oryx web page in the calling process.
+
+    Args:
+        page (str): The Oryx web page as a string.
+        country (str, optional): The country the page is for. Either 'Russia', 'Ukraine', or None for pages listing both.
+
+    Returns:
+        pl.DataFrame: The parsed losses.
+    """
+    return oryx.parse_oryx_page(page, country)
+
+
+def get_country_of_production_url_mapper() -> dict[str, str]:
+    """Gets the mapping of country flag URLs to ISO Alpha-3 codes.
+
+    Returns:
+        dict[str, str]: The mapping.
+    """
+    return assets.get_country_of_production_url_mapper.fn()
+
+
+def get_category_corrections() -> pl.DataFrame:
+    """Gets the category corrections.
+
+    Returns:
+        pl.DataFrame: The corrections.
+    """
+    return assets.get_category_corrections.fn()
+
+
+def pre_process_dataframe(
+    df: pl.DataFrame,
+    as_of_date: datetime.datetime,
+    country_url_mapper: dict[str, str] | None = None,
+    category_corrections: pl.DataFrame | None = None,
+) -> pl.DataFrame:
+    """Cleans parsed losses and computes their basic fields. The assets are loaded
+    when they are not given; pass them in when processing many snapshots.
+
+    Args:
+        df (pl.DataFrame): The parsed losses.
+        as_of_date (datetime.datetime): The date the losses were collected.
+        country_url_mapper (dict[str, str], optional): The country flag URL mapping. Defaults to the asset.
+        category_corrections (pl.DataFrame, optional): The category corrections. Defaults to the asset.
+
+    Returns:
+        pl.DataFrame: The losses, following `EquipmentLoss`.
+    """
+    if country_url_mapper is None:
+        country_url_mapper = get_country_of_production_url_mapper()
+    if category_corrections is None:
+        category_corrections = get_category_corrections()
+    df = oryx.pre_process_dataframe.fn(df, country_url_mapper, category_corrections)
+    return oryx.assign_as_of_date(df, as_of_date)
+
+
+def process_pages(
+    pages: Iterable[tuple[str, str | None]],
+    as_of_date: datetime.datetime,
+    country_url_mapper: dict[str, str] | None = None,
+    category_corrections: pl.DataFrame | None = None,
+) -> pl.DataFrame:
+    """Parses and pre-processes the pages of one snapshot.
+
+    Args:
+        pages (Iterable[tuple[str, str | None]]): Each page and the country it is for.
+        as_of_date (datetime.datetime): The date the pages were collected.
+        country_url_mapper (dict[str, str], optional): The country flag URL mapping. Defaults to the asset.
+        category_corrections (pl.DataFrame, optional): The category corrections. Defaults to the asset.
+
+    Returns:
+        pl.DataFrame: The losses, following `EquipmentLoss`.
+
+    Examples:
+
+    >>> df = process_pages(
+    ...     [(russia, "Russia"), (ukraine, "Ukraine"), (naval, None), (aircraft, None)],
+    ...     datetime.datetime(2023, 7, 23),
+    ... )
+    """
+    df = pl.concat(
+        [parse_oryx_web_page(page, country) for page, country in pages],
+    )
+    return pre_process_dataframe(
+        df, as_of_date, country_url_mapper, category_corrections
+    )
+
+
+def reprocess_snapshot(
+    df: pl.DataFrame, country_url_mapper: dict[str, str] | None = None
+) -> pl.DataFrame:
+    """Reapplies the current status, evidence source, and country flag mappings to a
+    snapshot's losses.
+
+    Args:
+        df (pl.DataFrame): The losses, following `EquipmentLoss`.
+        country_url_mapper (dict[str, str], optional): The country flag URL mapping. Defaults to the asset.
+
+    Returns:
+        pl.DataFrame: The corrected losses.
+    """
+    if country_url_mapper is None:
+        country_url_mapper = get_country_of_production_url_mapper()
+    return oryx.reassign_mapped_fields(df, country_url_mapper)
+
+
+def build_media_inventory(losses: pl.DataFrame) -> pl.DataFrame:
+    """Builds the media inventory of the losses on top of the latest inventory, so
+    media that was already downloaded keeps its key.
+
+    Args:
+        losses (pl.DataFrame): The losses, following `EquipmentLoss`.
+
+    Returns:
+        pl.DataFrame: The inventory, following `Media`.
+    """
+    return media.merge_inventory_state.fn(
+        current=media.get_latest_media_inventory.fn(),
+        empty=media.create_media_inventory_from_oryx.fn(losses),
+    )
+
+
+def download_media(inventory: pl.DataFrame) -> pl.DataFrame:
+    """Downloads the inventory's media that has not been downloaded yet.
+
+    Args:
+        inventory (pl.DataFrame): The inventory, following `Media`.
+
+    Returns:
+        pl.DataFrame: The inventory with the keys of the downloaded media.
+    """
+    # Blocks load asynchronously inside an event loop, so the bucket is loaded first
+    blocks.bucket
+    return asyncio.run(media.download.fn(inventory))
+
+
+def upload_oryx(
+    df: pl.DataFrame, as_of_date: datetime.datetime, key: str | None = None
+) -> str:
+    """Uploads the losses as the snapshot of their date. The latest snapshot pointer
+    is left alone, so backfilled snapshots do not replace the current one.
+
+    Args:
+        df (pl.DataFrame): The losses, following `EquipmentLoss`.
+        as_of_date (datetime.datetime): The date of the snapshot.
+        key (str, optional): The key to upload to, such as a planned snapshot's. Defaults to the key of `as_of_date`.
+
+    Returns:
+        str: The key the snapshot was uploaded to.
+    """
+    if key is None:
+        key = f"oryx/{paths.create_oryx_key(as_of_date, ext='parquet')}"
+    df = df.select(EquipmentLoss.columns())
+    df = df.sort(EquipmentLoss.columns(include=[Tag.dimension]))
+    return multipart.upload_parquet(
+        df,
+        key,
+        blocks.bucket,
+        **definitions.oryx.profile.options(),
+    )
+
+
+def upload_media_inventory(df: pl.DataFrame, as_of_date: datetime.datetime) -> str:
+    """Uploads the media inventory as the inventory of its date.
+
+    Args:
+        df (pl.DataFrame): The inventory, following `Media`.
+        as_of_date (datetime.datetime): The date of the inventory.
+
+    Returns:
+        str: The key the inventory was uploaded to.
+    """
+    df = df.select(Media.columns())
+    df = df.sort(Media.as_of_date.name)
+    return multipart.upload_parquet(
+        df,
+        f"oryx/{media.create_inventory_key(as_of_date)}",
+        blocks.bucket,
+        **definitions.media_inventory.profile.options(),
+    )
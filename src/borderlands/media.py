@@ -4,7 +4,6 @@
 
 import datetime
 import functools
-import io
 import logging
 import tempfile
 from typing import Callable, Coroutine
@@ -13,10 +12,9 @@ import anyio
 import httpx
 import polars as pl
 from prefect import task
-from prefect_aws import S3Bucket
 from prefecto.logging import get_prefect_or_default_logger
 
-from . import enums, paths
+from . import enums, paths, runtime
 from .blocks import blocks
 from .definitions import EquipmentLoss, Media, media_inventory
 from .schema import Tag
@@ -91,11 +89,7 @@ def get_latest_media_inventory() -> pl.DataFrame:
     Returns:
         pl.DataFrame: The media inventory.
     """
-    bucket: S3Bucket = S3Bucket.load(media_inventory.host_bucket)
-    with io.BytesIO() as buffer:
-        bucket.download_object_to_file_object(media_inventory.release_path, buffer)
-        buffer.seek(0)
-        return pl.read_parquet(buffer)
+    return media_inventory.read()
 
 
 def create_inventory_key(dt: datetime.datetime) -> str:
@@ -240,6 +234,7 @@ def evidence_source_handler(
     def decorator(coro: Coroutine) -> Coroutine:
         """Wrap the coroutine in a handler for the evidence source."""
 
+        @wrappers.instrument(name=f"media.{coro.__name__}")
         @functools.wraps(coro)
         @wrappers.inject_default_logger
         async def wrapper(
@@ -286,12 +281,12 @@ def evidence_source_handler(
 
 
 @evidence_source_handler(enums.EvidenceSource.POST_IMG)
-async def download_postimg(contexts: list[dict], concurrency: int = 10):
+async def download_postimg(contexts: list[dict], concurrency: int | None = None):
     """Download the postimg media from the urls in the dataframe and upload them to the media bucket.
 
     Args:
         df (pl.DataFrame): The dataframe containing the media urls.
-        concurrency (int, optional): The number of concurrent downloads. Defaults to 10.
+        concurrency (int, optional): The number of concurrent downloads. Defaults to the runtime profile's.
 
     Requires:
         - `Media.url`
@@ -305,18 +300,15 @@ async def download_postimg(contexts: list[dict], concurrency: int = 10):
     Returns:
         pl.DataFrame: The dataframe for all postimg data with the media keys.
     """
-    async with httpx.AsyncClient(headers={"User-Agent": web.USER_AGENT}) as client:
-        sem = anyio.Semaphore(concurrency)
-        async with anyio.create_task_group() as tg:
-            for ctx in contexts:
-                if (
-                    ctx[Media.evidence_source.name]
-                    == enums.EvidenceSource.POST_IMG.value
-                ):
-                    tg.start_soon(download_file, client, ctx, sem)
+    sem = anyio.Semaphore(concurrency or runtime.profile.download_concurrency)
+    async with web.client_scope() as client, anyio.create_task_group() as tg:
+        for ctx in contexts:
+            if ctx[Media.evidence_source.name] == enums.EvidenceSource.POST_IMG.value:
+                tg.start_soon(download_file, client, ctx, sem)
 
 
 @task
+@wrappers.instrument
 async def download(df: pl.DataFrame) -> pl.DataFrame:
     """Download the media from the urls in the dataframe and upload them to the media bucket.
 
@@ -4,22 +4,24 @@ Module to extract data from the Oryx website and perform basic processing and re
 
 import datetime
 import enum
+import functools
 import hashlib
 import logging
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
 from urllib.parse import urlparse
 
-import bs4
-import httpx
 import polars as pl
 import zoneinfo
 from prefect.artifacts import create_table_artifact
 from prefect.tasks import exponential_backoff, task
 from prefecto.logging import get_prefect_or_default_logger
 
+from . import runtime
 from .definitions import EquipmentLoss
 from .enums import EvidenceSource
 from .parser import article, parser
-from .utilities import web, wrappers
+from .utilities import results, web, wrappers
 
 
 @task(
@@ -37,10 +39,10 @@ async def get_oryx_page(url: str) -> str:
     str
         String of the page
     """
-    async with httpx.AsyncClient(headers={"User-Agent": web.USER_AGENT}) as client:
+    async with web.client_scope() as client:
         r = await client.get(url)
-        r.raise_for_status()
-        return r.text
+    r.raise_for_status()
+    return r.text
 
 
 @task(
@@ -123,9 +125,40 @@ DOMAIN_SOURCE_MAP = {
     "en.wikipedia.org": EvidenceSource.OTHER.value,
 }
 
+# The modules parsed pages depend on, which version their cached results
+PARSER_MODULES = (
+    "borderlands.definitions",
+    "borderlands.parser.article",
+    "borderlands.parser.base",
+    "borderlands.parser.equipment_category",
+    "borderlands.parser.equipment_model",
+    "borderlands.parser.evidence",
+    "borderlands.parser.parser",
+)
 
-@task
-def parse_oryx_web_page(page: str, country: str | None = None) -> pl.DataFrame:
+
+@functools.cache
+def get_parse_executor() -> ProcessPoolExecutor:
+    """Gets the process pool pages are parsed in. Parsing is CPU bound, so it runs
+    outside the flow's threads and overlaps the page fetches still in flight. The pool
+    is kept for the life of the process.
+
+    Returns
+    -------
+    ProcessPoolExecutor
+        The pool, sized by the runtime profile.
+    """
+    # Polars is not fork-safe, so parsing processes are spawned
+    return ProcessPoolExecutor(
+        max_workers=runtime.profile.process_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+@wrappers.instrument
+def parse_oryx_page(
+    page: str, country: str | None = None, executor: Executor | None = None
+) -> pl.DataFrame:
     """Parses the Oryx web page.
 
     Parameters
@@ -134,6 +167,8 @@ def parse_oryx_web_page(page: str, country: str | None = None) -> pl.DataFrame:
         The Oryx web page as a string.
     country : str
         The country the page is for. Either 'Russia' or 'Ukraine'.
+    executor : Executor, optional
+        The executor to parse in. Defaults to parsing in the calling thread.
 
     Returns
     -------
@@ -153,11 +188,13 @@ def parse_oryx_web_page(page: str, country: str | None = None) -> pl.DataFrame:
     else:
         raise ValueError(f"There is no equipment losses parser for '{country!r}'")
 
-    soup: bs4.BeautifulSoup = bs4.BeautifulSoup(page, features="html.parser")
-    generator = parser.OryxParser(soup, multi=country is None, logger=logger).parse(
-        data_section_index
-    )
-    df = pl.from_dicts(generator, schema=EquipmentLoss.schema())
+    if executor is None:
+        records = parser.parse_page(page, data_section_index, multi=country is None)
+    else:
+        records = executor.submit(
+            parser.parse_page, page, data_section_index, multi=country is None
+        ).result()
+    df = pl.from_dicts(records, schema=EquipmentLoss.schema())
     logger.info(f"Found {len(df)} equipment losses for {country}")
 
     if country is not None:
@@ -168,6 +205,30 @@ def parse_oryx_web_page(page: str, country: str | None = None) -> pl.DataFrame:
     return df
 
 
+@task(
+    **results.cached_result_options(
+        results.ParquetSerializer(), depends_on=PARSER_MODULES
+    )
+)
+def parse_oryx_web_page(page: str, country: str | None = None) -> pl.DataFrame:
+    """Parses the Oryx web page in the parsing process pool.
+
+    Parameters
+    ----------
+    page : str
+        The Oryx web page as a string.
+    country : str
+        The country the page is for. Either 'Russia' or 'Ukraine'.
+
+    Returns
+    -------
+    pl.DataFrame
+        The parsed data as a Polars DataFrame with the `Equipment` model.
+    """
+    return parse_oryx_page(page, country, executor=get_parse_executor())
+
+
+@wrappers.instrument
 @wrappers.force_lazyframe
 @wrappers.inject_default_logger
 def assign_status(lf: pl.LazyFrame, *, logger: logging.Logger) -> pl.LazyFrame:
@@ -213,6 +274,7 @@ def assign_status(lf: pl.LazyFrame, *, logger: logging.Logger) -> pl.LazyFrame:
     return lf
 
 
+@wrappers.instrument
 @wrappers.force_lazyframe
 @wrappers.inject_default_logger
 def assign_country_of_production(
@@ -233,6 +295,7 @@ def assign_country_of_production(
     return lf
 
 
+@wrappers.instrument
 @wrappers.force_lazyframe
 @wrappers.inject_default_logger
 def assign_evidence_source(lf: pl.LazyFrame, *, logger: logging.Logger) -> pl.LazyFrame:
@@ -250,6 +313,7 @@ def assign_evidence_source(lf: pl.LazyFrame, *, logger: logging.Logger) -> pl.La
     return lf
 
 
+@wrappers.instrument
 @wrappers.force_lazyframe
 @wrappers.inject_default_logger
 def calculate_url_hash(lf: pl.LazyFrame, *, logger: logging.Logger) -> pl.LazyFrame:
@@ -267,6 +331,7 @@ def calculate_url_hash(lf: pl.LazyFrame, *, logger: logging.Logger) -> pl.LazyFr
     return lf
 
 
+@wrappers.instrument
 @wrappers.force_lazyframe
 @wrappers.inject_default_logger
 def resolve_aircraft_and_naval_page_updates(
@@ -342,6 +407,7 @@ def resolve_aircraft_and_naval_page_updates(
     return lf
 
 
+@wrappers.instrument
 @wrappers.force_lazyframe
 @wrappers.inject_default_logger
 def calculate_case_id(lf: pl.LazyFrame, *, logger: logging.Logger) -> pl.LazyFrame:
@@ -377,18 +443,52 @@ def calculate_case_id(lf: pl.LazyFrame, *, logger: logging.Logger) -> pl.LazyFra
     return lf
 
 
+def reassign_mapped_fields(
+    df: pl.DataFrame, country_url_mapper: dict[str, str]
+) -> pl.DataFrame:
+    """Reassigns the fields derived from `STATUS_KEYWORD_MAP`, `DOMAIN_SOURCE_MAP`,
+    and the country flag mapping. Snapshots keep the descriptions and URLs these are
+    derived from, so processed losses can be corrected without their pages.
+
+    Parameters
+    ----------
+    df : pl.DataFrame
+        The processed losses, following `EquipmentLoss`.
+    country_url_mapper : dict[str, str]
+        A dictionary mapping country flag URLs to their unique identifier.
+
+    Returns
+    -------
+    pl.DataFrame
+        The losses with their status, country of production, and evidence source
+        reassigned.
+    """
+    return (
+        df.lazy()
+        .pipe(assign_status)
+        .pipe(assign_country_of_production, country_url_mapper)
+        .pipe(assign_evidence_source)
+        .select(EquipmentLoss.columns())
+        .collect()
+    )
+
+
 @task(
     tags=["www.oryxspioenkop.com"],
     name="Process Parsed Oryx Equipment Losses",
     description="Cleans the parsed Oryx equipment losses and computes the basic fields.",
+    **results.cached_result_options(
+        results.ParquetSerializer(), depends_on=("borderlands.definitions",)
+    ),
 )
 def pre_process_dataframe(
     df: pl.DataFrame,
     country_url_mapper: dict[str, str],
     category_corrections: pl.DataFrame,
-    as_of_date: datetime.datetime,
 ) -> pl.DataFrame:
-    """Performs basic preprocessing on the DataFrame.
+    """Performs basic preprocessing on the DataFrame. The result is cached by the
+    content of the parsed pages, so the `as_of_date` is assigned afterwards by
+    `assign_as_of_date` to let same-day reruns reuse it.
 
     Parameters
     ----------
@@ -398,26 +498,14 @@ def pre_process_dataframe(
         A dictionary mapping country flag URLs to their unique identifier.
     category_corrections : pl.DataFrame
         A DataFrame mapping old categories to new categories.
-    as_of_date : datetime.datetime
-        The date the data was collected.
 
     Returns
     -------
     pl.DataFrame
-        The cleaned DataFrame.
+        The cleaned DataFrame, without its `as_of_date`.
     """
-    as_of_date = as_of_date.astimezone(zoneinfo.ZoneInfo("UTC")).replace(tzinfo=None)
     lf = df.lazy()
 
-    # Add the as of date
-    lf = (
-        lf.with_columns(
-            pl.lit(as_of_date, dtype=pl.Datetime).alias(EquipmentLoss.as_of_date.name),
-        )
-        .collect()
-        .lazy()
-    )
-
     # Clean strings
     lf = (
         lf.with_columns(
@@ -444,3 +532,24 @@ def pre_process_dataframe(
         .lazy()
     )
     return lf.collect()
+
+
+def assign_as_of_date(df: pl.DataFrame, as_of_date: datetime.datetime) -> pl.DataFrame:
+    """Assigns the date the losses were collected, in UTC.
+
+    Parameters
+    ----------
+    df : pl.DataFrame
+        The pre-processed DataFrame.
+    as_of_date : datetime.datetime
+        The date the data was collected.
+
+    Returns
+    -------
+    pl.DataFrame
+        The DataFrame with its `as_of_date`.
+    """
+    as_of_date = as_of_date.astimezone(zoneinfo.ZoneInfo("UTC")).replace(tzinfo=None)
+    return df.with_columns(
+        pl.lit(as_of_date, dtype=pl.Datetime).alias(EquipmentLoss.as_of_date.name),
+    )
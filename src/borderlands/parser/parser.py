@@ -113,3 +113,27 @@ class OryxParser(ParserBase):
                     "data_section_index must be specified when not parsing a multi-country article"
                 )
             yield from self._single_parse(data_section_index)
+
+
+def parse_page(
+    page: str, data_section_index: int | None = None, multi: bool = False
+) -> list[dict[str, Any]]:
+    """Parses an Oryx loss page. The parser only depends on `bs4`, so this is cheap to
+    run in a freshly spawned process.
+
+    Parameters
+    ----------
+    page : str
+        The Oryx web page as a string.
+    data_section_index : int, optional
+        The index of the data section of a single country article.
+    multi : bool
+        Whether the page lists the losses of both countries.
+
+    Returns
+    -------
+    list[dict]
+        The standardized equipment loss cases.
+    """
+    soup = bs4.BeautifulSoup(page, features="html.parser")
+    return list(OryxParser(soup, multi=multi).parse(data_section_index))
@@ -19,3 +19,13 @@ def create_oryx_key(dt: datetime.datetime | None = None, ext: str | None = None)
     else:
         prefix = misc.build_datetime_key(dt, "month") + "/" + dt.strftime(r"%Y-%m-%d")
     return prefix + (f".{ext.lstrip('.')}" if ext else "")
+
+
+def create_archive_key(dt: datetime.datetime) -> str:
+    """Creates the key for the compacted Oryx equipment losses of this date's month.
+
+    Args:
+        dt (datetime.datetime): Any date within the month of the archive.
+
+    """
+    return f"archive/oryx/{misc.build_datetime_key(dt, 'month')}.parquet"
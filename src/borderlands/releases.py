@@ -0,0 +1,396 @@
+"""
+Module for releasing datasets to the bucket.
+"""
+
+import hashlib
+import json
+from typing import Iterator
+from urllib.parse import quote
+
+import polars as pl
+from boto3.s3.transfer import TransferConfig
+from botocore.exceptions import ClientError
+from prefect import task
+from prefect_aws import S3Bucket
+from prefecto.logging import get_prefect_or_default_logger
+
+from .blocks import blocks
+from .schema import Dataset, Tag, WriteProfile
+from .snapshots import compute_content_hash
+from .utilities import io_, multipart, tasks
+
+# Small row groups keep the min/max statistics of the sorted lookup columns tight,
+# which lets readers skip most of a partition on point lookups
+PARTITION_ROW_GROUP_SIZE = 16_384
+# Hive's name for partitions of null values
+NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+# Objects larger than this are copied in parts, several at a time
+COPY_PART_SIZE = 64 * 1024**2
+
+
+def is_same_account(src_bucket: S3Bucket, dst_bucket: S3Bucket) -> bool:
+    """Whether objects can be copied between the buckets server-side. Both buckets
+    must be reachable with the same credentials, otherwise the destination cannot read
+    the source.
+
+    Args:
+        src_bucket (S3Bucket): The bucket to copy from.
+        dst_bucket (S3Bucket): The bucket to copy to.
+
+    Returns:
+        bool: Whether the buckets share credentials.
+    """
+    return src_bucket.credentials == dst_bucket.credentials
+
+
+def copy_object(
+    src_bucket: S3Bucket, src_key: str, dst_bucket: S3Bucket, dst_key: str
+) -> str:
+    """Copy an object between buckets. Buckets in the same account are copied
+    server-side, with a multipart copy for large objects, so the bytes never pass
+    through the worker. Otherwise the object is streamed through the worker.
+
+    Args:
+        src_bucket (S3Bucket): The bucket to copy from.
+        src_key (str): The key to copy from.
+        dst_bucket (S3Bucket): The bucket to copy to.
+        dst_key (str): The key to copy to.
+
+    Returns:
+        str: The resolved key of the copy.
+    """
+    logger = get_prefect_or_default_logger()
+    if not is_same_account(src_bucket, dst_bucket):
+        logger.info("Streaming '%s' across accounts", src_key)
+        return dst_bucket.stream_from(src_bucket, src_key, dst_key)
+
+    src_key = src_bucket._resolve_path(src_key)
+    dst_key = dst_bucket._resolve_path(dst_key)
+    client = dst_bucket.credentials.get_s3_client()
+    client.copy(
+        CopySource={"Bucket": src_bucket.bucket_name, "Key": src_key},
+        Bucket=dst_bucket.bucket_name,
+        Key=dst_key,
+        Config=TransferConfig(
+            multipart_threshold=COPY_PART_SIZE,
+            multipart_chunksize=COPY_PART_SIZE,
+        ),
+    )
+    logger.info(
+        "Copied '%s/%s' to '%s/%s' server-side",
+        src_bucket.bucket_name,
+        src_key,
+        dst_bucket.bucket_name,
+        dst_key,
+    )
+    return dst_key
+
+
+def create_partition_key(dataset: Dataset, values: dict) -> str:
+    """Create the Hive-style key for a partition of the dataset.
+
+    Args:
+        dataset (Dataset): The partitioned dataset.
+        values (dict): The partition field values.
+
+    Returns:
+        str: The key for the partition.
+
+    Examples:
+
+    >>> create_partition_key(oryx, {"country": "Russia", "category": "Tanks"})
+    'releases/oryx/country=Russia/category=Tanks/data.parquet'
+    """
+    parts = [
+        f"{name}={NULL_PARTITION if values[name] is None else quote(str(values[name]), safe='')}"
+        for name in dataset.partition_by
+    ]
+    return "/".join([dataset.partition_folder, *parts, "data.parquet"])
+
+
+def write_partition(df: pl.DataFrame, key: str, profile: WriteProfile) -> dict:
+    """Write a partition to the bucket.
+
+    Args:
+        df (pl.DataFrame): The partition.
+        key (str): The key to write the partition to.
+        profile (WriteProfile): The profile to write the partition with.
+
+    Returns:
+        dict: The manifest entry for the partition.
+    """
+    with multipart.MultipartWriter(blocks.bucket, key) as f:
+        profile.write(df, f, row_group_size=PARTITION_ROW_GROUP_SIZE)
+    return {
+        "path": key,
+        "rows": len(df),
+        "bytes": f.bytes_written,
+        "sha256": f.sha256.hexdigest(),
+    }
+
+
+def get_previous_partition_manifest(dataset: Dataset) -> dict | None:
+    """Get the manifest of the dataset's current partitioned release.
+
+    Args:
+        dataset (Dataset): The partitioned dataset.
+
+    Returns:
+        dict | None: The manifest or None if the dataset was never partitioned.
+    """
+    try:
+        return dataset.read_partition_manifest()
+    except ClientError as e:
+        if not io_.is_missing_object_error(e):
+            raise e
+        return None
+
+
+def iter_partitions(
+    df: pl.DataFrame | pl.LazyFrame, dataset: Dataset
+) -> Iterator[pl.DataFrame]:
+    """Iterate the dataset's partitions, each sorted by the remaining dimensions. Lazy
+    frames are collected one partition at a time, so only a single partition is held
+    in memory.
+
+    Args:
+        df (pl.DataFrame | pl.LazyFrame): The dataset to partition.
+        dataset (Dataset): The partitioned dataset.
+
+    Returns:
+        Iterator[pl.DataFrame]: Each partition.
+    """
+    sort_by = [
+        name
+        for name in dataset.schema.columns(include=[Tag.dimension])
+        if name not in dataset.partition_by
+    ]
+    if isinstance(df, pl.DataFrame):
+        yield from (
+            df.select(dataset.schema.columns())
+            .sort(sort_by)
+            .partition_by(dataset.partition_by, maintain_order=True)
+        )
+        return
+
+    lf = df.select(dataset.schema.columns())
+    partitions = (
+        lf.select(dataset.partition_by)
+        .unique()
+        .sort(dataset.partition_by, nulls_last=True)
+        .collect()
+    )
+    for values in partitions.iter_rows(named=True):
+        yield (
+            lf.filter(
+                pl.all_horizontal(
+                    pl.col(name).eq_missing(pl.lit(value, dtype=partitions[name].dtype))
+                    for name, value in values.items()
+                )
+            )
+            .sort(sort_by)
+            .collect()
+        )
+
+
+@task
+def release_partitions(df: pl.DataFrame | pl.LazyFrame, dataset: Dataset) -> dict:
+    """Release the dataset as Hive-style partitions with a manifest. Each partition is
+    sorted by the remaining dimensions so their row group statistics serve point
+    lookups, and its entry records the hash of its content without the metadata
+    fields, which only changes when its data does. Partitions that no longer exist are
+    removed after the new manifest is written.
+
+    Args:
+        df (pl.DataFrame | pl.LazyFrame): The dataset to release, such as the producer's frame or a lazy scan of the release.
+        dataset (Dataset): The partitioned dataset.
+
+    Returns:
+        dict: The manifest of the partitioned release.
+    """
+    logger = get_prefect_or_default_logger()
+    if not dataset.partition_by:
+        raise ValueError(f"{dataset.label} is not partitioned")
+
+    previous = get_previous_partition_manifest(dataset)
+    entries = []
+    for partition in iter_partitions(df, dataset):
+        values = partition.select(dataset.partition_by).row(0, named=True)
+        entry = write_partition(
+            partition, create_partition_key(dataset, values), dataset.profile
+        )
+        entries.append(
+            {
+                **entry,
+                "content_hash": compute_release_hash(partition, dataset),
+                "values": values,
+            }
+        )
+
+    manifest = {
+        "dataset": dataset.label,
+        "partition_by": dataset.partition_by,
+        "rows": sum(entry["rows"] for entry in entries),
+        "partitions": entries,
+    }
+    tasks.upload.fn(
+        content=json.dumps(manifest, indent=2),
+        key=dataset.partition_manifest_path,
+        bucket=blocks.bucket,
+    )
+    logger.info(
+        "Released %s partitions of %s to %s",
+        len(entries),
+        dataset.label,
+        dataset.partition_folder,
+    )
+
+    if previous is not None:
+        current = {entry["path"] for entry in entries}
+        stale = [
+            {"Key": blocks.bucket._resolve_path(entry["path"])}
+            for entry in previous["partitions"]
+            if entry["path"] not in current
+        ]
+        if stale:
+            client = blocks.bucket.credentials.get_s3_client()
+            for i in range(0, len(stale), 1000):
+                client.delete_objects(
+                    Bucket=blocks.bucket.bucket_name,
+                    Delete={"Objects": stale[i : i + 1000]},
+                )
+            logger.info("Removed %s stale partitions", len(stale))
+    return manifest
+
+
+def get_schema_fingerprint(dataset: Dataset) -> str:
+    """Get a fingerprint of the dataset's schema. It changes whenever a field is added,
+    removed, renamed, or retyped.
+
+    Args:
+        dataset (Dataset): The dataset.
+
+    Returns:
+        str: The SHA-256 hex digest of the field names and data types.
+    """
+    schema = {name: str(dtype) for name, dtype in dataset.schema.schema().items()}
+    return hashlib.sha256(json.dumps(schema).encode("utf-8")).hexdigest()
+
+
+def get_object_metadata(bucket: S3Bucket, key: str) -> dict:
+    """Get an object's metadata without downloading it.
+
+    Args:
+        bucket (S3Bucket): The bucket the object is in.
+        key (str): The key of the object.
+
+    Returns:
+        dict: The `head_object` response, with the object's size and ETag.
+    """
+    client = bucket.credentials.get_s3_client()
+    return client.head_object(Bucket=bucket.bucket_name, Key=bucket._resolve_path(key))
+
+
+def compute_release_hash(df: pl.DataFrame, dataset: Dataset) -> str:
+    """Hash the content of a release. Metadata fields such as `as_of_date` change with
+    every release, so they are left out and unchanged content keeps its hash.
+
+    Args:
+        df (pl.DataFrame): The released dataset or a part of it.
+        dataset (Dataset): The dataset.
+
+    Returns:
+        str: The SHA-256 hex digest of the content.
+    """
+    return compute_content_hash(
+        df, dataset.schema, exclude=dataset.schema.columns(include=[Tag.metadata])
+    )
+
+
+def create_release_manifest(
+    df: pl.DataFrame | pl.LazyFrame, metadata: dict, dataset: Dataset
+) -> dict:
+    """Create the manifest of a release. Lazy frames are collected to hash their
+    content, so pass the producer's frame when it is already in memory.
+
+    Args:
+        df (pl.DataFrame | pl.LazyFrame): The released dataset, such as the producer's frame or a lazy scan of the release.
+        metadata (dict): The `head_object` response of the released parquet file.
+        dataset (Dataset): The dataset.
+
+    Returns:
+        dict: The manifest.
+    """
+    if isinstance(df, pl.LazyFrame):
+        df = df.select(dataset.schema.columns()).collect()
+    schema = dataset.schema.schema()
+    temporal = [name for name, dtype in schema.items() if dtype.is_temporal()]
+    dimensions = dataset.schema.columns(include=[Tag.dimension])
+    stats = df.select(
+        *[pl.col(name).min().alias(f"{name}:min") for name in temporal],
+        *[pl.col(name).max().alias(f"{name}:max") for name in temporal],
+        *[pl.col(name).n_unique().alias(f"{name}:distinct") for name in dimensions],
+    ).row(0, named=True)
+
+    manifest = {
+        "dataset": dataset.label,
+        "path": dataset.release_path,
+        "content_hash": compute_release_hash(df, dataset),
+        "bytes": metadata["ContentLength"],
+        "rows": len(df),
+        "schema_fingerprint": get_schema_fingerprint(dataset),
+        "ranges": {
+            name: {
+                bound: value and value.isoformat()
+                for bound in ("min", "max")
+                for value in [stats[f"{name}:{bound}"]]
+            }
+            for name in temporal
+        },
+        "distinct": {name: stats[f"{name}:distinct"] for name in dimensions},
+    }
+    if dataset.partition_by:
+        manifest["partition_manifest"] = dataset.partition_manifest_path
+    return manifest
+
+
+def get_release_manifest(dataset: Dataset) -> dict | None:
+    """Get the manifest of the dataset's latest release.
+
+    Args:
+        dataset (Dataset): The dataset.
+
+    Returns:
+        dict | None: The manifest or None if the release has no manifest.
+    """
+    try:
+        return dataset.read_manifest()
+    except ClientError as e:
+        if not io_.is_missing_object_error(e):
+            raise e
+        return None
+
+
+@task
+def release_manifest(df: pl.DataFrame | pl.LazyFrame, dataset: Dataset) -> dict:
+    """Write the manifest next to the dataset's release so consumers can tell whether
+    and how the release changed without downloading it. The release's size comes from
+    its metadata, and its content hash from the frame.
+
+    Args:
+        df (pl.DataFrame | pl.LazyFrame): The released dataset, such as the producer's frame or a lazy scan of the release.
+        dataset (Dataset): The dataset.
+
+    Returns:
+        dict: The manifest.
+    """
+    logger = get_prefect_or_default_logger()
+    metadata = get_object_metadata(blocks.bucket, dataset.release_path)
+    manifest = create_release_manifest(df, metadata, dataset)
+    tasks.upload.fn(
+        content=json.dumps(manifest, indent=2),
+        key=dataset.manifest_path,
+        bucket=blocks.bucket,
+    )
+    logger.info("Wrote the manifest of %s to %s", dataset.label, dataset.manifest_path)
+    return manifest
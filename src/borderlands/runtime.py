@@ -0,0 +1,127 @@
+"""
+Module for sizing the pipeline's concurrency to the container it runs in.
+"""
+
+from __future__ import annotations
+
+import dataclasses as dc
+import os
+
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+from .utilities import cgroup
+
+# Memory budgeted for each download in flight, which is buffered before it is uploaded
+DOWNLOAD_MEMORY = 64 * 1024**2
+# Downloads are network bound, so each CPU drives several at once
+DOWNLOADS_PER_CPU = 10
+# Memory budgeted for each row of an export batch, serialized and compressed
+BATCH_ROW_MEMORY = 20 * 1024
+MIN_BATCH_SIZE = 10_000
+MAX_BATCH_SIZE = 500_000
+
+
+class RuntimeSettings(BaseSettings):
+    """Overrides for the runtime profile. Unset fields are sized from the container's
+    cgroup limits. The polars thread pool is sized from `cpus` when `borderlands` is
+    first imported, unless `POLARS_MAX_THREADS` is set.
+    """
+
+    model_config = SettingsConfigDict(env_prefix="BORDERLANDS_RUNTIME_")
+
+    cpus: float | None = Field(
+        default=None,
+        description="The CPUs available to the pipeline.",
+    )
+    memory_bytes: int | None = Field(
+        default=None,
+        description="The memory available to the pipeline.",
+    )
+    max_connections: int | None = Field(
+        default=None,
+        description="The connections kept by each pooled HTTP client.",
+    )
+    download_concurrency: int | None = Field(
+        default=None,
+        description="The media files downloaded at once.",
+    )
+    process_workers: int | None = Field(
+        default=None,
+        description="The processes used to stage releases.",
+    )
+    batch_size: int | None = Field(
+        default=None,
+        description="The rows serialized at a time by streaming exports.",
+    )
+
+
+@dc.dataclass(frozen=True)
+class RuntimeProfile:
+    """The concurrency and batch sizes the pipeline runs with.
+
+    Attributes:
+        cpus (float): The CPUs available to the pipeline.
+        memory_bytes (int): The memory available to the pipeline.
+        threads (int): The threads that keep the CPUs busy.
+        polars_threads (int): The size of the polars thread pool.
+        max_connections (int): The connections kept by each pooled HTTP client.
+        max_keepalive_connections (int): The idle connections kept open by each client.
+        download_concurrency (int): The media files downloaded at once.
+        process_workers (int): The processes used to stage releases.
+        batch_size (int): The rows serialized at a time by streaming exports.
+    """
+
+    cpus: float
+    memory_bytes: int
+    threads: int
+    polars_threads: int
+    max_connections: int
+    max_keepalive_connections: int
+    download_concurrency: int
+    process_workers: int
+    batch_size: int
+
+    @classmethod
+    def detect(cls, settings: RuntimeSettings) -> RuntimeProfile:
+        """Size the profile from the cgroup limits and the settings' overrides.
+
+        Args:
+            settings (RuntimeSettings): The overrides.
+
+        Returns:
+            RuntimeProfile: The profile.
+
+        Examples:
+
+        On an ECS task with 512 CPU units and 1024 MiB of memory:
+
+        >>> RuntimeProfile.detect(RuntimeSettings())
+        RuntimeProfile(cpus=0.5, memory_bytes=1073741824, threads=1, polars_threads=1, max_connections=20, max_keepalive_connections=10, download_concurrency=10, process_workers=1, batch_size=52428)
+        """
+        cpus = settings.cpus or cgroup.get_cpu_count()
+        memory_bytes = settings.memory_bytes or cgroup.get_memory()
+        threads = cgroup.get_thread_count(cpus)
+
+        download_concurrency = settings.download_concurrency or max(
+            1, min(DOWNLOADS_PER_CPU * threads, memory_bytes // DOWNLOAD_MEMORY)
+        )
+        max_connections = settings.max_connections or 2 * download_concurrency
+        batch_size = settings.batch_size or min(
+            MAX_BATCH_SIZE, max(MIN_BATCH_SIZE, memory_bytes // BATCH_ROW_MEMORY)
+        )
+        return cls(
+            cpus=cpus,
+            memory_bytes=memory_bytes,
+            threads=threads,
+            polars_threads=int(os.environ.get("POLARS_MAX_THREADS", threads)),
+            max_connections=max_connections,
+            max_keepalive_connections=max(1, max_connections // 2),
+            download_concurrency=download_concurrency,
+            process_workers=settings.process_workers or threads,
+            batch_size=batch_size,
+        )
+
+
+settings = RuntimeSettings()
+profile = RuntimeProfile.detect(settings)
@@ -5,5 +5,6 @@ Library for defining Polars schemas.
 from . import formatter
 from .dataset import Dataset
 from .fields import Field
+from .profiles import WriteProfile
 from .schema import Schema
 from .tags import Tag, TagSet
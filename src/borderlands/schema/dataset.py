@@ -4,12 +4,15 @@ source of truth and easier referencing.
 """
 
 import dataclasses as dc
-import io
+import json
+from pathlib import PurePosixPath
 
 import polars as pl
 
 from ..blocks import blocks
+from ..utilities import cache, io_
 from .formatter import Formatter
+from .profiles import WriteProfile, get_profile
 from .schema import FieldFilter, Schema
 
 
@@ -22,6 +25,10 @@ class Dataset(Formatter):
         host_bucket (str): The host bucket to fetch the dataset from.
         release_path (str): The path to release the dataset to.
         schema (Schema): The schema for the dataset.
+        description (str): The description of the dataset.
+        partition_by (list[str]): The fields to partition the release by. The release
+            is not partitioned if empty.
+        write_profile (str): The name of the profile to write the dataset with.
 
     """
 
@@ -30,6 +37,28 @@ class Dataset(Formatter):
     release_path: str
     schema: Schema
     description: str = dc.field(default_factory=str)
+    partition_by: list[str] = dc.field(default_factory=list)
+    write_profile: str = "release"
+
+    @property
+    def profile(self) -> WriteProfile:
+        """The profile to write the dataset with."""
+        return get_profile(self.write_profile)
+
+    @property
+    def partition_folder(self) -> str:
+        """The folder the partitioned release is written to."""
+        return PurePosixPath(self.release_path).with_suffix("").as_posix()
+
+    @property
+    def manifest_path(self) -> str:
+        """The path to the manifest of the release."""
+        return f"{self.partition_folder}.manifest.json"
+
+    @property
+    def partition_manifest_path(self) -> str:
+        """The path to the manifest of the partitioned release."""
+        return f"{self.partition_folder}/_manifest.json"
 
     def read(
         self, include: FieldFilter | None = None, exclude: FieldFilter | None = None
@@ -43,10 +72,116 @@ class Dataset(Formatter):
         Returns:
             pl.DataFrame: The dataset's latest release.
         """
-        with io.BytesIO() as f:
-            blocks.bucket.download_object_to_file_object(self.release_path, f)
-            f.seek(0)
-            return pl.read_parquet(f).select(self.schema.columns(include, exclude))
+        return cache.read_parquet(
+            blocks.bucket,
+            self.release_path,
+            columns=self.schema.columns(include, exclude),
+        )
+
+    def scan(
+        self,
+        include: FieldFilter | None = None,
+        exclude: FieldFilter | None = None,
+        predicate: pl.Expr | None = None,
+    ) -> pl.LazyFrame:
+        """Lazily scan the dataset's latest release. The selected fields and the
+        predicate are pushed down to the parquet reader, so only the needed column
+        chunks and row groups are downloaded.
+
+        Args:
+            include (FieldFilter, optional): A list of conditions to require for fields to be included. Performs an OR operation.
+            exclude (FieldFilter, optional): A list of conditions to exclude fields with. Performs an OR operation.
+            predicate (pl.Expr, optional): A filter to apply to the rows.
+
+        Returns:
+            pl.LazyFrame: The dataset's latest release.
+        """
+        lf = io_.scan_parquet(blocks.bucket, self.release_path)
+        if predicate is not None:
+            lf = lf.filter(predicate)
+        return lf.select(self.schema.columns(include, exclude))
+
+    def read_manifest(self) -> dict:
+        """Read the manifest of the dataset's latest release.
+
+        Returns:
+            dict: The manifest with the hash, size, row count, schema fingerprint, and
+                column statistics of the release.
+        """
+        return json.loads(blocks.bucket.read_path(self.manifest_path))
+
+    def read_partition_manifest(self) -> dict:
+        """Read the manifest of the dataset's partitioned release.
+
+        Returns:
+            dict: The manifest with the path, partition values, row count, and hash of
+                each partition.
+        """
+        return json.loads(blocks.bucket.read_path(self.partition_manifest_path))
+
+    def partition_paths(self, predicate: pl.Expr | None = None) -> list[str]:
+        """List the paths of the dataset's partitions. If the predicate only uses the
+        partition fields, it is evaluated against the manifest to skip the partitions
+        that cannot match.
+
+        Args:
+            predicate (pl.Expr, optional): A filter to apply to the rows.
+
+        Returns:
+            list[str]: The paths of the partitions that may match the predicate.
+        """
+        manifest = self.read_partition_manifest()
+        partitions = pl.from_dicts(
+            [
+                {**partition["values"], "path": partition["path"]}
+                for partition in manifest["partitions"]
+            ],
+            schema={
+                **{
+                    name: self.schema.__fields__[name].dtype
+                    for name in self.partition_by
+                },
+                "path": pl.Utf8,
+            },
+        )
+        if predicate is not None and set(predicate.meta.root_names()).issubset(
+            self.partition_by
+        ):
+            partitions = partitions.filter(predicate)
+        return partitions["path"].to_list()
+
+    def scan_partitions(
+        self,
+        include: FieldFilter | None = None,
+        exclude: FieldFilter | None = None,
+        predicate: pl.Expr | None = None,
+    ) -> pl.LazyFrame:
+        """Lazily scan the dataset's partitioned release. Only the partitions that may
+        match the predicate are read.
+
+        Args:
+            include (FieldFilter, optional): A list of conditions to require for fields to be included. Performs an OR operation.
+            exclude (FieldFilter, optional): A list of conditions to exclude fields with. Performs an OR operation.
+            predicate (pl.Expr, optional): A filter to apply to the rows.
+
+        Returns:
+            pl.LazyFrame: The dataset's latest partitioned release.
+        """
+        paths = self.partition_paths(predicate)
+        if not paths:
+            return pl.LazyFrame(schema=self.schema.schema(include, exclude))
+
+        lf = pl.scan_parquet(
+            [
+                f"s3://{blocks.bucket.bucket_name}/{blocks.bucket._resolve_path(path)}"
+                for path in paths
+            ],
+            hive_partitioning=False,
+            storage_options=io_.get_storage_options(blocks.bucket),
+        )
+        if predicate is not None:
+            lf = lf.filter(predicate)
+        return lf.select(self.schema.columns(include, exclude))
 
     def to_markdown(
         self,
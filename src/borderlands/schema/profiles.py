@@ -0,0 +1,155 @@
+"""
+Named parquet write profiles for datasets.
+"""
+
+from __future__ import annotations
+
+import dataclasses as dc
+import io
+import statistics as stats
+import time
+from pathlib import Path
+from typing import IO, Iterable
+
+import polars as pl
+
+
+@dc.dataclass(frozen=True)
+class WriteProfile:
+    """Parquet writer settings. Polars' writer dictionary-encodes columns on its own,
+    so only the codec, row groups, pages, and statistics are configurable.
+
+    Attributes:
+        name (str): The name of the profile.
+        compression (str): The compression codec.
+        compression_level (int, optional): The codec's compression level.
+        row_group_size (int, optional): The number of rows per row group.
+        data_page_size (int, optional): The size of each data page in bytes.
+        statistics (bool): Whether to write min/max/null count statistics.
+    """
+
+    name: str
+    compression: str
+    compression_level: int | None = None
+    row_group_size: int | None = None
+    data_page_size: int | None = None
+    statistics: bool = True
+
+    def options(self, **overrides) -> dict:
+        """Keyword arguments for `pl.DataFrame.write_parquet`.
+
+        Args:
+            **overrides: Settings to override for this write.
+
+        Returns:
+            dict: The writer keyword arguments.
+        """
+        profile = dc.replace(self, **overrides) if overrides else self
+        return {
+            "compression": profile.compression,
+            "compression_level": profile.compression_level,
+            "row_group_size": profile.row_group_size,
+            "data_page_size": profile.data_page_size,
+            "statistics": profile.statistics,
+        }
+
+    def write(self, df: pl.DataFrame, file: str | IO[bytes], **overrides) -> None:
+        """Write the DataFrame as parquet with this profile.
+
+        Args:
+            df (pl.DataFrame): The DataFrame to write.
+            file (str | IO[bytes]): The path or file object to write to.
+            **overrides: Settings to override for this write.
+        """
+        df.write_parquet(file, **self.options(**overrides))
+
+    def sink(self, lf: pl.LazyFrame, path: str | Path, **overrides) -> None:
+        """Stream the LazyFrame to a parquet file with this profile, without
+        collecting it.
+
+        Args:
+            lf (pl.LazyFrame): The LazyFrame to write.
+            path (str | Path): The path to write to.
+            **overrides: Settings to override for this write.
+        """
+        options = self.options(**overrides)
+        # The streaming writer names the page size differently
+        options["data_pagesize_limit"] = options.pop("data_page_size")
+        lf.sink_parquet(path, **options)
+
+
+# Written once and kept for a long time. Worth spending CPU on size.
+ARCHIVE = WriteProfile(
+    name="archive",
+    compression="zstd",
+    compression_level=19,
+    row_group_size=262_144,
+)
+# Written daily and downloaded by consumers. Balances write time and size.
+RELEASE = WriteProfile(
+    name="release",
+    compression="zstd",
+    compression_level=6,
+    row_group_size=65_536,
+)
+# Intermediate files that are read back soon after. Optimized for speed.
+SCRATCH = WriteProfile(
+    name="scratch",
+    compression="lz4",
+    statistics=False,
+)
+
+PROFILES: dict[str, WriteProfile] = {p.name: p for p in (ARCHIVE, RELEASE, SCRATCH)}
+
+
+def get_profile(name: str) -> WriteProfile:
+    """Get a write profile by name.
+
+    Args:
+        name (str): The name of the profile.
+
+    Raises:
+        ValueError: If there is no profile with the name.
+
+    Returns:
+        WriteProfile: The write profile.
+    """
+    if name not in PROFILES:
+        raise ValueError(f"Profile must be one of {tuple(PROFILES.keys())!r}")
+    return PROFILES[name]
+
+
+def benchmark(
+    df: pl.DataFrame, profiles: Iterable[WriteProfile], repeat: int = 3
+) -> list[dict]:
+    """Benchmark the write time and size of each profile on the DataFrame.
+
+    Args:
+        df (pl.DataFrame): The DataFrame to write.
+        profiles (Iterable[WriteProfile]): The profiles to benchmark.
+        repeat (int, optional): The number of writes to take the median time of. Defaults to 3.
+
+    Returns:
+        list[dict]: The profile, codec, size, and median write time of each profile.
+    """
+    raw = df.estimated_size()
+    results = []
+    for profile in profiles:
+        timings = []
+        for _ in range(repeat):
+            with io.BytesIO() as buffer:
+                start = time.perf_counter()
+                profile.write(df, buffer)
+                timings.append(time.perf_counter() - start)
+                size = buffer.tell()
+        results.append(
+            {
+                "profile": profile.name,
+                "codec": f"{profile.compression}({profile.compression_level or 'default'})",
+                "rows": len(df),
+                "bytes": size,
+                "ratio": round(raw / size, 2) if size else None,
+                "seconds": round(stats.median(timings), 4),
+            }
+        )
+    return results
@@ -0,0 +1,132 @@
+"""
+Module for deduplicating the daily Oryx snapshots by their content.
+"""
+
+from __future__ import annotations
+
+import dataclasses as dc
+import datetime
+import hashlib
+import io
+import json
+
+import polars as pl
+from botocore.exceptions import ClientError
+from prefect import task
+from prefecto.logging import get_prefect_or_default_logger
+
+from . import paths
+from .blocks import blocks
+from .definitions import EquipmentLoss
+from .schema import Schema, Tag
+from .utilities import io_, tasks
+
+# The pointer to the snapshot holding the current content
+LATEST_POINTER_KEY = f"oryx/{paths.create_oryx_key(ext='json')}"
+# Rows serialized at a time while hashing
+HASH_BATCH_SIZE = 65_536
+
+
+@dc.dataclass(frozen=True)
+class Snapshot:
+    """A daily snapshot of the Oryx equipment losses.
+
+    Attributes:
+        key (str): The key of the parquet object holding the snapshot's content.
+        content_hash (str): The canonical content hash of the snapshot.
+        changed (bool): Whether the content differs from the previous snapshot.
+        previous_key (str, optional): The key of the previous snapshot, if there was one.
+    """
+
+    key: str
+    content_hash: str
+    changed: bool
+    previous_key: str | None = None
+
+
+def compute_content_hash(
+    df: pl.DataFrame,
+    schema: type[Schema] = EquipmentLoss,
+    exclude: list[str] | None = None,
+) -> str:
+    """Compute a hash of the frame's content that does not depend on its row order,
+    column order, or the excluded columns. Rows are sorted by the schema's dimensions
+    and then the remaining flat columns, and hashed as newline-delimited JSON.
+
+    Args:
+        df (pl.DataFrame): The frame to hash.
+        schema (type[Schema], optional): The schema of the frame. Defaults to `EquipmentLoss`.
+        exclude (list[str], optional): Columns to leave out of the hash. Defaults to `as_of_date`.
+
+    Returns:
+        str: The SHA-256 hex digest of the content.
+    """
+    if exclude is None:
+        exclude = [EquipmentLoss.as_of_date.name]
+    columns = [name for name in schema.columns() if name not in exclude]
+    df = df.select(columns)
+
+    dimensions = [
+        name for name in schema.columns(include=[Tag.dimension]) if name in columns
+    ]
+    flat = [
+        name
+        for name, dtype in df.schema.items()
+        if name not in dimensions and not dtype.is_nested()
+    ]
+    df = df.sort(dimensions + flat, nulls_last=True)
+
+    digest = hashlib.sha256()
+    digest.update(json.dumps({k: str(v) for k, v in df.schema.items()}).encode("utf-8"))
+    for offset in range(0, len(df), HASH_BATCH_SIZE):
+        with io.BytesIO() as buffer:
+            df.slice(offset, HASH_BATCH_SIZE).write_ndjson(buffer)
+            digest.update(buffer.getvalue())
+    return digest.hexdigest()
+
+
+def get_latest_pointer() -> dict | None:
+    """Get the pointer to the latest snapshot.
+
+    Returns:
+        dict | None: The pointer or None if no snapshot has been recorded.
+    """
+    try:
+        return json.loads(blocks.bucket.read_path(LATEST_POINTER_KEY))
+    except ClientError as e:
+        if not io_.is_missing_object_error(e):
+            raise e
+        return None
+
+
+@task
+def update_latest_pointer(snapshot: Snapshot, dt: datetime.datetime) -> dict:
+    """Record the snapshot as the latest. Unchanged snapshots keep the pointer to the
+    object and date the content was first seen in.
+
+    Args:
+        snapshot (Snapshot): The latest snapshot.
+        dt (datetime.datetime): The datetime the snapshot was taken.
+
+    Returns:
+        dict: The pointer.
+    """
+    logger = get_prefect_or_default_logger()
+    previous = None if snapshot.changed else get_latest_pointer()
+    pointer = {
+        "key": snapshot.key,
+        "content_hash": snapshot.content_hash,
+        "as_of_date": dt.isoformat() if previous is None else previous["as_of_date"],
+        "checked_at": dt.isoformat(),
+    }
+    tasks.upload.fn(
+        content=json.dumps(pointer, indent=2),
+        key=LATEST_POINTER_KEY,
+        bucket=blocks.bucket,
+    )
+    logger.info(
+        "Latest snapshot is '%s' (%s)",
+        snapshot.key,
+        "changed" if snapshot.changed else "unchanged",
+    )
+    return pointer
@@ -0,0 +1,169 @@
+"""
+Module for staging dataset releases in several file formats.
+"""
+
+from __future__ import annotations
+
+import dataclasses as dc
+import hashlib
+import json
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import polars as pl
+
+from . import runtime
+from .blocks import blocks
+from .schema import Dataset, profiles
+from .schema.schema import FieldFilter
+from .utilities import cache, export
+
+EXTENSIONS = {
+    "json": ".json",
+    "ndjson": ".ndjson",
+    "csv": ".csv",
+    "parquet": ".parquet",
+    "ipc": ".arrow",
+}
+FORMATS = tuple(EXTENSIONS)
+# CSV has no list type, so list values are joined with this separator
+LIST_SEPARATOR = ";"
+MANIFEST_FILE = "manifest.json"
+
+
+@dc.dataclass
+class StagedDataset:
+    """A dataset to stage and the fields to stage it with.
+
+    Attributes:
+        dataset (Dataset): The dataset to stage.
+        include (FieldFilter, optional): A list of conditions to require for fields to be included.
+        exclude (FieldFilter, optional): A list of conditions to exclude fields with.
+    """
+
+    dataset: Dataset
+    include: FieldFilter | None = None
+    exclude: FieldFilter | None = None
+
+    def scan(self) -> pl.LazyFrame:
+        """Lazily scan the selected fields of the dataset's latest release."""
+        return cache.scan_parquet(blocks.bucket, self.dataset.release_path).select(
+            self.dataset.schema.columns(self.include, self.exclude)
+        )
+
+
+def write_shared_table(lf: pl.LazyFrame, path: Path) -> Path:
+    """Stream the frame to a local parquet file that every format is staged from.
+    Staging processes scan it rather than each reading the release, and parquet scans
+    can be streamed, so no format holds the whole table in memory.
+
+    Args:
+        lf (pl.LazyFrame): The frame to write.
+        path (Path): The path to write to.
+
+    Returns:
+        Path: The path to the table.
+    """
+    profiles.SCRATCH.sink(lf, path)
+    return path
+
+
+def stage_format(source: str, path: str, fmt: str, rows: int) -> dict:
+    """Stage a shared table in a file format. Runs in a staging process. Every format
+    is streamed, so only a batch of the table is in memory at a time.
+
+    Args:
+        source (str): The path to the shared parquet table.
+        path (str): The path to stage the table to.
+        fmt (str): The file format.
+        rows (int): The number of rows in the shared table.
+
+    Returns:
+        dict: The manifest entry for the staged file.
+    """
+    lf = pl.scan_parquet(source)
+    if fmt == "json":
+        export.write_json(lf, path, lines=False, max_workers=1)
+    elif fmt == "ndjson":
+        export.write_json(lf, path, lines=True, max_workers=1)
+    elif fmt == "csv":
+        lists = [name for name, dtype in lf.schema.items() if dtype.is_nested()]
+        lf.with_columns(
+            pl.col(name).cast(pl.List(pl.Utf8)).list.join(LIST_SEPARATOR)
+            for name in lists
+        ).sink_csv(path)
+    elif fmt == "parquet":
+        profiles.RELEASE.sink(lf, path)
+    elif fmt == "ipc":
+        lf.sink_ipc(path, compression=None)
+    else:
+        raise ValueError(f"Format must be one of {FORMATS!r}")
+
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(1024**2):
+            sha256.update(chunk)
+    return {
+        "path": Path(path).name,
+        "format": fmt,
+        "rows": rows,
+        "bytes": os.path.getsize(path),
+        "sha256": sha256.hexdigest(),
+    }
+
+
+def stage_datasets(
+    staged: list[StagedDataset],
+    folder: str | Path,
+    formats: tuple[str, ...] = FORMATS,
+    max_workers: int | None = None,
+) -> dict:
+    """Stage the datasets in every format. Each dataset is read once into a shared
+    table, and the formats are written concurrently in a process pool, so staging
+    takes about as long as the slowest format. A manifest of the staged files is
+    written to the folder.
+
+    Args:
+        staged (list[StagedDataset]): The datasets to stage.
+        folder (str | Path): The folder to stage the datasets to.
+        formats (tuple[str, ...], optional): The file formats. Defaults to all formats.
+        max_workers (int, optional): The number of staging processes. Defaults to the runtime profile's.
+
+    Returns:
+        dict: The manifest of the staged files.
+    """
+    unknown = set(formats) - set(FORMATS)
+    if unknown:
+        raise ValueError(f"Unknown formats {sorted(unknown)!r}")
+    folder = Path(folder)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        jobs = []
+        for i, item in enumerate(staged):
+            source = write_shared_table(item.scan(), Path(tmpdir) / f"{i}.parquet")
+            # Counted once from the parquet footer rather than by every format
+            rows = pl.scan_parquet(source).select(pl.len()).collect().item()
+            for fmt in formats:
+                path = folder / f"{item.dataset.label}{EXTENSIONS[fmt]}"
+                jobs.append((item.dataset.label, str(source), str(path), fmt, rows))
+
+        # Polars is not fork-safe, so staging processes are spawned
+        with ProcessPoolExecutor(
+            max_workers=min(
+                max_workers or runtime.profile.process_workers, len(jobs) or 1
+            ),
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as executor:
+            futures = [
+                (label, executor.submit(stage_format, source, path, fmt, rows))
+                for label, source, path, fmt, rows in jobs
+            ]
+            files = [{"dataset": label, **f.result()} for label, f in futures]
+
+    manifest = {"files": files}
+    with open(folder / MANIFEST_FILE, "w") as f:
+        json.dump(manifest, f, indent=4)
+    return manifest
@@ -0,0 +1,233 @@
+"""
+Module for keeping a local mirror of the dataset releases current.
+"""
+
+from __future__ import annotations
+
+import dataclasses as dc
+import hashlib
+import io
+import json
+import os
+import tempfile
+from pathlib import Path, PurePosixPath
+
+import polars as pl
+from prefect_aws import S3Bucket
+from prefecto.logging import get_prefect_or_default_logger
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+from .blocks import blocks
+from .releases import get_release_manifest
+from .schema import Dataset
+
+STATE_FILE = "_state.json"
+
+
+class SyncSettings(BaseSettings):
+    """Settings for the local mirror."""
+
+    model_config = SettingsConfigDict(env_prefix="BORDERLANDS_SYNC_")
+
+    directory: Path = Field(
+        default=Path.home() / "borderlands",
+        description="The directory the releases are mirrored to.",
+    )
+
+
+@dc.dataclass
+class SyncResult:
+    """The outcome of syncing a dataset.
+
+    Attributes:
+        dataset (str): The label of the dataset.
+        fetched (int): The number of files downloaded.
+        removed (int): The number of files removed.
+        unchanged (int): The number of files already current.
+        bytes (int): The number of bytes downloaded.
+    """
+
+    dataset: str
+    fetched: int = 0
+    removed: int = 0
+    unchanged: int = 0
+    bytes: int = 0
+
+
+class LocalMirror:
+    """A local copy of the dataset releases stored as Arrow IPC files, which are
+    memory-mapped when read. The release manifests are compared with the state of the
+    last sync so only the files whose content changed are downloaded.
+
+    Args:
+        directory (Path): The directory the releases are mirrored to.
+        bucket (S3Bucket): The bucket the releases are in.
+
+    Examples:
+
+    >>> mirror = LocalMirror(Path("borderlands"))
+    >>> mirror.sync(definitions.oryx)
+    SyncResult(dataset='Oryx', fetched=3, removed=0, unchanged=121, bytes=48213)
+    >>> mirror.scan(definitions.oryx).filter(pl.col("country") == "Russia").collect()
+    """
+
+    def __init__(self, directory: Path, bucket: S3Bucket | None = None):
+        self.directory = Path(directory)
+        self.bucket = bucket or blocks.bucket
+
+    def folder(self, dataset: Dataset) -> Path:
+        """The folder the dataset is mirrored to."""
+        return self.directory / PurePosixPath(dataset.partition_folder).name
+
+    def read_state(self, dataset: Dataset) -> dict:
+        """Read the state of the dataset's last sync.
+
+        Args:
+            dataset (Dataset): The dataset.
+
+        Returns:
+            dict: The release content hash and the content hash of each mirrored file by its path.
+        """
+        path = self.folder(dataset) / STATE_FILE
+        if not path.exists():
+            return {"content_hash": None, "files": {}}
+        return json.loads(path.read_text())
+
+    def write_state(self, dataset: Dataset, state: dict) -> None:
+        """Write the state of the dataset's sync.
+
+        Args:
+            dataset (Dataset): The dataset.
+            state (dict): The release content hash and the content hash of each mirrored file.
+        """
+        self._write_atomic(
+            self.folder(dataset) / STATE_FILE,
+            lambda f: f.write(json.dumps(state, indent=2).encode("utf-8")),
+        )
+
+    def list_remote(self, dataset: Dataset) -> dict[str, dict]:
+        """List the files of the dataset's release.
+
+        Args:
+            dataset (Dataset): The dataset.
+
+        Returns:
+            dict[str, dict]: The key, content hash, and file hash of each file by its
+                path in the mirror.
+        """
+        if not dataset.partition_by:
+            manifest = get_release_manifest(dataset)
+            return {
+                "data.arrow": {
+                    "key": dataset.release_path,
+                    "content_hash": manifest and manifest["content_hash"],
+                    "sha256": None,
+                }
+            }
+
+        files = {}
+        for entry in dataset.read_partition_manifest()["partitions"]:
+            relative = PurePosixPath(entry["path"]).relative_to(
+                dataset.partition_folder
+            )
+            files[relative.with_suffix(".arrow").as_posix()] = {
+                "key": entry["path"],
+                "content_hash": entry.get("content_hash"),
+                "sha256": entry["sha256"],
+            }
+        return files
+
+    def sync(self, dataset: Dataset) -> SyncResult:
+        """Bring the dataset's mirror up to date with its latest release.
+
+        Args:
+            dataset (Dataset): The dataset.
+
+        Returns:
+            SyncResult: The files fetched, removed, and left unchanged.
+        """
+        logger = get_prefect_or_default_logger()
+        result = SyncResult(dataset=dataset.label)
+        state = self.read_state(dataset)
+        manifest = get_release_manifest(dataset)
+        if manifest is not None and manifest["content_hash"] == state.get(
+            "content_hash"
+        ):
+            result.unchanged = len(state["files"])
+            logger.info("%s is up to date", dataset.label)
+            return result
+
+        folder = self.folder(dataset)
+        remote = self.list_remote(dataset)
+        for path, entry in remote.items():
+            # Compared by content, since the metadata fields such as `as_of_date`
+            # change the file with every release
+            if (
+                entry["content_hash"] is not None
+                and state["files"].get(path) == entry["content_hash"]
+            ):
+                result.unchanged += 1
+                continue
+            content = self.bucket.read_path(entry["key"])
+            sha256 = hashlib.sha256(content).hexdigest()
+            if entry["sha256"] is not None and sha256 != entry["sha256"]:
+                raise ValueError(f"'{entry['key']}' does not match its manifest hash")
+
+            df = pl.read_parquet(io.BytesIO(content))
+            self._write_atomic(folder / path, df.write_ipc)
+            state["files"][path] = entry["content_hash"]
+            result.fetched += 1
+            result.bytes += len(content)
+
+        for path in set(state["files"]) - set(remote):
+            (folder / path).unlink(missing_ok=True)
+            del state["files"][path]
+            result.removed += 1
+
+        state["content_hash"] = manifest and manifest["content_hash"]
+        self.write_state(dataset, state)
+        logger.info(
+            "Synced %s: %s fetched (%s bytes), %s removed, %s unchanged",
+            dataset.label,
+            result.fetched,
+            result.bytes,
+            result.removed,
+            result.unchanged,
+        )
+        return result
+
+    def scan(self, dataset: Dataset) -> pl.LazyFrame:
+        """Lazily scan the dataset's mirror. The files are memory-mapped.
+
+        Args:
+            dataset (Dataset): The dataset.
+
+        Returns:
+            pl.LazyFrame: The mirrored dataset.
+        """
+        paths = sorted(self.read_state(dataset)["files"])
+        if not paths:
+            raise FileNotFoundError(f"{dataset.label} has not been synced")
+        folder = self.folder(dataset)
+        return pl.concat(
+            [pl.scan_ipc(folder / path, memory_map=True) for path in paths],
+            how="vertical_relaxed",
+        ).select(dataset.schema.columns())
+
+    @staticmethod
+    def _write_atomic(path: Path, write) -> None:
+        """Write to a temporary file next to `path`, then move it in place so readers
+        never see a partial file."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".partial")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                write(f)
+            os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+
+settings = SyncSettings()
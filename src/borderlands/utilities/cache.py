@@ -0,0 +1,198 @@
+"""
+Local on-disk cache for objects read from the bucket.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import polars as pl
+from prefect_aws import S3Bucket
+from prefecto.logging import get_prefect_or_default_logger
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+from . import io_
+
+
+class CacheSettings(BaseSettings):
+    """Settings for the local read cache."""
+
+    model_config = SettingsConfigDict(env_prefix="BORDERLANDS_CACHE_")
+
+    enabled: bool = Field(
+        default=True,
+        description="Whether objects read from the bucket are cached locally.",
+    )
+    directory: Path = Field(
+        default=Path.home() / ".cache" / "borderlands",
+        description="The directory cached objects are stored in.",
+    )
+    max_bytes: int = Field(
+        default=2 * 1024**3,
+        description="The size the cache is trimmed to, evicting the least recently used objects first.",
+    )
+
+
+class LocalCache:
+    """A content-addressed cache of bucket objects. Entries are named by the object's
+    ETag and size, so copies of the same object share an entry. Every read revalidates
+    the entry with a HEAD request, which is much cheaper than the download it saves.
+
+    Args:
+        directory (Path): The directory cached objects are stored in.
+        max_bytes (int): The size the cache is trimmed to.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def entry_id(bucket: S3Bucket, key: str, head: dict) -> str:
+        """Gets the ID of the cache entry for an object.
+
+        Args:
+            bucket (S3Bucket): The bucket the object is in.
+            key (str): The resolved key of the object.
+            head (dict): The response of a HEAD request for the object.
+
+        Returns:
+            str: The cache entry ID.
+        """
+        if head.get("ETag"):
+            content = f"{head['ETag']}:{head['ContentLength']}"
+        else:
+            content = f"{bucket.bucket_name}/{key}:{head['ContentLength']}:{head['LastModified'].isoformat()}"
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def get(self, bucket: S3Bucket, key: str) -> Path:
+        """Gets the path to a local copy of the object, downloading it if the cached
+        copy is missing or stale.
+
+        Args:
+            bucket (S3Bucket): The bucket the object is in.
+            key (str): The key of the object.
+
+        Returns:
+            Path: The path to the cached object.
+        """
+        logger = get_prefect_or_default_logger()
+        key = bucket._resolve_path(key)
+        client = bucket.credentials.get_s3_client()
+        head = client.head_object(Bucket=bucket.bucket_name, Key=key)
+
+        id_ = self.entry_id(bucket, key, head)
+        path = self.directory / id_[:2] / id_
+        if path.exists():
+            logger.debug("Cache hit for '%s'", key)
+            self.mark_used(path)
+            return path
+
+        logger.debug("Cache miss for '%s'", key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".partial")
+        os.close(fd)
+        try:
+            client.download_file(Bucket=bucket.bucket_name, Key=key, Filename=tmp)
+            os.replace(tmp, path)
+            self.mark_used(path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+        self.evict(keep=path)
+        return path
+
+    @staticmethod
+    def mark_used(path: Path) -> None:
+        """Marks the entry as recently used. The modification time is set explicitly
+        because file systems update it from a coarse clock.
+
+        Args:
+            path (Path): The path to the entry.
+        """
+        now = time.time_ns()
+        os.utime(path, ns=(now, now))
+
+    def evict(self, keep: Path | None = None) -> None:
+        """Removes the least recently used entries until the cache fits `max_bytes`.
+
+        Args:
+            keep (Path, optional): An entry to never evict.
+        """
+        entries = [
+            (p.stat(), p)
+            for p in self.directory.glob("*/*")
+            if p.is_file() and p.suffix != ".partial"
+        ]
+        total = sum(stat.st_size for stat, _ in entries)
+        for stat, path in sorted(entries, key=lambda entry: entry[0].st_mtime_ns):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            path.unlink(missing_ok=True)
+            total -= stat.st_size
+
+
+settings = CacheSettings()
+cache = LocalCache(settings.directory, settings.max_bytes)
+
+
+def read_bytes(bucket: S3Bucket, key: str) -> bytes:
+    """Reads an object from the bucket through the local cache.
+
+    Args:
+        bucket (S3Bucket): The bucket the object is in.
+        key (str): The key of the object.
+
+    Returns:
+        bytes: The object's content.
+    """
+    if not settings.enabled:
+        return bucket.read_path(key)
+    return cache.get(bucket, key).read_bytes()
+
+
+def read_parquet(
+    bucket: S3Bucket, key: str, columns: list[str] | None = None
+) -> pl.DataFrame:
+    """Reads a parquet object from the bucket through the local cache. Cached objects
+    are memory-mapped.
+
+    Args:
+        bucket (S3Bucket): The bucket the object is in.
+        key (str): The key of the object.
+        columns (list[str], optional): The columns to read. Defaults to all.
+
+    Returns:
+        pl.DataFrame: The object's content.
+    """
+    if not settings.enabled:
+        with io.BytesIO() as buffer:
+            bucket.download_object_to_file_object(key, buffer)
+            buffer.seek(0)
+            return pl.read_parquet(buffer, columns=columns)
+    return pl.read_parquet(cache.get(bucket, key), columns=columns, memory_map=True)
+
+
+def scan_parquet(bucket: S3Bucket, key: str) -> pl.LazyFrame:
+    """Lazily scans a parquet object from the bucket through the local cache. The
+    object is downloaded once and queries read only the row groups they need from disk.
+
+    Args:
+        bucket (S3Bucket): The bucket the object is in.
+        key (str): The key of the object.
+
+    Returns:
+        pl.LazyFrame: The object's content.
+    """
+    if not settings.enabled:
+        return io_.scan_parquet(bucket, key)
+    return pl.scan_parquet(cache.get(bucket, key))
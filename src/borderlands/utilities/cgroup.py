@@ -0,0 +1,114 @@
+"""
+Readers for the CPU and memory limits of the container, from its cgroup.
+
+Only the standard library is imported, so the limits can be read before any module
+that sizes itself on import, such as polars.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+from pathlib import Path
+
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+# cgroup v1 reports no memory limit as a number near the largest 64-bit integer
+UNLIMITED_MEMORY = 2**60
+
+
+def _read(path: Path) -> str | None:
+    try:
+        return path.read_text().strip()
+    except OSError:
+        return None
+
+
+def read_cpu_limit(root: Path = CGROUP_ROOT) -> float | None:
+    """Reads the CPU quota of the cgroup, in CPUs. Supports cgroup v2 (`cpu.max`) and
+    v1 (`cpu.cfs_quota_us` and `cpu.cfs_period_us`).
+
+    Args:
+        root (Path, optional): The cgroup filesystem. Defaults to `/sys/fs/cgroup`.
+
+    Returns:
+        float | None: The CPU quota, or None if it is unlimited or unknown.
+    """
+    value = _read(root / "cpu.max")
+    if value is not None:
+        quota, _, period = value.partition(" ")
+        if quota == "max":
+            return None
+        return int(quota) / int(period or 100_000)
+
+    quota = _read(root / "cpu" / "cpu.cfs_quota_us")
+    period = _read(root / "cpu" / "cpu.cfs_period_us")
+    if quota is None or period is None or int(quota) <= 0:
+        return None
+    return int(quota) / int(period)
+
+
+def read_memory_limit(root: Path = CGROUP_ROOT) -> int | None:
+    """Reads the memory limit of the cgroup, in bytes. Supports cgroup v2
+    (`memory.max`) and v1 (`memory.limit_in_bytes`).
+
+    Args:
+        root (Path, optional): The cgroup filesystem. Defaults to `/sys/fs/cgroup`.
+
+    Returns:
+        int | None: The memory limit, or None if it is unlimited or unknown.
+    """
+    value = _read(root / "memory.max")
+    if value is None:
+        value = _read(root / "memory" / "memory.limit_in_bytes")
+    if value is None or value == "max" or int(value) >= UNLIMITED_MEMORY:
+        return None
+    return int(value)
+
+
+def get_cpu_count(root: Path = CGROUP_ROOT) -> float:
+    """Gets the CPUs available to the process: the cgroup quota if there is one,
+    otherwise the CPUs the process may be scheduled on.
+
+    Args:
+        root (Path, optional): The cgroup filesystem. Defaults to `/sys/fs/cgroup`.
+
+    Returns:
+        float: The CPUs, which may be fractional.
+    """
+    try:
+        available = len(os.sched_getaffinity(0))
+    except AttributeError:  # pragma: no cover
+        available = os.cpu_count() or 1
+    limit = read_cpu_limit(root)
+    return available if limit is None else min(limit, available)
+
+
+def get_memory(root: Path = CGROUP_ROOT) -> int:
+    """Gets the memory available to the process: the cgroup limit if there is one,
+    otherwise the physical memory.
+
+    Args:
+        root (Path, optional): The cgroup filesystem. Defaults to `/sys/fs/cgroup`.
+
+    Returns:
+        int: The memory, in bytes.
+    """
+    physical = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    limit = read_memory_limit(root)
+    return physical if limit is None else min(limit, physical)
+
+
+def get_thread_count(cpus: float | str | None = None, root: Path = CGROUP_ROOT) -> int:
+    """Gets the number of threads that keeps the CPUs busy without oversubscribing
+    them, which is at least one.
+
+    Args:
+        cpus (float | str, optional): The CPUs. Defaults to `get_cpu_count`.
+        root (Path, optional): The cgroup filesystem. Defaults to `/sys/fs/cgroup`.
+
+    Returns:
+        int: The number of threads.
+    """
+    if cpus is None:
+        cpus = get_cpu_count(root)
+    return max(1, math.ceil(float(cpus)))
@@ -0,0 +1,160 @@
+"""
+Streaming JSON exports of lazy frames with parallel compression.
+"""
+
+from __future__ import annotations
+
+import collections
+import gzip
+import itertools
+import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import IO, Callable, Iterator
+
+import polars as pl
+
+from .. import runtime
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+COMPRESSIONS = ("gzip", "zstd")
+
+
+def iter_batches(file: IO[bytes], batch_size: int | None = None) -> Iterator[bytes]:
+    """Iterates over a newline-delimited file in batches of lines. Only one batch is
+    held in memory at a time, which bounds the memory of an export regardless of its
+    size.
+
+    Args:
+        file (IO[bytes]): The file to iterate over.
+        batch_size (int, optional): The number of lines per batch. Defaults to the runtime profile's.
+
+    Yields:
+        Iterator[bytes]: The batches.
+    """
+    batch_size = batch_size or runtime.profile.batch_size
+    while lines := list(itertools.islice(file, batch_size)):
+        yield b"".join(lines)
+
+
+def get_compressor(
+    compression: str | None, compression_level: int | None = None
+) -> Callable[[bytes], bytes]:
+    """Gets a function that compresses a chunk into a self-contained gzip member or
+    zstd frame. Concatenated members and frames decompress as one stream, so chunks
+    can be compressed independently and in parallel.
+
+    Args:
+        compression (str, optional): 'gzip', 'zstd', or None for no compression.
+        compression_level (int, optional): The codec's compression level.
+
+    Returns:
+        Callable[[bytes], bytes]: The compressor.
+    """
+    if compression is None:
+        return lambda chunk: chunk
+    if compression == "gzip":
+        level = 6 if compression_level is None else compression_level
+        return lambda chunk: gzip.compress(chunk, compresslevel=level, mtime=0)
+    if compression == "zstd":
+        if zstandard is None:
+            raise ImportError("zstd compression requires the 'zstandard' package")
+        level = 3 if compression_level is None else compression_level
+        return lambda chunk: zstandard.ZstdCompressor(level=level).compress(chunk)
+    raise ValueError(f"Compression must be one of {COMPRESSIONS!r} or None")
+
+
+def write_chunks(
+    chunks: Iterator[bytes],
+    file: IO[bytes],
+    compression: str | None = None,
+    compression_level: int | None = None,
+    max_workers: int | None = None,
+) -> int:
+    """Compresses the chunks in a thread pool and writes them in order. At most
+    `max_workers` chunks are in flight at a time.
+
+    Args:
+        chunks (Iterator[bytes]): The chunks to write.
+        file (IO[bytes]): The file to write to.
+        compression (str, optional): 'gzip', 'zstd', or None for no compression.
+        compression_level (int, optional): The codec's compression level.
+        max_workers (int, optional): The number of compression threads. Defaults to the runtime profile's threads.
+
+    Returns:
+        int: The number of bytes written.
+    """
+    compress = get_compressor(compression, compression_level)
+    max_workers = max_workers or runtime.profile.threads
+    written = 0
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending: collections.deque[Future] = collections.deque()
+        for chunk in chunks:
+            pending.append(executor.submit(compress, chunk))
+            if len(pending) >= max_workers:
+                written += file.write(pending.popleft().result())
+        while pending:
+            written += file.write(pending.popleft().result())
+    return written
+
+
+def write_json(
+    lf: pl.LazyFrame,
+    path: str | Path,
+    lines: bool = True,
+    compression: str | None = None,
+    compression_level: int | None = None,
+    batch_size: int | None = None,
+    max_workers: int | None = None,
+) -> int:
+    """Streams the frame to a JSON file batch by batch. The frame is first sunk to a
+    temporary newline-delimited file by polars' streaming engine, so it must be
+    streamable, as scans of parquet files are.
+
+    Args:
+        lf (pl.LazyFrame): The frame to export.
+        path (str | Path): The path to write to.
+        lines (bool, optional): Write newline-delimited JSON if True, otherwise a JSON array of records. Defaults to True.
+        compression (str, optional): 'gzip', 'zstd', or None for no compression. Defaults to None.
+        compression_level (int, optional): The codec's compression level.
+        batch_size (int, optional): The number of rows per batch. Defaults to the runtime profile's.
+        max_workers (int, optional): The number of compression threads. Defaults to the runtime profile's threads.
+
+    Returns:
+        int: The number of bytes written.
+
+    Examples:
+
+    >>> write_json(oryx.scan(), "oryx.ndjson.gz", compression="gzip")
+    """
+
+    def iter_chunks(records: IO[bytes]) -> Iterator[bytes]:
+        first = True
+        if not lines:
+            yield b"["
+        for batch in iter_batches(records, batch_size):
+            if not lines:
+                # Strings are escaped, so every newline separates two records
+                batch = (b"" if first else b",\n") + batch.rstrip(b"\n").replace(
+                    b"\n", b",\n"
+                )
+            first = False
+            yield batch
+        if not lines:
+            yield b"]"
+
+    with tempfile.TemporaryDirectory(dir=Path(path).parent) as tmpdir:
+        records_path = Path(tmpdir) / "records.ndjson"
+        lf.sink_ndjson(records_path)
+        with open(records_path, "rb") as records, open(path, "wb") as f:
+            return write_chunks(
+                iter_chunks(records),
+                f,
+                compression=compression,
+                compression_level=compression_level,
+                max_workers=max_workers,
+            )
@@ -7,6 +7,8 @@ from __future__ import annotations
 import mimetypes
 from typing import Any
 
+import polars as pl
+from botocore.exceptions import ClientError
 from prefect import task
 from prefect_aws import S3Bucket
 
@@ -42,6 +44,68 @@ def list_bucket(bucket: S3Bucket, **kwds) -> list[dict[str, Any]]:
     return bucket.list_objects(**kwds)
 
 
+def get_storage_options(bucket: S3Bucket) -> dict[str, str]:
+    """Gets the cloud storage options for Polars' native S3 reader from the bucket's
+    credentials. Credentials are resolved through boto3 so profiles, environment
+    variables, and container roles all work.
+
+    Parameters
+    ----------
+    bucket : S3Bucket
+
+    Returns
+    ----------
+    dict[str, str]
+    Storage options for `pl.scan_parquet`.
+    """
+    session = bucket.credentials.get_boto3_session()
+    options: dict[str, str] = {}
+
+    credentials = session.get_credentials()
+    if credentials is not None:
+        frozen = credentials.get_frozen_credentials()
+        options["aws_access_key_id"] = frozen.access_key
+        options["aws_secret_access_key"] = frozen.secret_key
+        if frozen.token:
+            options["aws_session_token"] = frozen.token
+
+    if session.region_name:
+        options["aws_region"] = session.region_name
+
+    endpoint_url = bucket.credentials.aws_client_parameters.endpoint_url
+    if endpoint_url:
+        options["aws_endpoint_url"] = endpoint_url
+    return options
+
+
+def scan_parquet(bucket: S3Bucket, key: str) -> pl.LazyFrame:
+    """Lazily scans a parquet object in the bucket. Only the footer is read up front;
+    the column chunks and row groups are fetched with ranged reads once the query's
+    projections and predicates are known.
+
+    Parameters
+    ----------
+    bucket : S3Bucket
+    key : str
+        Key of the parquet object.
+
+    Returns
+    ----------
+    pl.LazyFrame
+    """
+    # Snapshot keys such as 'oryx/year=2023/month=07/...' are not Hive partitions
+    return pl.scan_parquet(
+        f"s3://{bucket.bucket_name}/{bucket._resolve_path(key)}",
+        hive_partitioning=False,
+        storage_options=get_storage_options(bucket),
+    )
+
+
+def is_missing_object_error(e: ClientError) -> bool:
+    """Whether the client error was raised because the object does not exist."""
+    return e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey")
+
+
 def infer_media_extension(
     url: str | None = None, headers: dict | None = None
 ) -> str | None:
@@ -0,0 +1,188 @@
+"""
+Streaming uploads to the bucket with S3 multipart uploads.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import polars as pl
+from prefect_aws import S3Bucket
+from prefecto.logging import get_prefect_or_default_logger
+
+from . import wrappers
+
+# S3 requires every part but the last to be at least 5 MiB
+MIN_PART_SIZE = 5 * 1024**2
+DEFAULT_PART_SIZE = 8 * 1024**2
+
+
+class MultipartWriter(io.RawIOBase):
+    """A writable file object that streams its content to the bucket as a multipart
+    upload. Parts are uploaded concurrently while the writer keeps producing bytes, and
+    at most `max_concurrency` parts are buffered at any time, so memory use does not
+    grow with the size of the object. Objects smaller than one part are uploaded with a
+    single PUT.
+
+    Args:
+        bucket (S3Bucket): The bucket to upload to.
+        key (str): The key to upload to.
+        part_size (int, optional): The size of each part. Defaults to 8 MiB.
+        max_concurrency (int, optional): The number of parts uploaded at once. Defaults to 4.
+
+    Examples:
+
+    >>> with MultipartWriter(blocks.bucket, "oryx/latest.parquet") as f:
+    ...     df.write_parquet(f)
+    """
+
+    def __init__(
+        self,
+        bucket: S3Bucket,
+        key: str,
+        part_size: int = DEFAULT_PART_SIZE,
+        max_concurrency: int = 4,
+    ):
+        super().__init__()
+        if part_size < MIN_PART_SIZE:
+            raise ValueError(f"Part size must be at least {MIN_PART_SIZE} bytes")
+        self.bucket_name = bucket.bucket_name
+        self.key = bucket._resolve_path(key)
+        self.part_size = part_size
+        self.bytes_written = 0
+        self.sha256 = hashlib.sha256()
+
+        self._client = bucket.credentials.get_s3_client()
+        self._buffer = bytearray()
+        self._upload_id: str | None = None
+        self._parts: list[Future] = []
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency)
+
+    def writable(self) -> bool:
+        """Returns whether the writer is writable."""
+        return True
+
+    def tell(self) -> int:
+        """Returns the number of bytes written."""
+        return self.bytes_written
+
+    def write(self, b: bytes) -> int:
+        """Buffers the bytes and uploads every full part.
+
+        Args:
+            b (bytes): The bytes to write.
+
+        Returns:
+            int: The number of bytes written.
+        """
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+        self._buffer += b
+        self.bytes_written += len(b)
+        self.sha256.update(b)
+        while len(self._buffer) >= self.part_size:
+            self._submit(bytes(self._buffer[: self.part_size]))
+            del self._buffer[: self.part_size]
+        return len(b)
+
+    def _submit(self, data: bytes) -> None:
+        """Submits a part to be uploaded. Blocks while too many parts are in flight."""
+        if self._upload_id is None:
+            self._upload_id = self._client.create_multipart_upload(
+                Bucket=self.bucket_name, Key=self.key
+            )["UploadId"]
+        # Fail fast if a previous part failed
+        for part in self._parts:
+            if part.done() and part.exception() is not None:
+                raise part.exception()
+
+        self._slots.acquire()
+        self._parts.append(
+            self._executor.submit(self._upload_part, len(self._parts) + 1, data)
+        )
+
+    def _upload_part(self, part_number: int, data: bytes) -> dict:
+        """Uploads a part and releases its buffer slot."""
+        try:
+            response = self._client.upload_part(
+                Bucket=self.bucket_name,
+                Key=self.key,
+                UploadId=self._upload_id,
+                PartNumber=part_number,
+                Body=data,
+            )
+            return {"PartNumber": part_number, "ETag": response["ETag"]}
+        finally:
+            self._slots.release()
+
+    def close(self) -> None:
+        """Uploads the remaining bytes and completes the upload."""
+        if self.closed:
+            return
+        try:
+            if self._upload_id is None:
+                self._client.put_object(
+                    Bucket=self.bucket_name, Key=self.key, Body=bytes(self._buffer)
+                )
+            else:
+                if self._buffer:
+                    self._submit(bytes(self._buffer))
+                parts = [part.result() for part in self._parts]
+                self._client.complete_multipart_upload(
+                    Bucket=self.bucket_name,
+                    Key=self.key,
+                    UploadId=self._upload_id,
+                    MultipartUpload={"Parts": parts},
+                )
+            self._buffer.clear()
+        except BaseException:
+            self.abort()
+            raise
+        finally:
+            self._executor.shutdown(wait=True)
+            super().close()
+
+    def abort(self) -> None:
+        """Aborts the upload so no partial object or orphaned parts are left behind."""
+        if self.closed:
+            return
+        self._buffer.clear()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        if self._upload_id is not None:
+            self._client.abort_multipart_upload(
+                Bucket=self.bucket_name, Key=self.key, UploadId=self._upload_id
+            )
+            self._upload_id = None
+        super().close()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Completes the upload, or aborts it if an exception was raised."""
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+
+
+@wrappers.instrument
+def upload_parquet(df: pl.DataFrame, key: str, bucket: S3Bucket, **kwds) -> str:
+    """Streams the DataFrame to the bucket as parquet without holding the encoded
+    file in memory.
+
+    Args:
+        df (pl.DataFrame): The DataFrame to upload.
+        key (str): The key to upload to.
+        bucket (S3Bucket): The bucket to upload to.
+        **kwds: Keyword arguments for `pl.DataFrame.write_parquet`.
+
+    Returns:
+        str: The key the DataFrame was uploaded to.
+    """
+    logger = get_prefect_or_default_logger()
+    with MultipartWriter(bucket, key) as f:
+        df.write_parquet(f, **kwds)
+    logger.info("Uploaded %s bytes to '%s'", f.bytes_written, f.key)
+    return f.key
@@ -0,0 +1,196 @@
+"""
+Content-keyed task results persisted to the bucket, so retries and same-day reruns
+reuse the work that already finished.
+"""
+
+from __future__ import annotations
+
+import array
+import base64
+import datetime
+import functools
+import hashlib
+import importlib
+import inspect
+import io
+from typing import Any, Callable, Literal
+
+import polars as pl
+from prefect.context import TaskRunContext
+from prefect.filesystems import WritableFileSystem
+from prefect.serializers import Serializer
+from prefect.utilities.asyncutils import run_sync_in_worker_thread, sync_compatible
+from prefect.utilities.hashing import hash_objects
+from pydantic import VERSION as PYDANTIC_VERSION
+
+from ..blocks import blocks, load_bucket
+
+if PYDANTIC_VERSION.startswith("2."):
+    from pydantic.v1 import Field
+else:  # pragma: no cover
+    from pydantic import Field
+
+RESULTS_FOLDER = "results"
+# Cached results are only reused for a day, so a fix to the pipeline takes effect by
+# the next daily run
+RESULT_EXPIRATION = datetime.timedelta(days=1)
+# Rows of nested columns serialized at a time while hashing
+HASH_BATCH_SIZE = 65_536
+
+
+class ParquetSerializer(Serializer):
+    """Serializes DataFrames as Parquet, which is smaller and faster to load than the
+    default pickles. Prefect stores results in JSON, so the file is base64 encoded."""
+
+    type: Literal["parquet"] = "parquet"
+
+    def dumps(self, obj: pl.DataFrame) -> bytes:
+        buffer = io.BytesIO()
+        obj.write_parquet(buffer, compression="zstd")
+        return base64.encodebytes(buffer.getvalue())
+
+    def loads(self, blob: bytes) -> pl.DataFrame:
+        return pl.read_parquet(io.BytesIO(base64.decodebytes(blob)))
+
+
+class BucketResults(WritableFileSystem):
+    """Stores task results in a folder of an S3 bucket block.
+
+    Prefect re-validates result storage blocks, which breaks the nested credentials
+    of an `S3Bucket`, so this block only holds the bucket block's name and loads the
+    bucket when results are read or written.
+    """
+
+    _block_type_name = "Borderlands Bucket Results"
+
+    bucket_block_name: str = Field(
+        default=blocks.bucket_block_name,
+        description="The S3 bucket block the results are stored in.",
+    )
+    folder: str = Field(
+        default=RESULTS_FOLDER,
+        description="The folder of the bucket the results are stored in.",
+    )
+
+    @sync_compatible
+    async def read_path(self, path: str) -> bytes:
+        # Loaded in a worker thread, where the block methods run synchronously
+        return await run_sync_in_worker_thread(self._read_path, path)
+
+    @sync_compatible
+    async def write_path(self, path: str, content: bytes) -> str:
+        return await run_sync_in_worker_thread(self._write_path, path, content)
+
+    def _read_path(self, path: str) -> bytes:
+        bucket = load_bucket(self.bucket_block_name)
+        return bucket.read_path(f"{self.folder}/{path}")
+
+    def _write_path(self, path: str, content: bytes) -> str:
+        bucket = load_bucket(self.bucket_block_name)
+        return bucket.write_path(f"{self.folder}/{path}", content)
+
+
+def hash_frame(df: pl.DataFrame) -> str:
+    """Hashes the frame's schema and rows. Unlike pickling, the hash only depends on
+    the frame's content. Polars cannot hash the rows of nested columns, so those are
+    hashed as newline-delimited JSON, as `snapshots.compute_content_hash` does.
+
+    Args:
+        df (pl.DataFrame): The frame.
+
+    Returns:
+        str: The SHA-256 hex digest.
+    """
+    digest = hashlib.sha256()
+    # Row hashes are only stable within a polars version
+    digest.update(pl.__version__.encode("utf-8"))
+    digest.update(str(df.schema).encode("utf-8"))
+    nested = [name for name, dtype in df.schema.items() if dtype.is_nested()]
+    flat = df.drop(nested)
+    if flat.width:
+        digest.update(array.array("Q", flat.hash_rows(seed=0).to_list()).tobytes())
+    if nested:
+        for offset in range(0, len(df), HASH_BATCH_SIZE):
+            with io.BytesIO() as buffer:
+                df.select(nested).slice(offset, HASH_BATCH_SIZE).write_ndjson(buffer)
+                digest.update(buffer.getvalue())
+    return digest.hexdigest()
+
+
+@functools.cache
+def get_code_version(*modules: str) -> str:
+    """Hashes the source of the modules. Unlike a function's bytecode, the source
+    changes whenever anything the module defines changes, constants included.
+
+    Args:
+        *modules (str): The names of the modules.
+
+    Returns:
+        str: The SHA-256 hex digest.
+    """
+    digest = hashlib.sha256()
+    for name in modules:
+        digest.update(inspect.getsource(importlib.import_module(name)).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def content_input_hash(
+    context: TaskRunContext,
+    arguments: dict[str, Any],
+    depends_on: tuple[str, ...] = (),
+) -> str | None:
+    """A task cache key of the task's code and the content of its arguments. The code
+    is versioned by the source of the task's module and the modules it depends on.
+    Frames are hashed by `hash_frame` and every other argument as Prefect's
+    `task_input_hash` would.
+
+    Args:
+        context (TaskRunContext): The task run's context.
+        arguments (dict[str, Any]): The task's arguments.
+        depends_on (tuple[str, ...], optional): The modules the task's result depends on, besides its own.
+
+    Returns:
+        str | None: The cache key, or None if an argument cannot be hashed.
+    """
+    return hash_objects(
+        context.task.task_key,
+        get_code_version(context.task.fn.__module__, *depends_on),
+        {
+            name: hash_frame(value) if isinstance(value, pl.DataFrame) else value
+            for name, value in arguments.items()
+        },
+    )
+
+
+def cached_result_options(
+    serializer: Serializer | str = "pickle",
+    cache_key_fn: Callable[[TaskRunContext, dict[str, Any]], str | None] | None = None,
+    depends_on: tuple[str, ...] = (),
+) -> dict[str, Any]:
+    """Task options that persist the result to the bucket's results folder and reuse
+    it for a day when the task runs again with the same code and content.
+
+    Args:
+        serializer (Serializer | str, optional): The result serializer. Defaults to 'pickle'.
+        cache_key_fn (Callable, optional): The cache key function. Defaults to `content_input_hash`.
+        depends_on (tuple[str, ...], optional): The modules the default cache key versions besides the task's own.
+
+    Returns:
+        dict[str, Any]: Keyword arguments for `task`.
+
+    Examples:
+
+    >>> @task(**cached_result_options(ParquetSerializer(), depends_on=("parser",)))
+    ... def parse(page: str) -> pl.DataFrame:
+    ...     ...
+    """
+    if cache_key_fn is None:
+        cache_key_fn = functools.partial(content_input_hash, depends_on=depends_on)
+    return {
+        "cache_key_fn": cache_key_fn,
+        "cache_expiration": RESULT_EXPIRATION,
+        "persist_result": True,
+        "result_storage": BucketResults(),
+        "result_storage_key": "{task_run.task_name}/{task_run.id}",
+        "result_serializer": serializer,
+    }
@@ -13,6 +13,8 @@ from prefect import task
 from prefect_aws import S3Bucket
 from prefecto.logging import get_prefect_or_default_logger
 
+from . import wrappers
+
 concat = task(pl.concat, tags=["polars"])
 
 
@@ -42,6 +44,7 @@ def tabulate_s3_objects(objects: list[dict[str, Any]]) -> pl.DataFrame:
 
 
 @task
+@wrappers.instrument
 def upload(
     content: bytes | IO | Path | str | Any, key: str, bucket: S3Bucket, **kwds
 ) -> str:
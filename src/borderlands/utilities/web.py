@@ -2,4 +2,79 @@
 HTTP utilities for Borderlands.
 """
 
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import weakref
+from typing import AsyncIterator
+
+import httpx
+
+from .. import runtime
+
 USER_AGENT = "BorderlandsBot/0.1 (+https://github.com/dominictarro/Borderlands)"
+
+_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient] = (
+    weakref.WeakKeyDictionary()
+)
+_scopes: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, int] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_client() -> httpx.AsyncClient:
+    """Gets the pooled HTTP client of the running event loop. Clients are bound to the
+    loop they were opened in, so each loop gets its own, and it is reused by every
+    request made in that loop until it is closed. Idle connections are kept open so
+    consecutive requests to a host skip the TCP and TLS handshakes, and the pool is
+    sized by the runtime profile. Prefect runs each async task in its own loop, so a
+    client is not shared across tasks or runs.
+
+    Returns:
+        httpx.AsyncClient: The pooled client.
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            headers={"User-Agent": USER_AGENT},
+            limits=httpx.Limits(
+                max_connections=runtime.profile.max_connections,
+                max_keepalive_connections=runtime.profile.max_keepalive_connections,
+            ),
+        )
+        _clients[loop] = client
+    return client
+
+
+async def close_client() -> None:
+    """Closes the pooled HTTP client of the running event loop, if it has one."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+@contextlib.asynccontextmanager
+async def client_scope() -> AsyncIterator[httpx.AsyncClient]:
+    """Scopes the pooled HTTP client of the running event loop. Nested and concurrent
+    scopes in a loop share the client, and it is closed when the last of them exits,
+    so its connections do not outlive the work that opened them.
+
+    Yields:
+        httpx.AsyncClient: The pooled client.
+
+    Examples:
+
+    >>> async with client_scope() as client:
+    ...     r = await client.get(url)
+    """
+    loop = asyncio.get_running_loop()
+    _scopes[loop] = _scopes.get(loop, 0) + 1
+    try:
+        yield get_client()
+    finally:
+        _scopes[loop] -= 1
+        if not _scopes[loop]:
+            del _scopes[loop]
+            await close_client()
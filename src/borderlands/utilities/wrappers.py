@@ -1,10 +1,33 @@
 """Utility wrappers for functions."""
 
+from __future__ import annotations
+
+import collections
+import contextlib
+import contextvars
+import dataclasses as dc
 import functools
+import inspect
+import json
+import os
+import resource
+import threading
+import time
+import tracemalloc
+from typing import Any, Iterator
 
 import polars as pl
+from prefect.artifacts import create_table_artifact
+from prefect.context import FlowRunContext, TaskRunContext
 from prefecto.logging import get_prefect_or_default_logger
 
+# Set to 'true' to record the metrics of instrumented stages
+INSTRUMENT_ENV = "BORDERLANDS_INSTRUMENT"
+STAGE_METRICS_ARTIFACT_KEY = "stage-metrics"
+# The metrics recorded outside of `collect_stage_metrics` that are kept until the next
+# report, so a long-lived process that never reports does not grow without bound
+MAX_STAGE_METRICS = 10_000
+
 
 def force_lazyframe(func):
     """Converts function output from a `DataFrame` to a `LazyFrame` if it is not already a `LazyFrame`."""
@@ -29,3 +52,299 @@ def inject_default_logger(func):
         return func(*args, **kwargs)
 
     return wrapper
+
+
+@dc.dataclass(frozen=True)
+class StageMetrics:
+    """The metrics of one call to an instrumented stage.
+
+    Attributes:
+        stage (str): The stage's name.
+        wall_seconds (float): The elapsed time.
+        cpu_seconds (float): The CPU time of the whole process, including other threads.
+        rows_in (int, optional): The rows of the first frame argument.
+        rows_out (int, optional): The rows of the returned frame.
+        bytes_in (int, optional): The size of the first frame argument, or else of the first string or bytes argument.
+        bytes_out (int, optional): The size of the returned frame, string, or bytes.
+        peak_rss_delta (int): How far the call raised the process's peak resident memory, in bytes.
+        traced_peak (int, optional): The peak Python allocations above the start of the call, if `tracemalloc` is tracing.
+    """
+
+    stage: str
+    wall_seconds: float
+    cpu_seconds: float
+    rows_in: int | None
+    rows_out: int | None
+    bytes_in: int | None
+    bytes_out: int | None
+    peak_rss_delta: int
+    traced_peak: int | None
+
+
+class _Recorder:
+    """Holds the instrumentation switch and the metrics recorded since the last report
+    outside of `collect_stage_metrics`."""
+
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+        self.metrics: collections.deque[StageMetrics] = collections.deque(
+            maxlen=MAX_STAGE_METRICS
+        )
+        self.lock = threading.Lock()
+
+
+_recorder = _Recorder(
+    os.environ.get(INSTRUMENT_ENV, "").lower() in ("1", "true", "yes")
+)
+# Prefect copies the context into the tasks and subflows a flow runs, so they record
+# into the list of the run that collects them
+_collected: contextvars.ContextVar[list[StageMetrics] | None] = contextvars.ContextVar(
+    "stage_metrics", default=None
+)
+
+
+def enable_instrumentation(enabled: bool = True) -> None:
+    """Turns recording the metrics of instrumented stages on or off."""
+    _recorder.enabled = enabled
+
+
+def instrumentation_enabled() -> bool:
+    """Whether the metrics of instrumented stages are recorded."""
+    return _recorder.enabled
+
+
+def pop_stage_metrics() -> list[StageMetrics]:
+    """Returns and clears the metrics recorded outside of `collect_stage_metrics` since
+    the last call. Only the latest `MAX_STAGE_METRICS` are kept."""
+    with _recorder.lock:
+        metrics = list(_recorder.metrics)
+        _recorder.metrics.clear()
+    return metrics
+
+
+@contextlib.contextmanager
+def collect_stage_metrics() -> Iterator[list[StageMetrics]]:
+    """Collects the metrics recorded in the block, including by the tasks and subflows
+    it runs, apart from those of other runs in the process.
+
+    Yields:
+        list[StageMetrics]: The metrics, filled in as stages are recorded.
+
+    Examples:
+
+    >>> with collect_stage_metrics() as metrics:
+    ...     df = scrape_oryx(dt)
+    >>> report_stage_metrics(metrics)
+    """
+    metrics: list[StageMetrics] = []
+    token = _collected.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _collected.reset(token)
+
+
+def _get_peak_rss() -> int:
+    # Linux reports the peak resident memory in KiB
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _count_rows(obj: Any) -> int | None:
+    return obj.height if isinstance(obj, pl.DataFrame) else None
+
+
+def _count_bytes(obj: Any) -> int | None:
+    if isinstance(obj, pl.DataFrame):
+        return int(obj.estimated_size())
+    if isinstance(obj, (bytes, bytearray)):
+        return len(obj)
+    if isinstance(obj, str):
+        return len(obj.encode("utf-8"))
+    return None
+
+
+class _Measurement:
+    """Measures one call to an instrumented stage."""
+
+    def __init__(self, stage: str, args: tuple, kwargs: dict):
+        self.stage = stage
+        self.args = args
+        # Lazy inputs are collected first, so the stage is only timed for its own work
+        if args and isinstance(args[0], pl.LazyFrame):
+            self.args = (args[0].collect().lazy(), *args[1:])
+        arguments = [*self.args, *kwargs.values()]
+        first = next(
+            (arg for arg in arguments if isinstance(arg, (pl.DataFrame, pl.LazyFrame))),
+            next(
+                (arg for arg in arguments if isinstance(arg, (str, bytes, bytearray))),
+                None,
+            ),
+        )
+        if isinstance(first, pl.LazyFrame):
+            first = first.collect()
+        self.rows_in = _count_rows(first)
+        self.bytes_in = _count_bytes(first)
+
+    def __enter__(self) -> _Measurement:
+        self.peak_rss = _get_peak_rss()
+        self.traced = tracemalloc.is_tracing()
+        if self.traced:
+            self.traced_start, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+        self.cpu = time.process_time()
+        self.wall = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.wall = time.perf_counter() - self.wall
+        self.cpu = time.process_time() - self.cpu
+        self.traced_peak = None
+        if self.traced:
+            self.traced_peak = tracemalloc.get_traced_memory()[1] - self.traced_start
+
+    def record(self, result: Any) -> Any:
+        """Records the stage's metrics. Lazy results are collected so their rows and
+        time count toward the stage that built them.
+
+        Args:
+            result (Any): The stage's result.
+
+        Returns:
+            Any: The result, collected and made lazy again if it was lazy.
+        """
+        start = time.perf_counter(), time.process_time()
+        out = result
+        if isinstance(result, pl.LazyFrame):
+            out = result.collect()
+            result = out.lazy()
+        metrics = StageMetrics(
+            stage=self.stage,
+            wall_seconds=self.wall + time.perf_counter() - start[0],
+            cpu_seconds=self.cpu + time.process_time() - start[1],
+            rows_in=self.rows_in,
+            rows_out=_count_rows(out),
+            bytes_in=self.bytes_in,
+            bytes_out=_count_bytes(out),
+            peak_rss_delta=_get_peak_rss() - self.peak_rss,
+            traced_peak=self.traced_peak,
+        )
+        collected = _collected.get()
+        with _recorder.lock:
+            (_recorder.metrics if collected is None else collected).append(metrics)
+        get_prefect_or_default_logger().info(
+            "Stage metrics %s",
+            json.dumps(dc.asdict(metrics)),
+            extra={"stage_metrics": dc.asdict(metrics)},
+        )
+        return result
+
+
+def instrument(func=None, *, name: str | None = None):
+    """Records the wall time, CPU time, rows, bytes, and memory of each call to the
+    function when instrumentation is enabled, by `BORDERLANDS_INSTRUMENT` or
+    `enable_instrumentation`. Disabled, each call only checks the switch.
+
+    Instrumented lazy stages are collected at their boundaries so each stage's time
+    is its own, which gives up optimizing the query across stages. Coroutines are
+    timed from their first await to their return, including time spent waiting.
+
+    Args:
+        func (Callable, optional): The function or coroutine function to instrument.
+        name (str, optional): The stage's name. Defaults to the function's module and name.
+
+    Examples:
+
+    >>> @instrument
+    ... @force_lazyframe
+    ... @inject_default_logger
+    ... def assign_status(lf: pl.LazyFrame, *, logger: logging.Logger) -> pl.LazyFrame:
+    ...     ...
+    """
+    if func is None:
+        return functools.partial(instrument, name=name)
+
+    stage = name or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__qualname__}"
+
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            """Records the coroutine's metrics when instrumentation is enabled."""
+            if not _recorder.enabled:
+                return await func(*args, **kwargs)
+            measurement = _Measurement(stage, args, kwargs)
+            with measurement:
+                result = await func(*measurement.args, **kwargs)
+            return measurement.record(result)
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        """Records the function's metrics when instrumentation is enabled."""
+        if not _recorder.enabled:
+            return func(*args, **kwargs)
+        measurement = _Measurement(stage, args, kwargs)
+        with measurement:
+            result = func(*measurement.args, **kwargs)
+        return measurement.record(result)
+
+    return wrapper
+
+
+def summarize_stage_metrics(metrics: list[StageMetrics]) -> list[dict[str, Any]]:
+    """Totals the metrics of each stage, slowest first.
+
+    Args:
+        metrics (list[StageMetrics]): The recorded metrics.
+
+    Returns:
+        list[dict[str, Any]]: A row for each stage.
+    """
+    if not metrics:
+        return []
+    df = pl.from_dicts([dc.asdict(m) for m in metrics], infer_schema_length=None)
+    return (
+        df.group_by("stage")
+        .agg(
+            pl.len().alias("calls"),
+            pl.col("wall_seconds").sum().round(4),
+            pl.col("cpu_seconds").sum().round(4),
+            # Stages that do not take or return frames have no rows to total
+            *(
+                pl.when(pl.col(column).count() > 0).then(pl.col(column).sum())
+                for column in ("rows_in", "rows_out", "bytes_in", "bytes_out")
+            ),
+            pl.col("peak_rss_delta", "traced_peak").max(),
+        )
+        .sort("wall_seconds", descending=True)
+        .to_dicts()
+    )
+
+
+def report_stage_metrics(
+    metrics: list[StageMetrics] | None = None,
+) -> list[dict[str, Any]]:
+    """Reports the metrics as a table artifact, when called from a Prefect run, and in
+    the logs.
+
+    Args:
+        metrics (list[StageMetrics], optional): The metrics to report, such as those of `collect_stage_metrics`. Defaults to the metrics recorded outside of it since the last report.
+
+    Returns:
+        list[dict[str, Any]]: The summary of each stage.
+    """
+    if metrics is None:
+        metrics = pop_stage_metrics()
+    summary = summarize_stage_metrics(metrics)
+    if not summary:
+        return summary
+    logger = get_prefect_or_default_logger()
+    logger.info("Stage metrics summary %s", json.dumps(summary))
+    if FlowRunContext.get() or TaskRunContext.get():
+        create_table_artifact(
+            summary,
+            key=STAGE_METRICS_ARTIFACT_KEY,
+            description="Time, rows, bytes, and memory of each instrumented stage.",
+        )
+    return summary
@@ -0,0 +1,111 @@
+"""
+Module for running the pipeline from a long-lived, warm process.
+"""
+
+from __future__ import annotations
+
+import importlib
+import signal
+import threading
+from typing import Any, Callable
+
+from prefecto.logging import get_prefect_or_default_logger
+
+from . import assets
+from .blocks import blocks
+
+# Imported before the first run so runs do not pay for them
+WARM_MODULES = (
+    "bs4",
+    "httpx",
+    "polars",
+    "prefect_aws",
+    "borderlands.definitions",
+    "borderlands.media",
+    "borderlands.oryx",
+    "borderlands.releases",
+)
+# Downloaded before the first run and kept in memory between runs
+WARM_ASSETS = (
+    "country_of_production_url_mapping.json",
+    "category_corrections.csv",
+)
+
+
+class Worker:
+    """Runs a flow on demand from a process that stays alive between runs. Modules,
+    blocks, and assets loaded by one run are reused by the next. HTTP clients are not,
+    since each is closed with the task that opened it.
+
+    A run starts when the worker is triggered, either by `trigger` or by SIGUSR1, or
+    when `interval` seconds pass without one.
+
+    Args:
+        flow (Callable[[], Any]): The flow to run.
+        interval (float, optional): The seconds between runs. Defaults to only running when triggered.
+
+    Examples:
+
+    >>> worker = Worker(borderlands_flow, interval=24 * 60 * 60)
+    >>> worker.warm()
+    >>> worker.install_signal_handlers()
+    >>> worker.run()
+    """
+
+    def __init__(self, flow: Callable[[], Any], interval: float | None = None):
+        self.flow = flow
+        self.interval = interval
+        self.runs = 0
+        self._triggered = threading.Event()
+        self._stopped = threading.Event()
+
+    def warm(self) -> None:
+        """Imports the pipeline's modules and loads its blocks and assets."""
+        logger = get_prefect_or_default_logger()
+        for module in WARM_MODULES:
+            importlib.import_module(module)
+        logger.info("Loaded bucket '%s'", blocks.bucket.bucket_name)
+        for asset in WARM_ASSETS:
+            assets.get_asset(asset)
+        logger.info("Worker is warm")
+
+    def trigger(self, *args) -> None:
+        """Starts a run as soon as the current one finishes."""
+        self._triggered.set()
+
+    def stop(self, *args) -> None:
+        """Stops the worker after the current run."""
+        self._stopped.set()
+        self._triggered.set()
+
+    def install_signal_handlers(self) -> None:
+        """Triggers a run on SIGUSR1 and stops the worker on SIGTERM and SIGINT."""
+        signal.signal(signal.SIGUSR1, self.trigger)
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+    def run_once(self) -> None:
+        """Runs the flow. Failures are logged so the worker stays alive."""
+        logger = get_prefect_or_default_logger()
+        try:
+            self.flow()
+        except Exception:
+            logger.exception("Run failed")
+        finally:
+            self.runs += 1
+
+    def run(self, run_on_start: bool = False) -> None:
+        """Runs the flow whenever the worker is triggered or the interval passes, until
+        the worker is stopped.
+
+        Args:
+            run_on_start (bool, optional): Whether to run the flow immediately. Defaults to False.
+        """
+        if run_on_start:
+            self.trigger()
+        while not self._stopped.is_set():
+            self._triggered.wait(timeout=self.interval)
+            if self._stopped.is_set():
+                break
+            self._triggered.clear()
+            self.run_once()
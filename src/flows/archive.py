@@ -0,0 +1,58 @@
+"""
+Flow to compact a month of daily Oryx snapshots into a single archive.
+"""
+
+import datetime
+
+from prefect import flow
+from prefect.context import FlowRunContext, get_run_context
+
+from borderlands.archive import (
+    compact_snapshots,
+    delete_snapshots,
+    list_daily_snapshots,
+)
+
+
+@flow(
+    name="Oryx Compaction",
+    description="Flow to compact a month of daily Oryx snapshots into a single archive.",
+    timeout_seconds=1800,
+    log_prints=True,
+)
+def compact_oryx_month(
+    year: int | None = None, month: int | None = None, delete_dailies: bool = False
+) -> str | None:
+    """Compact the daily Oryx snapshots of a month. Defaults to the month before the
+    flow run started.
+
+    Args:
+        year (int, optional): The year of the month to compact.
+        month (int, optional): The month to compact.
+        delete_dailies (bool, optional): Whether to delete the daily snapshots once
+            they are archived. Defaults to False.
+
+    Returns:
+        str | None: The key the archive was uploaded to. None if there were no
+            snapshots to compact.
+    """
+    if year is None or month is None:
+        ctx: FlowRunContext = get_run_context()
+        start = ctx.flow_run.start_time.date()
+        previous = datetime.date(start.year, start.month, 1) - datetime.timedelta(
+            days=1
+        )
+        year, month = year or previous.year, month or previous.month
+    dt = datetime.date(year, month, 1)
+
+    keys = list_daily_snapshots(dt)
+    if not keys:
+        print(f"No snapshots to compact for {dt.strftime(r'%Y-%m')}")
+        return None
+
+    key = compact_snapshots(keys, dt)
+    print(f"Compacted {len(keys)} snapshots into {key}")
+
+    if delete_dailies:
+        delete_snapshots(keys)
+    return key
@@ -0,0 +1,77 @@
+"""
+Flow to compute the changes between consecutive Oryx snapshots.
+"""
+
+import datetime
+
+import polars as pl
+from prefect import flow, task
+
+from borderlands import definitions
+from borderlands.blocks import blocks
+from borderlands.deltas import compute_oryx_delta, create_delta_key
+from borderlands.utilities import io_, multipart
+
+
+@task
+def upload(df: pl.DataFrame, dt: datetime.datetime) -> str:
+    """Uploads the DataFrame to S3.
+
+    Args:
+        df (pl.DataFrame): The DataFrame to upload.
+        dt (datetime.datetime): The datetime to use for the key.
+
+    Returns:
+        str: The key the DataFrame was uploaded to.
+    """
+    key = create_delta_key(dt)
+    df = df.select(definitions.OryxDelta.columns())
+    return multipart.upload_parquet(
+        df, key, blocks.bucket, **definitions.oryx_delta.profile.options()
+    )
+
+
+@task
+def download_oryx(path: str) -> pl.DataFrame:
+    """Downloads an Oryx snapshot.
+
+    Args:
+        path (str): The key of the Oryx snapshot.
+
+    Returns:
+        pl.DataFrame: The snapshot.
+    """
+    return (
+        io_.scan_parquet(blocks.bucket, path)
+        .select(definitions.EquipmentLoss.columns())
+        .collect()
+    )
+
+
+@flow(
+    name="Oryx Delta",
+    description="Flow to compute the losses added, removed, and modified since the previous Oryx snapshot.",
+    timeout_seconds=600,
+)
+def oryx_delta_flow(loss_key: str, previous_key: str) -> str:
+    """Compute the changes between two Oryx snapshots.
+
+    Args:
+        loss_key (str): The key of the current Oryx snapshot.
+        previous_key (str): The key of the previous Oryx snapshot.
+
+    Returns:
+        str: The key the Oryx delta was uploaded to.
+    """
+    current = download_oryx.submit(path=loss_key)
+    previous = download_oryx.submit(path=previous_key)
+    as_of_date = definitions.EquipmentLoss.as_of_date.name
+
+    dt: datetime.datetime = current.result()[as_of_date].max()
+    df = compute_oryx_delta(
+        previous=previous,
+        current=current,
+        previous_as_of_date=previous.result()[as_of_date].max(),
+        as_of_date=dt,
+    )
+    return upload(df, dt)
@@ -0,0 +1,86 @@
+"""
+Flow to update the history of the Oryx equipment losses.
+"""
+
+import datetime
+
+import polars as pl
+from prefect import flow, task
+
+from borderlands import definitions
+from borderlands.blocks import blocks
+from borderlands.history import (
+    create_history_key,
+    get_latest_loss_history,
+    update_loss_history,
+)
+from borderlands.utilities import io_, multipart
+
+
+@task
+def upload(df: pl.DataFrame, dt: datetime.datetime) -> str:
+    """Uploads the DataFrame to S3.
+
+    Args:
+        df (pl.DataFrame): The DataFrame to upload.
+        dt (datetime.datetime): The datetime to use for the key.
+
+    Returns:
+        str: The key the DataFrame was uploaded to.
+    """
+    key = create_history_key(dt)
+    df = df.select(definitions.LossHistory.columns())
+    df = df.sort(definitions.LossHistory.columns(include=[definitions.Tag.dimension]))
+    return multipart.upload_parquet(
+        df, key, blocks.bucket, **definitions.loss_history.profile.options()
+    )
+
+
+@task
+def download_oryx(path: str) -> pl.DataFrame:
+    """Downloads the dimensions of the Oryx equipment losses.
+
+    Args:
+        path (str): The key of the Oryx snapshot.
+
+    Returns:
+        pl.DataFrame: The dimensions and as of date of the snapshot.
+    """
+    return (
+        io_.scan_parquet(blocks.bucket, path)
+        .select(
+            definitions.EquipmentLoss.columns(include=[definitions.Tag.dimension])
+            + [definitions.EquipmentLoss.as_of_date.name]
+        )
+        .collect()
+    )
+
+
+@flow(
+    name="Loss History",
+    description="Flow to update the first and last seen dates of the Oryx equipment losses.",
+    timeout_seconds=600,
+)
+def loss_history_flow(
+    loss_key: str, as_of_date: datetime.datetime | None = None
+) -> str:
+    """Update the loss history with the Oryx snapshot.
+
+    Args:
+        loss_key (str): The key of the Oryx snapshot.
+        as_of_date (datetime.datetime, optional): The date the losses were seen. Defaults to the snapshot's. Unchanged runs reuse the previous snapshot, so they pass their own date to advance `last_seen`.
+
+    Returns:
+        str: The key the loss history was uploaded to.
+    """
+    oryx = download_oryx(path=loss_key)
+    dt: datetime.datetime = (
+        as_of_date or oryx[definitions.EquipmentLoss.as_of_date.name].max()
+    )
+
+    df = update_loss_history(
+        history=get_latest_loss_history(),
+        current=oryx,
+        as_of_date=dt,
+    )
+    return upload(df, dt)
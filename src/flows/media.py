@@ -1,20 +1,25 @@
 import datetime
-import io
 
 import polars as pl
 from prefect import flow, task
 from prefect.context import get_run_context
 
-from borderlands import definitions
+from borderlands import definitions, library
 from borderlands.blocks import blocks
 from borderlands.media import (
-    create_inventory_key,
     create_media_inventory_from_oryx,
     download,
     get_latest_media_inventory,
     merge_inventory_state,
 )
-from borderlands.utilities import tasks
+from borderlands.utilities import io_
+
+# The columns of the Oryx losses the media inventory is built from
+EVIDENCE_COLUMNS = [
+    definitions.EquipmentLoss.url_hash.name,
+    definitions.EquipmentLoss.evidence_url.name,
+    definitions.EquipmentLoss.evidence_source.name,
+]
 
 
 @task
@@ -28,30 +33,20 @@ def upload(df: pl.DataFrame, dt: datetime.datetime) -> str:
     Returns:
         str: The key the DataFrame was uploaded to.
     """
-    key = f"oryx/{create_inventory_key(dt)}"
-    df = df.select(definitions.Media.columns())
-    df = df.sort(definitions.Media.as_of_date.name)
-    with io.BytesIO() as buffer:
-        df.write_parquet(buffer, compression="zstd", compression_level=22)
-        buffer.seek(0)
-        blob = buffer.read()
-    return tasks.upload.fn(content=blob, key=key, bucket=blocks.bucket)
+    return library.upload_media_inventory(df, dt)
 
 
 @task
 def download_oryx(path: str) -> pl.DataFrame:
-    """Downloads the Oryx equipment losses.
+    """Downloads the evidence of the Oryx equipment losses.
 
     Args:
-        df (pl.DataFrame): The DataFrame to download.
+        path (str): The key of the Oryx snapshot.
 
     Returns:
-        pl.DataFrame: The DataFrame with the media downloaded.
+        pl.DataFrame: The evidence columns of the snapshot.
     """
-    with io.BytesIO() as buffer:
-        blocks.bucket.download_object_to_file_object(path, buffer)
-        buffer.seek(0)
-        return pl.read_parquet(buffer)
+    return io_.scan_parquet(blocks.bucket, path).select(EVIDENCE_COLUMNS).collect()
 
 
 @flow(
@@ -59,8 +54,18 @@ def download_oryx(path: str) -> pl.DataFrame:
     description="Flow to download new media from the Oryx dataset.",
     timeout_seconds=600,
 )
-def download_media(loss_key: str) -> str:
-    """Download the media from the media bucket."""
+def download_media(
+    loss_key: str | None = None, oryx: pl.DataFrame | None = None
+) -> str:
+    """Download the media from the media bucket.
+
+    Args:
+        loss_key (str, optional): The key of the Oryx snapshot to read the evidence from.
+        oryx (pl.DataFrame, optional): The Oryx losses, when they are already in memory. Saves reading the snapshot back from the bucket.
+
+    Returns:
+        str: The key the media inventory was uploaded to.
+    """
     ctx = get_run_context()
 
     # Convert Pendulum to Python datetime
@@ -68,7 +73,10 @@ def download_media(loss_key: str) -> str:
         microsecond=0
     )
     # Get the loss data
-    oryx = download_oryx(path=loss_key)
+    if oryx is None:
+        oryx = download_oryx(path=loss_key)
+    else:
+        oryx = oryx.select(EVIDENCE_COLUMNS)
 
     # Create the media inventory
     # Merge the inventories
@@ -2,50 +2,117 @@
 Flow to orchestrate the Oryx subflows.
 """
 
+import datetime
+
+import polars as pl
 from prefect import flow, task
-from prefect_aws import S3Bucket
+from prefect.context import get_run_context
 
 try:
+    import delta
+    import history
     import media
     import oryx
     import publish
 except ImportError:
-    from flows import media, oryx, publish
+    from flows import delta, history, media, oryx, publish
 
-from borderlands import definitions
-from borderlands.blocks import blocks
+from borderlands import definitions, runtime
+from borderlands.blocks import blocks, load_bucket
+from borderlands.releases import copy_object, release_manifest, release_partitions
 from borderlands.schema import Dataset
+from borderlands.utilities import io_, wrappers
 
 
 @task(log_prints=True)
-def release_dataset(path: str, dataset: Dataset) -> str:
-    """Release the dataset to the bucket."""
-    src_bucket = S3Bucket.load(dataset.host_bucket)
-    path = blocks.bucket.stream_from(
-        src_bucket,
-        path,
-        dataset.release_path,
-    )
+def release_dataset(path: str, dataset: Dataset, df: pl.DataFrame | None = None) -> str:
+    """Release the dataset to the bucket. The partitions and manifest are built from
+    the producer's frame if it is given, so the copied object never passes through
+    the worker, or else from a lazy scan of the release."""
+    src_bucket = load_bucket(dataset.host_bucket)
+    path = copy_object(src_bucket, path, blocks.bucket, dataset.release_path)
     print(f"Released {dataset.label} to {dataset.release_path}")
+
+    lf = io_.scan_parquet(blocks.bucket, dataset.release_path) if df is None else df
+    if dataset.partition_by:
+        manifest = release_partitions.fn(lf, dataset)
+        print(
+            f"Released {len(manifest['partitions'])} partitions of {dataset.label} to {dataset.partition_folder}"
+        )
+    # Written last so the manifest only describes complete releases
+    release_manifest.fn(lf, dataset)
     return path
 
 
-@flow(
-    name="Borderlands Flow",
-    description="Flow to orchestrate the Borderlands subflows.",
-)
-def borderlands_flow():
-    """Flow to orchestrate the Oryx subflows."""
-    oryx_key = oryx.oryx_flow()
+def run_subflows(dt: datetime.datetime) -> None:
+    """Scrape Oryx and release the datasets that follow from it.
+
+    Args:
+        dt (datetime.datetime): The datetime the losses are as of.
+    """
+    df = oryx.scrape_oryx(dt)
+    # Planned before anything is written, so it compares against the previous pointer
+    snapshot = oryx.plan_snapshot(df, dt)
+    if not snapshot.changed:
+        # No dated snapshot is written, so archives and backfills skip this day, but
+        # the history still records that the losses were seen today
+        oryx.write_snapshot(df, snapshot, dt)
+        print(f"Oryx is unchanged since '{snapshot.key}', skipping the other releases")
+        history_key = history.loss_history_flow(snapshot.key, as_of_date=dt)
+        release_dataset(history_key, definitions.loss_history)
+        return
+    oryx_key = snapshot.key
+
+    # The snapshot uploads and releases in the background while media is downloaded
+    # from the frame already in memory
+    written = oryx.write_snapshot.submit(df, snapshot, dt)
     oryx_release = release_dataset.submit(
         oryx_key,
         definitions.oryx,
+        df,
+        wait_for=[written],
     )
-
-    media_key = media.download_media(oryx_release)
-    release_dataset.submit(
+    media_key = media.download_media(oryx=df)
+    media_release = release_dataset.submit(
         media_key,
         definitions.media_inventory,
     )
+    # The remaining flows read the snapshot from the bucket
+    written.result()
+
+    if snapshot.previous_key is not None:
+        delta_key = delta.oryx_delta_flow(oryx_key, snapshot.previous_key)
+        release_dataset.submit(
+            delta_key,
+            definitions.oryx_delta,
+        )
+
+    history_key = history.loss_history_flow(oryx_key)
+    release_dataset.submit(
+        history_key,
+        definitions.loss_history,
+    )
+
+    # Kaggle is staged from both releases
+    publish.release_dataset_to_kaggle(wait_for=[oryx_release, media_release])
+
+
+@flow(
+    name="Borderlands Flow",
+    description="Flow to orchestrate the Borderlands subflows.",
+    log_prints=True,
+)
+def borderlands_flow():
+    """Flow to orchestrate the Oryx subflows."""
+    print(f"Running with {runtime.profile}")
+    ctx = get_run_context()
+    # Convert Pendulum to Python datetime
+    dt = datetime.datetime.fromisoformat(ctx.flow_run.start_time.isoformat()).replace(
+        microsecond=0
+    )
 
-    publish.release_dataset_to_kaggle(wait_for=[oryx_release])
+    # Collected apart from other runs in the process, and reported last so the
+    # metrics cover the stages of every subflow
+    with wrappers.collect_stage_metrics() as metrics:
+        run_subflows(dt)
+    wrappers.report_stage_metrics(metrics)
@@ -3,43 +3,143 @@ Flow to retrieve the web pages of Russian and Ukrainian equipment.
 """
 
 import datetime
-import io
 
 import polars as pl
 from prefect import flow, task
 from prefect.context import FlowRunContext, get_run_context
 
-from borderlands import assets, definitions
-from borderlands.blocks import blocks
+from borderlands import assets, library
 from borderlands.oryx import (
     alert_on_unmapped_country_flags,
+    assign_as_of_date,
     get_oryx_page,
     parse_oryx_web_page,
     pre_process_dataframe,
 )
 from borderlands.paths import create_oryx_key
+from borderlands.snapshots import (
+    Snapshot,
+    compute_content_hash,
+    get_latest_pointer,
+    update_latest_pointer,
+)
 from borderlands.utilities import tasks
 
+# The loss pages and the country each is for, or None for pages listing both
+PAGES = (
+    (
+        "https://www.oryxspioenkop.com/2022/02/attack-on-europe-documenting-equipment.html",
+        "Russia",
+    ),
+    (
+        "https://www.oryxspioenkop.com/2022/02/attack-on-europe-documenting-ukrainian.html",
+        "Ukraine",
+    ),
+    (
+        "https://www.oryxspioenkop.com/2022/03/list-of-naval-losses-during-2022.html",
+        None,
+    ),
+    (
+        "https://www.oryxspioenkop.com/2022/03/list-of-aircraft-losses-during-2022.html",
+        None,
+    ),
+)
+
+
+@task
+def plan_snapshot(df: pl.DataFrame, dt: datetime.datetime) -> Snapshot:
+    """Decides which snapshot holds the DataFrame's content, without writing it. If its
+    content matches the latest snapshot, that snapshot is reused.
+
+    Args:
+        df (pl.DataFrame): The DataFrame to snapshot.
+        dt (datetime.datetime): The datetime to use for the key.
+
+    Returns:
+        Snapshot: The snapshot that will hold the DataFrame's content.
+    """
+    content_hash = compute_content_hash(df)
+    latest = get_latest_pointer()
+    if latest is not None and latest["content_hash"] == content_hash:
+        return Snapshot(key=latest["key"], content_hash=content_hash, changed=False)
+    return Snapshot(
+        key=f"oryx/{create_oryx_key(dt, ext='parquet')}",
+        content_hash=content_hash,
+        changed=True,
+        previous_key=latest and latest["key"],
+    )
+
+
+@task
+def write_snapshot(
+    df: pl.DataFrame, snapshot: Snapshot, dt: datetime.datetime
+) -> Snapshot:
+    """Uploads the DataFrame to the snapshot if it changed, then points the latest
+    snapshot pointer at it.
+
+    Args:
+        df (pl.DataFrame): The DataFrame to upload.
+        snapshot (Snapshot): The snapshot planned for the DataFrame.
+        dt (datetime.datetime): The datetime the snapshot was taken.
+
+    Returns:
+        Snapshot: The snapshot holding the DataFrame's content.
+    """
+    if snapshot.changed:
+        library.upload_oryx(df, dt, key=snapshot.key)
+    update_latest_pointer.fn(snapshot, dt)
+    return snapshot
+
 
 @task
-def upload(df: pl.DataFrame, dt: datetime.datetime) -> str:
-    """Uploads the DataFrame to S3.
+def upload(df: pl.DataFrame, dt: datetime.datetime) -> Snapshot:
+    """Uploads the DataFrame to S3. If its content matches the latest snapshot, only
+    the latest snapshot pointer is updated.
 
     Args:
         df (pl.DataFrame): The DataFrame to upload.
         dt (datetime.datetime): The datetime to use for the key.
 
     Returns:
-        str: The key the DataFrame was uploaded to.
+        Snapshot: The snapshot holding the DataFrame's content.
     """
-    key = f"oryx/{create_oryx_key(dt, ext='parquet')}"
-    df = df.select(definitions.EquipmentLoss.columns())
-    df = df.sort(definitions.EquipmentLoss.columns(include=[definitions.Tag.dimension]))
-    with io.BytesIO() as buffer:
-        df.write_parquet(buffer, compression="zstd", compression_level=22)
-        buffer.seek(0)
-        blob = buffer.read()
-    return tasks.upload.fn(content=blob, key=key, bucket=blocks.bucket)
+    return write_snapshot.fn(df, plan_snapshot.fn(df, dt), dt)
+
+
+@flow(
+    name="Oryx Scrape",
+    description=(
+        "Flow to fetch, parse, and pre-process the Russian and Ukrainian loss pages"
+        " on https://www.oryxspioenkop.com/."
+    ),
+    timeout_seconds=600,
+    log_prints=True,
+)
+def scrape_oryx(dt: datetime.datetime) -> pl.DataFrame:
+    """Flow to retrieve the web pages of Russian and Ukrainian equipment losses and
+    parse them into a DataFrame, without uploading it.
+
+    Args:
+        dt (datetime.datetime): The datetime the losses are as of.
+
+    Returns:
+        pl.DataFrame: The pre-processed losses, following `EquipmentLoss`.
+    """
+    # Prefetched while the pages download
+    mapper = assets.get_country_of_production_url_mapper.submit()
+    category_corrections = assets.get_category_corrections.submit()
+    # Each page is parsed as soon as its own fetch finishes, so parsing one page
+    # overlaps fetching the others
+    parsed = [
+        parse_oryx_web_page.submit(get_oryx_page.submit(url), country)
+        for url, country in PAGES
+    ]
+    df = tasks.concat(parsed)
+    # Cached by the pages' content, so the date is assigned after it
+    df = pre_process_dataframe(df, mapper, category_corrections)
+    df = assign_as_of_date(df, dt)
+    alert_on_unmapped_country_flags(df)
+    return df
 
 
 @flow(
@@ -53,12 +153,12 @@ def upload(df: pl.DataFrame, dt: datetime.datetime) -> str:
     timeout_seconds=600,
     log_prints=True,
 )
-def oryx_flow() -> str:
+def oryx_flow() -> Snapshot:
     """Flow to retrieve the web pages of Russian and Ukrainian equipment
     losses and parse them into processable JSON documents.
 
     Returns:
-        str: The key the DataFrame was uploaded to.
+        Snapshot: The snapshot the DataFrame was uploaded to.
     """
     ctx: FlowRunContext = get_run_context()
 
@@ -66,29 +166,5 @@ def oryx_flow() -> str:
     dt = datetime.datetime.fromisoformat(ctx.flow_run.start_time.isoformat()).replace(
         microsecond=0
     )
-
-    russian_page = get_oryx_page.submit(
-        "https://www.oryxspioenkop.com/2022/02/attack-on-europe-documenting-equipment.html"
-    )
-    ukrainian_page = get_oryx_page.submit(
-        "https://www.oryxspioenkop.com/2022/02/attack-on-europe-documenting-ukrainian.html"
-    )
-    naval_page = get_oryx_page.submit(
-        "https://www.oryxspioenkop.com/2022/03/list-of-naval-losses-during-2022.html"
-    )
-    aircraft_page = get_oryx_page.submit(
-        "https://www.oryxspioenkop.com/2022/03/list-of-aircraft-losses-during-2022.html"
-    )
-    mapper = assets.get_country_of_production_url_mapper.submit()
-    category_corrections = assets.get_category_corrections.submit()
-    df = tasks.concat(
-        [
-            parse_oryx_web_page(russian_page, "Russia"),
-            parse_oryx_web_page(ukrainian_page, "Ukraine"),
-            parse_oryx_web_page(naval_page, None),
-            parse_oryx_web_page(aircraft_page, None),
-        ]
-    )
-    df = pre_process_dataframe(df, mapper, category_corrections, dt)
-    alert_on_unmapped_country_flags(df)
+    df = scrape_oryx(dt)
     return upload(df, dt)
@@ -4,28 +4,34 @@ Flow to release the Borderlands dataset to Kaggle.
 
 import datetime
 import enum
+import functools
+import hashlib
 import json
 import os
 import re
 import tempfile
 from contextlib import contextmanager
 from pathlib import Path
+from typing import TYPE_CHECKING
 
+from botocore.exceptions import ClientError
 from prefect import flow, task
 from prefect.blocks.system import Secret
 from prefect.context import get_run_context
+from prefecto.logging import get_prefect_or_default_logger
 
-from borderlands.definitions import oryx
-from borderlands.schema import Dataset, Tag
-from borderlands.schema.schema import FieldFilter
+from borderlands.blocks import blocks
+from borderlands.definitions import media_inventory, oryx
+from borderlands.schema import Tag
+from borderlands.staging import StagedDataset, stage_datasets
+from borderlands.utilities import io_, tasks
 
-# Kaggle lib authenticates on import. Need to set the credentials right away
-os.environ["KAGGLE_USERNAME"] = Secret.load("secret-kaggle-username").get()
-os.environ["KAGGLE_KEY"] = Secret.load("secret-kaggle-key").get()
-from kaggle import KaggleApi, api  # noqa: E402
-from kaggle.rest import ApiException  # noqa: E402
+if TYPE_CHECKING:
+    from kaggle import KaggleApi
 
 __project__ = Path(__file__).parent.parent.parent
+# The hash of the last payload uploaded to Kaggle
+KAGGLE_STATE_KEY = "kaggle/release.json"
 
 
 class DatasetStatus(enum.Enum):
@@ -35,6 +41,21 @@ class DatasetStatus(enum.Enum):
     DOES_NOT_EXIST = enum.auto()
 
 
+@functools.cache
+def get_kaggle_api() -> "KaggleApi":
+    """Get the authenticated Kaggle API client. The Kaggle library authenticates on
+    import, so the credentials are loaded and the library imported on first use.
+
+    Returns:
+        KaggleApi: The Kaggle API client.
+    """
+    os.environ["KAGGLE_USERNAME"] = Secret.load("secret-kaggle-username").get()
+    os.environ["KAGGLE_KEY"] = Secret.load("secret-kaggle-key").get()
+    from kaggle import api
+
+    return api
+
+
 def get_dataset_metadata() -> dict:
     """Get the dataset metadata."""
     with open(__project__ / "kaggle" / "dataset-metadata.json", "r") as f:
@@ -55,7 +76,7 @@ def update_description(metadata: dict) -> dict:
     return metadata
 
 
-def assess_dataset_status(api: KaggleApi, metadata: dict) -> DatasetStatus:
+def assess_dataset_status(api: "KaggleApi", metadata: dict) -> DatasetStatus:
     """Assess the status of the dataset.
 
     Args:
@@ -65,6 +86,8 @@ def assess_dataset_status(api: KaggleApi, metadata: dict) -> DatasetStatus:
     Returns:
         DatasetStatus: The status of the dataset.
     """
+    from kaggle.rest import ApiException
+
     try:
         # Dataset exists, create new version
         api.dataset_status(metadata["id"])
@@ -75,66 +98,36 @@ def assess_dataset_status(api: KaggleApi, metadata: dict) -> DatasetStatus:
         raise e
 
 
-def stage_dataset_as_json(
-    dataset: Dataset,
-    folder: str | Path,
-    include: FieldFilter | None = None,
-    exclude: FieldFilter | None = None,
-) -> Path:
-    """Stage a dataset as JSON records.
+def add_dataset(staged: StagedDataset) -> str:
+    """Document a dataset for the catalog.
 
     Args:
-        dataset (Dataset): The dataset to stage.
-        folder (str | Path): The folder to stage the dataset to.
-        include (TagSet, optional): A list of tags to include. Defaults to None (no inclusion requirement).
-        exclude (TagSet, optional): A list of tags to exclude. Defaults to None (no exclusion filter).
-
-    Returns:
-        Path: The path to the staged dataset.
-    """
-    df = dataset.read(include, exclude)
-    path = Path(folder) / f"{dataset.label}.json"
-    df.write_json(path, row_oriented=True)
-    return path
-
-
-def add_dataset(
-    folder: str,
-    dataset: Dataset,
-    include: FieldFilter | None = None,
-    exclude: FieldFilter | None = None,
-) -> str:
-    """Add a dataset to the catalog.
-
-    Args:
-        folder (str): The folder to stage the dataset to.
-        dataset (Dataset): The dataset to add.
-        metadata (dict): The dataset metadata.
-        include (TagSet, optional): A list of tags to include. Defaults to None (no inclusion requirement).
-        exclude (TagSet, optional): A list of tags to exclude. Defaults to None (no exclusion filter).
+        staged (StagedDataset): The dataset being staged.
 
     Returns:
         str: The dataset documentation.
     """
-    stage_dataset_as_json(dataset, folder, include=include, exclude=exclude)
-    return dataset.to_markdown(include=include, exclude=exclude)
+    return staged.dataset.to_markdown(include=staged.include, exclude=staged.exclude)
 
 
 @contextmanager
-def staged_datasets_as_json(metadata: dict):
-    """Stage a list of datasets as JSON records.
+def staged_datasets(metadata: dict):
+    """Stage the datasets in every file format.
 
     Args:
         metadata (dict): The dataset metadata.
     """
     with tempfile.TemporaryDirectory() as tmpdir:
-        docs = []
+        staged = [
+            StagedDataset(oryx, exclude=[Tag.metadata, Tag.debug]),
+            StagedDataset(media_inventory, exclude=[Tag.metadata, Tag.debug]),
+        ]
+        stage_datasets(staged, tmpdir)
 
-        # Add the datasets and add their documentation
-        docs.append(add_dataset(tmpdir, oryx, exclude=[Tag.metadata, Tag.debug]))
+        # Add the documentation of the datasets
         metadata["description"] = re.sub(
             pattern="<!-- CATALOG BEGINS HERE -->\n<!-- CATALOG ENDS HERE -->",
-            repl="\n\n".join(docs),
+            repl="\n\n".join(add_dataset(item) for item in staged),
             string=metadata["description"],
         )
 
@@ -148,37 +141,99 @@ def staged_datasets_as_json(metadata: dict):
             pass
 
 
+def hash_staged_folder(folder: str | Path) -> str:
+    """Hash the staged files and metadata.
+
+    Args:
+        folder (str | Path): The staging folder.
+
+    Returns:
+        str: The SHA-256 hex digest of the file names and contents.
+    """
+    digest = hashlib.sha256()
+    for path in sorted(Path(folder).iterdir()):
+        digest.update(path.name.encode("utf-8"))
+        with open(path, "rb") as f:
+            while chunk := f.read(1024**2):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def get_last_release_hash() -> str | None:
+    """Get the hash of the last payload uploaded to Kaggle.
+
+    Returns:
+        str | None: The hash or None if nothing was recorded.
+    """
+    try:
+        return json.loads(blocks.bucket.read_path(KAGGLE_STATE_KEY))["sha256"]
+    except ClientError as e:
+        if not io_.is_missing_object_error(e):
+            raise e
+        return None
+
+
+def record_release_hash(sha256: str, date: datetime.date) -> None:
+    """Record the hash of the payload uploaded to Kaggle.
+
+    Args:
+        sha256 (str): The hash of the payload.
+        date (datetime.date): The date of the release.
+    """
+    tasks.upload.fn(
+        content=json.dumps({"sha256": sha256, "date": date.isoformat()}, indent=2),
+        key=KAGGLE_STATE_KEY,
+        bucket=blocks.bucket,
+    )
+
+
 @task
-def create_kaggle_dataset(api: KaggleApi, metadata: dict):
+def create_kaggle_dataset(api: "KaggleApi", metadata: dict, date: datetime.date):
     """Create a new dataset.
 
     Args:
         api (KaggleApi): The Kaggle API client.
         metadata (dict): The dataset metadata.
+        date (datetime.date): The date of the release.
     """
-    with staged_datasets_as_json(metadata) as tmpdir:
+    with staged_datasets(metadata) as tmpdir:
+        sha256 = hash_staged_folder(tmpdir)
         api.dataset_create_new(
             tmpdir, public=metadata["isPrivate"] is False, quiet=False
         )
+        record_release_hash(sha256, date)
 
 
 @task
-def update_kaggle_dataset(api: KaggleApi, metadata: dict, date: datetime.date):
-    """Update the dataset.
+def update_kaggle_dataset(
+    api: "KaggleApi", metadata: dict, date: datetime.date
+) -> bool:
+    """Update the dataset. The upload is skipped if the staged files and metadata are
+    identical to the last upload.
 
     Args:
         api (KaggleApi): The Kaggle API client.
         metadata (dict): The dataset metadata.
         date (datetime.date): The date of the release.
 
+    Returns:
+        bool: Whether a new version was uploaded.
     """
-    with staged_datasets_as_json(metadata) as tmpdir:
+    logger = get_prefect_or_default_logger()
+    with staged_datasets(metadata) as tmpdir:
+        sha256 = hash_staged_folder(tmpdir)
+        if sha256 == get_last_release_hash():
+            logger.info("The staged payload is unchanged, skipping the upload")
+            return False
+
         api.dataset_create_version(
             tmpdir,
             version_notes=f"{date.strftime(r'%Y-%m-%d')} Release",
             quiet=False,
             delete_old_versions=True,
         )
+        record_release_hash(sha256, date)
+    return True
 
 
 @flow(
@@ -189,15 +244,15 @@ def update_kaggle_dataset(api: KaggleApi, metadata: dict, date: datetime.date):
 def release_dataset_to_kaggle():
     """Make the Kaggle dataset."""
 
+    api = get_kaggle_api()
     metadata = get_dataset_metadata()
     metadata = update_description(metadata)
     status = assess_dataset_status(api, metadata)
+    date = get_run_context().flow_run.expected_start_time.date()
 
     if status == DatasetStatus.DOES_NOT_EXIST:
-        create_kaggle_dataset(api, metadata)
+        create_kaggle_dataset(api, metadata, date)
     elif status == DatasetStatus.EXISTS:
-        update_kaggle_dataset(
-            api, metadata, get_run_context().flow_run.expected_start_time.date()
-        )
+        update_kaggle_dataset(api, metadata, date)
     else:
         raise ValueError(f"Unknown dataset status {status}")
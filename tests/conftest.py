@@ -3,8 +3,12 @@ Pytest configuration.
 """
 
 import gzip
+import http.server
 import json
+import os
 import shutil
+import threading
+import urllib.parse
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -12,11 +16,16 @@ import boto3
 import bs4
 import pytest
 from _pytest.monkeypatch import MonkeyPatch
+from botocore.exceptions import ClientError
 from moto import mock_aws
+from prefect.blocks.system import Secret
 from prefect.testing.utilities import prefect_test_harness
 from prefect_aws import AwsCredentials, S3Bucket
+from prefect_aws.client_parameters import AwsClientParameters
 
 if TYPE_CHECKING:
+    import polars as pl
+
     from borderlands.parser.article import ArticleParser
 
 
@@ -25,6 +34,8 @@ EXPORT_PATH: Path = TESTS_PATH / "export"
 if EXPORT_PATH.is_dir():
     shutil.rmtree(EXPORT_PATH)
 EXPORT_PATH.mkdir(exist_ok=True)
+# Keep the read cache out of the user's cache directory
+os.environ.setdefault("BORDERLANDS_CACHE_DIRECTORY", str(EXPORT_PATH / "cache"))
 
 
 @pytest.fixture
@@ -33,6 +44,21 @@ def test_data_path() -> Path:
     return TESTS_PATH / "data"
 
 
+@pytest.fixture
+def losses(test_data_path: Path) -> "pl.DataFrame":
+    """A snapshot of the Oryx dataset."""
+    import polars as pl
+
+    from borderlands.definitions import EquipmentLoss
+
+    return pl.read_parquet(
+        test_data_path
+        / "buckets/borderlands-core/oryx/year=2023/month=07/2023-07-23.parquet",
+        # The folders would otherwise be read as Hive partitions
+        hive_partitioning=False,
+    ).select(EquipmentLoss.columns())
+
+
 @pytest.fixture(scope="session")
 def credentials() -> AwsCredentials:
     """The AWS credentials."""
@@ -51,17 +77,102 @@ def prefect_db(credentials, bucket):
     with prefect_test_harness():
         credentials.save(name="aws-credentials-prefect")
         bucket.save(name="s3-bucket-borderlands-core")
+        # The publish flow authenticates with Kaggle using these
+        Secret(value="username").save(name="secret-kaggle-username")
+        Secret(value="key").save(name="secret-kaggle-key")
         yield
 
 
 @pytest.fixture(autouse=False, scope="function")
-@mock_aws
 def mock_buckets(bucket: S3Bucket, test_data_path: Path):
     """Mocks the S3 buckets."""
-    s3 = boto3.client("s3")
-    s3.create_bucket(Bucket=bucket.bucket_name)
-    bucket.upload_from_folder(test_data_path / "buckets" / "borderlands-core")
-    yield
+    with mock_aws():
+        s3 = boto3.client("s3")
+        s3.create_bucket(Bucket=bucket.bucket_name)
+        bucket.upload_from_folder(test_data_path / "buckets" / "borderlands-core")
+        yield
+
+
+class MockS3Handler(http.server.BaseHTTPRequestHandler):
+    """Serves the objects of the mocked buckets over HTTP, with ranged reads, so
+    clients that do not go through boto3, such as Polars' native S3 reader, can read
+    them."""
+
+    # The range of each GET, or None for whole objects
+    ranges: list[str | None] = []
+
+    def send_object(self, head: bool) -> None:
+        """Sends the object at the request's path."""
+        path = urllib.parse.unquote(self.path.split("?")[0])
+        bucket, _, key = path.lstrip("/").partition("/")
+        kwds = {"Range": self.headers["Range"]} if self.headers["Range"] else {}
+        s3 = boto3.client("s3")
+        try:
+            if head:
+                response = s3.head_object(Bucket=bucket, Key=key)
+            else:
+                response = s3.get_object(Bucket=bucket, Key=key, **kwds)
+                self.ranges.append(kwds.get("Range"))
+        except ClientError:
+            self.send_response(404)
+            self.end_headers()
+            return
+
+        self.send_response(206 if "ContentRange" in response else 200)
+        self.send_header("Content-Length", str(response["ContentLength"]))
+        self.send_header("ETag", response["ETag"])
+        self.send_header(
+            "Last-Modified",
+            response["LastModified"].strftime("%a, %d %b %Y %H:%M:%S GMT"),
+        )
+        if "ContentRange" in response:
+            self.send_header("Content-Range", response["ContentRange"])
+        self.end_headers()
+        if not head:
+            self.wfile.write(response["Body"].read())
+
+    def do_GET(self):
+        """Sends the object or the requested range of it."""
+        self.send_object(head=False)
+
+    def do_HEAD(self):
+        """Sends the object's metadata."""
+        self.send_object(head=True)
+
+    def log_message(self, *args):
+        """Keeps requests out of the test output."""
+
+
+@pytest.fixture
+def endpoint_bucket(mock_buckets, bucket: S3Bucket):
+    """The core bucket, reached through an HTTP endpoint that serves the mocked
+    buckets."""
+    MockS3Handler.ranges = []
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), MockS3Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield S3Bucket(
+            bucket_name=bucket.bucket_name,
+            credentials=AwsCredentials(
+                aws_client_parameters=AwsClientParameters(
+                    endpoint_url=f"http://127.0.0.1:{server.server_port}"
+                ),
+            ),
+        )
+    finally:
+        server.shutdown()
+        thread.join()
+
+
+@pytest.fixture
+def mock_scans(endpoint_bucket: S3Bucket, monkeypatch: MonkeyPatch):
+    """Routes Polars' native S3 reads of every bucket through the endpoint serving the
+    mocked buckets, while boto3 keeps using the mocked buckets directly."""
+    from borderlands.utilities import io_
+
+    options = io_.get_storage_options(endpoint_bucket)
+    monkeypatch.setattr(io_, "get_storage_options", lambda bucket: options)
 
 
 @pytest.fixture
@@ -0,0 +1,42 @@
+"""
+Tests for the parquet write profiles.
+"""
+
+import io
+
+import polars as pl
+import pytest
+
+from borderlands.schema import profiles
+
+
+def test_options():
+    """Tests overrides apply to one write without changing the profile."""
+    options = profiles.RELEASE.options(row_group_size=10)
+    assert options["compression"] == "zstd"
+    assert options["row_group_size"] == 10
+    assert profiles.RELEASE.row_group_size == 65_536
+
+
+def test_write():
+    """Tests a profile writes readable parquet."""
+    df = pl.DataFrame({"foo": [1, 2, 3], "bar": ["a", "b", "c"]})
+    with io.BytesIO() as buffer:
+        profiles.SCRATCH.write(df, buffer)
+        buffer.seek(0)
+        assert pl.read_parquet(buffer).equals(df)
+
+
+def test_get_profile():
+    """Tests profiles are found by name."""
+    assert profiles.get_profile("archive") is profiles.ARCHIVE
+    with pytest.raises(ValueError):
+        profiles.get_profile("fastest")
+
+
+def test_benchmark():
+    """Tests each profile is benchmarked."""
+    df = pl.DataFrame({"foo": list(range(1000))})
+    results = profiles.benchmark(df, profiles.PROFILES.values(), repeat=1)
+    assert [r["profile"] for r in results] == list(profiles.PROFILES)
+    assert all(r["rows"] == 1000 and r["bytes"] > 0 for r in results)
@@ -0,0 +1,51 @@
+"""
+Tests for the monthly snapshot compaction.
+"""
+
+import datetime
+import io
+
+import polars as pl
+from prefect_aws import S3Bucket
+
+from borderlands.archive import (
+    compact_snapshots,
+    download_snapshot,
+    list_daily_snapshots,
+    read_archive,
+)
+from borderlands.definitions import EquipmentLoss
+
+
+def test_compact_oryx_month(mock_scans, bucket: S3Bucket):
+    """Tests a month of snapshots is compacted and read back by date."""
+    dt = datetime.date(2023, 7, 1)
+    key = list_daily_snapshots.fn(dt)[0]
+    snapshot = download_snapshot.fn(key)
+
+    # Add a second day to the month
+    next_day = snapshot.with_columns(
+        EquipmentLoss.as_of_date.col + datetime.timedelta(days=1)
+    )
+    with io.BytesIO() as f:
+        next_day.write_parquet(f)
+        f.seek(0)
+        bucket.upload_from_file_object(f, "oryx/year=2023/month=07/2023-07-24.parquet")
+
+    keys = list_daily_snapshots.fn(dt)
+    assert len(keys) == 2
+
+    key = compact_snapshots.fn(keys, dt)
+    assert key == "archive/oryx/year=2023/month=07.parquet"
+    df = pl.read_parquet(bucket.read_path(key))
+    assert df.shape == (2 * len(snapshot), len(EquipmentLoss.columns()))
+    assert df[EquipmentLoss.as_of_date.name].is_sorted()
+
+    day = next_day[EquipmentLoss.as_of_date.name][0].date()
+    archived = read_archive.fn(day, day)
+    assert len(archived) == len(snapshot)
+    assert archived.columns == EquipmentLoss.columns()
+
+    # Months without an archive are skipped
+    archived = read_archive.fn(datetime.date(2023, 8, 1), datetime.date(2023, 8, 31))
+    assert archived.is_empty()
@@ -0,0 +1,58 @@
+"""
+Tests for reprocessing the historical snapshots.
+"""
+
+import datetime
+import json
+
+import polars as pl
+from prefect_aws import S3Bucket
+
+from borderlands import backfill
+from borderlands.definitions import EquipmentLoss
+from borderlands.snapshots import LATEST_POINTER_KEY, get_latest_pointer
+
+KEY = "oryx/year=2023/month=07/2023-07-23.parquet"
+
+
+def test_get_snapshot_date():
+    """Tests only daily snapshot keys are dated."""
+    assert backfill.get_snapshot_date(KEY) == datetime.date(2023, 7, 23)
+    assert backfill.get_snapshot_date("oryx/latest.json") is None
+    assert backfill.get_snapshot_date("oryx/media/inventory.parquet") is None
+
+
+def test_backfill_snapshots(mock_buckets, bucket: S3Bucket, flag_url_mapper):
+    """Tests snapshots are corrected in place and skipped once reprocessed."""
+    assert backfill.list_snapshots() == [KEY]
+    assert backfill.list_snapshots(start=datetime.date(2023, 7, 24)) == []
+
+    # Dropping a flag from the mapping changes the transforms version
+    flag_url = next(iter(flag_url_mapper))
+    mapper = {k: v for k, v in flag_url_mapper.items() if k != flag_url}
+    version = backfill.get_transforms_version(mapper)
+    assert version != backfill.get_transforms_version(flag_url_mapper)
+
+    original = pl.read_parquet(bucket.read_path(KEY))
+    bucket.write_path(
+        LATEST_POINTER_KEY,
+        json.dumps({"key": KEY, "content_hash": "stale"}).encode("utf-8"),
+    )
+    (result,) = backfill.run_backfill([KEY], mapper, version)
+    assert result.key == KEY
+    assert result.rows == len(original)
+    assert result.changed
+    assert backfill.list_completed(version) == {KEY}
+
+    df = pl.read_parquet(bucket.read_path(KEY))
+    assert df.columns == EquipmentLoss.columns()
+    unmapped = df.filter(EquipmentLoss.country_of_production_flag_url.col == flag_url)
+    assert not unmapped.is_empty()
+    assert unmapped[EquipmentLoss.country_of_production.name].is_null().all()
+
+    # The pointer is left stale, so the next daily run releases the corrected content
+    assert get_latest_pointer()["content_hash"] == "stale"
+
+    # Reprocessing again with the same mappings leaves the snapshot alone
+    (result,) = backfill.run_backfill([KEY], mapper, version)
+    assert not result.changed
@@ -0,0 +1,61 @@
+"""
+Tests for the CLI tool.
+"""
+
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import click
+from click.testing import CliRunner
+
+from borderlands.cli import borderlands
+
+SRC_PATH = Path(__file__).parent.parent / "src"
+# Modules that only the subcommands should pay for
+HEAVY_MODULES = ("polars", "prefect", "prefect_aws", "dotenv", "pydantic_settings")
+
+
+def test_help_is_lazy():
+    """Tests `borderlands --help` imports none of the subcommands' dependencies."""
+    code = (
+        "import sys, time\n"
+        "start = time.perf_counter()\n"
+        "from borderlands.cli import borderlands\n"
+        "borderlands(['--help'], standalone_mode=False)\n"
+        "print(time.perf_counter() - start)\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n"
+    )
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        env={**os.environ, "PYTHONPATH": str(SRC_PATH)},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    elapsed = time.perf_counter() - start
+    *_, startup, imported = result.stdout.splitlines()
+    print(
+        f"CLI startup took {float(startup):.3f}s ({elapsed:.3f}s with the interpreter)"
+    )
+    assert imported == ""
+
+
+def test_subcommands_load():
+    """Tests every lazy subcommand imports and is listed with its own help."""
+    ctx = click.Context(borderlands)
+    for name in borderlands.list_commands(ctx):
+        command = borderlands.get_command(ctx, name)
+        assert isinstance(command, click.Command)
+        help_ = borderlands.lazy_subcommands[name][1]
+        assert command.get_short_help_str(limit=len(help_)) == help_
+
+
+def test_subcommand_help():
+    """Tests subcommands are invoked through the lazy group."""
+    result = CliRunner().invoke(borderlands, ["sync", "--help"])
+    assert result.exit_code == 0
+    assert "--directory" in result.output
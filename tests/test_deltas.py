@@ -0,0 +1,50 @@
+"""
+Tests for the changes between Oryx snapshots.
+"""
+
+import datetime
+
+import polars as pl
+
+from borderlands.definitions import EquipmentLoss, OryxDelta
+from borderlands.deltas import compute_oryx_delta
+
+
+def test_compute_oryx_delta(losses: pl.DataFrame):
+    """Tests added, removed, and modified losses are found."""
+    previous = losses.head(-1)
+    current = losses.tail(-1).with_columns(
+        pl.when(pl.int_range(pl.len()) == 0)
+        .then(pl.lit("changed"))
+        .otherwise(pl.col(EquipmentLoss.description.name))
+        .alias(EquipmentLoss.description.name),
+        pl.lit(datetime.datetime(2023, 7, 24)).alias(EquipmentLoss.as_of_date.name),
+    )
+
+    df = compute_oryx_delta.fn(
+        previous,
+        current,
+        previous_as_of_date=datetime.datetime(2023, 7, 23),
+        as_of_date=datetime.datetime(2023, 7, 24),
+    )
+    assert df.columns == OryxDelta.columns()
+    changes = {row["change"]: row for row in df.iter_rows(named=True)}
+    assert len(df) == 3
+
+    assert changes["removed"]["case_id"] == losses[0, "case_id"]
+    assert changes["removed"]["url_hash"] == losses[0, "url_hash"]
+    assert changes["added"]["url_hash"] == losses[-1, "url_hash"]
+    assert changes["modified"]["url_hash"] == losses[1, "url_hash"]
+    assert changes["modified"]["changed_columns"] == ["description"]
+    assert changes["added"]["changed_columns"] == []
+
+
+def test_compute_oryx_delta_unchanged(losses: pl.DataFrame):
+    """Tests identical snapshots have no changes, even with new dates."""
+    df = compute_oryx_delta.fn(
+        losses,
+        losses.with_columns(pl.lit(datetime.datetime(2023, 7, 24)).alias("as_of_date")),
+        previous_as_of_date=datetime.datetime(2023, 7, 23),
+        as_of_date=datetime.datetime(2023, 7, 24),
+    )
+    assert df.is_empty()
@@ -0,0 +1,58 @@
+"""
+Tests for the loss history.
+"""
+
+import datetime
+
+import polars as pl
+
+from borderlands.definitions import EquipmentLoss, LossHistory
+from borderlands.history import get_latest_loss_history, update_loss_history
+
+
+def make_snapshot(url_hashes: list[str]) -> pl.DataFrame:
+    """Creates a minimal Oryx snapshot with a loss for each URL hash."""
+    return pl.DataFrame(
+        {
+            EquipmentLoss.country.name: ["Russia"] * len(url_hashes),
+            EquipmentLoss.category.name: ["Tanks"] * len(url_hashes),
+            EquipmentLoss.model.name: ["T-72B"] * len(url_hashes),
+            EquipmentLoss.url_hash.name: url_hashes,
+            EquipmentLoss.case_id.name: [1] * len(url_hashes),
+        },
+        schema=EquipmentLoss.schema(include=["dimension"]),
+    )
+
+
+def test_update_loss_history():
+    """Tests losses are added, kept, removed, and restored across snapshots."""
+    day_1 = datetime.datetime(2023, 7, 1)
+    day_2 = datetime.datetime(2023, 7, 2)
+    day_3 = datetime.datetime(2023, 7, 3)
+
+    history = pl.DataFrame(schema=LossHistory.schema())
+    history = update_loss_history.fn(history, make_snapshot(["a", "b"]), day_1)
+    assert history.shape == (2, len(LossHistory.columns()))
+    assert history[LossHistory.removed.name].null_count() == 2
+
+    history = update_loss_history.fn(history, make_snapshot(["a", "c"]), day_2)
+    rows = {r[LossHistory.url_hash.name]: r for r in history.to_dicts()}
+    assert rows["a"][LossHistory.first_seen.name] == day_1
+    assert rows["a"][LossHistory.last_seen.name] == day_2
+    assert rows["b"][LossHistory.last_seen.name] == day_1
+    assert rows["b"][LossHistory.removed.name] == day_2
+    assert rows["c"][LossHistory.first_seen.name] == day_2
+
+    history = update_loss_history.fn(history, make_snapshot(["b", "c"]), day_3)
+    rows = {r[LossHistory.url_hash.name]: r for r in history.to_dicts()}
+    assert rows["a"][LossHistory.removed.name] == day_3
+    assert rows["b"][LossHistory.first_seen.name] == day_1
+    assert rows["b"][LossHistory.last_seen.name] == day_3
+    assert rows["b"][LossHistory.removed.name] is None
+
+
+def test_get_latest_loss_history_without_release(mock_buckets):
+    """Tests an empty history is returned when there is no release yet."""
+    df = get_latest_loss_history.fn()
+    assert df.is_empty()
+    assert df.columns == LossHistory.columns()
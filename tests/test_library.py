@@ -0,0 +1,55 @@
+"""
+Tests for running the pipeline's steps without Prefect.
+"""
+
+import datetime
+import gzip
+from pathlib import Path
+
+import polars as pl
+import pytest
+from prefect_aws import S3Bucket
+
+from borderlands import library
+from borderlands.definitions import EquipmentLoss, Media
+from borderlands.snapshots import get_latest_pointer
+
+
+@pytest.fixture
+def pages(test_data_path: Path) -> list[tuple[str, str | None]]:
+    """The Oryx pages of the test snapshot."""
+    pages = []
+    for name, country in (
+        ("russia", "Russia"),
+        ("ukraine", "Ukraine"),
+        ("naval", None),
+        ("aircraft", None),
+    ):
+        with gzip.open(test_data_path / "pages" / f"{name}.html.gz", "rt") as f:
+            pages.append((f.read(), country))
+    return pages
+
+
+def test_process_pages(mock_buckets, bucket: S3Bucket, pages):
+    """Tests a snapshot is processed and uploaded outside of a flow run."""
+    dt = datetime.datetime(2023, 7, 23)
+    df = library.process_pages(pages, dt)
+    assert set(df.columns) >= set(EquipmentLoss.columns())
+    assert set(df[EquipmentLoss.country.name].unique()) == {"Russia", "Ukraine"}
+    assert df[EquipmentLoss.as_of_date.name].unique().to_list() == [dt]
+
+    key = library.upload_oryx(df, dt)
+    assert key == "oryx/year=2023/month=07/2023-07-23.parquet"
+    assert get_latest_pointer() is None
+
+    inventory = library.build_media_inventory(df)
+    assert inventory.columns == Media.columns()
+    assert set(inventory[Media.url_hash.name]) == set(
+        df[EquipmentLoss.url_hash.name].drop_nulls()
+    )
+    assert pl.read_parquet(bucket.read_path(key)).height == len(df)
+
+    # Planned keys are uploaded to as given
+    key = library.upload_oryx(df, dt, key="oryx/planned.parquet")
+    assert key == "oryx/planned.parquet"
+    assert pl.read_parquet(bucket.read_path(key)).height == len(df)
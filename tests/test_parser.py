@@ -2,8 +2,12 @@
 Tests for the article parser.
 """
 
+import gzip
+from pathlib import Path
 from typing import TYPE_CHECKING
 
+import polars as pl
+
 if TYPE_CHECKING:
     from borderlands.parser.article import ArticleParser
 
@@ -86,3 +90,22 @@ def test_russia_page_parse_result(russia_page_parse_result: list):
         for item in russia_page_parse_result
     )
     assert all(isinstance(item["category"], str) for item in russia_page_parse_result)
+
+
+def test_parse_oryx_web_page(test_data_path: Path):
+    """Tests pages parsed in the process pool match pages parsed in process."""
+    from borderlands.definitions import EquipmentLoss
+    from borderlands.oryx import parse_oryx_web_page
+    from borderlands.parser.article import RUSSIA_DATA_SECTION_INDEX
+    from borderlands.parser.parser import parse_page
+
+    with gzip.open(test_data_path / "pages" / "russia.html.gz", "rt") as f:
+        page = f.read()
+
+    expected = pl.from_dicts(
+        parse_page(page, RUSSIA_DATA_SECTION_INDEX), schema=EquipmentLoss.schema()
+    ).with_columns(pl.lit("Russia").alias(EquipmentLoss.country.name))
+    df = parse_oryx_web_page.fn(page, "Russia")
+    # Cases of a description are ordered by a set, which varies between processes
+    keys = [name for name, dtype in df.schema.items() if not dtype.is_nested()]
+    assert df.sort(keys).equals(expected.sort(keys))
@@ -0,0 +1,96 @@
+"""
+Tests for the Kaggle release.
+"""
+
+import datetime
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from prefect_aws import S3Bucket
+
+
+class FakeKaggleApi:
+    """Stand-in for the Kaggle API that records the uploaded versions."""
+
+    def __init__(self):
+        self.versions: list[list[str]] = []
+
+    def dataset_create_version(self, folder: str, **kwds):
+        self.versions.append(sorted(p.name for p in Path(folder).iterdir()))
+
+
+@pytest.fixture
+def staged_content() -> dict:
+    """The content of the staged dataset."""
+    return {"Oryx.json": "first"}
+
+
+@pytest.fixture
+def publish(monkeypatch, staged_content: dict):
+    """The publish flow module with staging replaced by small files."""
+    from flows import publish
+
+    def stage_datasets(staged, folder):
+        for name, content in staged_content.items():
+            (Path(folder) / name).write_text(content)
+
+    monkeypatch.setattr(publish, "stage_datasets", stage_datasets)
+    return publish
+
+
+def test_update_kaggle_dataset_skips_unchanged(
+    mock_buckets, bucket: S3Bucket, publish, staged_content: dict
+):
+    """Tests a version is only uploaded when the payload changes."""
+    api = FakeKaggleApi()
+    metadata = {
+        "description": "<!-- CATALOG BEGINS HERE -->\n<!-- CATALOG ENDS HERE -->"
+    }
+
+    date = datetime.date(2023, 7, 23)
+    assert publish.update_kaggle_dataset.fn(api, dict(metadata), date)
+    assert api.versions == [["Oryx.json", "dataset-metadata.json"]]
+    assert publish.get_last_release_hash() is not None
+
+    assert not publish.update_kaggle_dataset.fn(api, dict(metadata), date)
+    assert len(api.versions) == 1
+
+    staged_content["Oryx.json"] = "second"
+    assert publish.update_kaggle_dataset.fn(api, dict(metadata), date)
+    assert len(api.versions) == 2
+
+    metadata["description"] += "\nNew description"
+    assert publish.update_kaggle_dataset.fn(api, dict(metadata), date)
+    assert len(api.versions) == 3
+
+
+def test_import_is_lazy(tmp_path):
+    """Tests importing the flow neither loads the Kaggle credentials nor imports the
+    Kaggle library."""
+    src = Path(__file__).parent.parent / "src"
+    subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, flows.publish; assert 'kaggle' not in sys.modules",
+        ],
+        # An empty Prefect home has no secrets to load
+        env={**os.environ, "PYTHONPATH": str(src), "PREFECT_HOME": str(tmp_path)},
+        check=True,
+    )
+
+
+def test_get_kaggle_api(monkeypatch):
+    """Tests the client is authenticated with the secrets once and cached."""
+    from flows.publish import get_kaggle_api
+
+    # Restore the environment after the test
+    monkeypatch.setenv("KAGGLE_USERNAME", "")
+    monkeypatch.setenv("KAGGLE_KEY", "")
+    get_kaggle_api.cache_clear()
+    api = get_kaggle_api()
+    assert os.environ["KAGGLE_USERNAME"] == "username"
+    assert get_kaggle_api() is api
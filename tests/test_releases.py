@@ -0,0 +1,120 @@
+"""
+Tests for releasing datasets.
+"""
+
+import datetime
+import os
+
+import polars as pl
+from prefect_aws import AwsCredentials, S3Bucket
+
+from borderlands import releases
+from borderlands.definitions import EquipmentLoss, oryx
+from borderlands.releases import (
+    create_partition_key,
+    get_release_manifest,
+    release_manifest,
+    release_partitions,
+)
+from borderlands.utilities.multipart import MIN_PART_SIZE
+
+
+def test_create_partition_key():
+    """Tests partition values are escaped and nulls use Hive's default partition."""
+    assert (
+        create_partition_key(oryx, {"country": "Russia", "category": "Tanks"})
+        == "releases/oryx/country=Russia/category=Tanks/data.parquet"
+    )
+    assert (
+        create_partition_key(oryx, {"country": None, "category": "Trucks/Jeeps"})
+        == "releases/oryx/country=__HIVE_DEFAULT_PARTITION__/category=Trucks%2FJeeps/data.parquet"
+    )
+
+
+def test_release_partitions(mock_buckets, bucket: S3Bucket, losses: pl.DataFrame):
+    """Tests the partitions and manifest are written and stale partitions removed."""
+    manifest = release_partitions.fn(losses, oryx)
+    n = losses.select(oryx.partition_by).n_unique()
+    assert len(manifest["partitions"]) == n
+    assert sum(p["rows"] for p in manifest["partitions"]) == len(losses)
+    assert oryx.read_partition_manifest() == manifest
+
+    russia = oryx.partition_paths(EquipmentLoss.country.col == "Russia")
+    assert russia == [
+        p["path"] for p in manifest["partitions"] if p["values"]["country"] == "Russia"
+    ]
+    # Predicates on other fields cannot prune partitions
+    assert len(oryx.partition_paths(EquipmentLoss.model.col == "T-72B")) == n
+
+    # Lazy frames are partitioned the same way, one partition at a time
+    lazy = release_partitions.fn(losses.lazy(), oryx)
+    assert sorted(lazy["partitions"], key=lambda p: p["path"]) == sorted(
+        manifest["partitions"], key=lambda p: p["path"]
+    )
+
+    # Releasing a subset removes the partitions that no longer exist
+    subset = losses.filter(EquipmentLoss.country.col == "Russia")
+    release_partitions.fn(subset, oryx)
+    keys = [o["Key"] for o in bucket.list_objects(oryx.partition_folder)]
+    assert sorted(keys) == sorted(russia + [oryx.partition_manifest_path])
+
+
+def test_copy_object(mock_buckets, bucket: S3Bucket, monkeypatch):
+    """Tests large objects are copied server-side in parts."""
+    monkeypatch.setattr(releases, "COPY_PART_SIZE", MIN_PART_SIZE)
+    content = os.urandom(2 * MIN_PART_SIZE + 1024)
+    bucket.write_path("large.bin", content)
+
+    key = releases.copy_object(bucket, "large.bin", bucket, "releases/large.bin")
+    assert key == "releases/large.bin"
+    assert bucket.read_path(key) == content
+    head = bucket.credentials.get_s3_client().head_object(
+        Bucket=bucket.bucket_name, Key=key
+    )
+    # Multipart ETags end with the number of parts
+    assert head["ETag"].strip('"').endswith("-3")
+
+
+def test_copy_object_across_accounts(mock_buckets, bucket: S3Bucket):
+    """Tests objects are streamed when the buckets do not share credentials."""
+    other = S3Bucket(
+        bucket_name=bucket.bucket_name,
+        credentials=AwsCredentials(
+            aws_access_key_id="other", aws_secret_access_key="other"
+        ),
+    )
+    assert not releases.is_same_account(bucket, other)
+    bucket.write_path("small.txt", b"content")
+    key = releases.copy_object(bucket, "small.txt", other, "releases/small.txt")
+    assert bucket.read_path(key) == b"content"
+
+
+def test_release_manifest(mock_buckets, bucket: S3Bucket, losses: pl.DataFrame):
+    """Tests the manifest describes the release."""
+    assert get_release_manifest(oryx) is None
+
+    content = bucket.read_path("oryx/year=2023/month=07/2023-07-23.parquet")
+    bucket.write_path(oryx.release_path, content)
+    release_manifest.fn(losses, oryx)
+
+    manifest = get_release_manifest(oryx)
+    assert oryx.manifest_path == "releases/oryx.manifest.json"
+    assert manifest["rows"] == 9
+    # The size comes from the release's metadata and the hash from its content
+    assert manifest["bytes"] == len(content)
+    assert manifest["content_hash"] == releases.compute_release_hash(losses, oryx)
+    assert manifest["ranges"]["as_of_date"] == {
+        "min": "2023-07-23T07:27:22",
+        "max": "2023-07-23T07:27:22",
+    }
+    assert manifest["distinct"]["country"] == 2
+    assert manifest["partition_manifest"] == "releases/oryx/_manifest.json"
+
+    # Lazy frames are collected, and a new as of date keeps the content hash
+    later = losses.with_columns(
+        EquipmentLoss.as_of_date.col + datetime.timedelta(days=1)
+    )
+    assert (
+        release_manifest.fn(later.lazy(), oryx)["content_hash"]
+        == manifest["content_hash"]
+    )
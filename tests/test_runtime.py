@@ -0,0 +1,41 @@
+"""
+Tests for the runtime profile.
+"""
+
+from borderlands.runtime import RuntimeProfile, RuntimeSettings
+
+
+def test_detect_small_task():
+    """Tests a half-CPU, 1 GiB task keeps the previous fixed sizes."""
+    profile = RuntimeProfile.detect(RuntimeSettings(cpus=0.5, memory_bytes=1024**3))
+    assert profile.threads == 1
+    assert profile.process_workers == 1
+    assert profile.download_concurrency == 10
+    assert profile.max_connections == 20
+    assert profile.max_keepalive_connections == 10
+    assert 50_000 <= profile.batch_size <= 60_000
+
+
+def test_detect_scales():
+    """Tests concurrency grows with CPUs and memory, and is bounded by memory."""
+    large = RuntimeProfile.detect(RuntimeSettings(cpus=4, memory_bytes=16 * 1024**3))
+    assert large.threads == 4
+    assert large.process_workers == 4
+    assert large.download_concurrency == 40
+    assert large.batch_size > 500_000 // 2
+
+    starved = RuntimeProfile.detect(RuntimeSettings(cpus=4, memory_bytes=128 * 1024**2))
+    assert starved.download_concurrency == 2
+    assert starved.batch_size == 10_000
+
+
+def test_detect_overrides(monkeypatch):
+    """Tests the BORDERLANDS_RUNTIME_ settings override the detected sizes."""
+    monkeypatch.setenv("BORDERLANDS_RUNTIME_DOWNLOAD_CONCURRENCY", "3")
+    monkeypatch.setenv("BORDERLANDS_RUNTIME_PROCESS_WORKERS", "2")
+    monkeypatch.setenv("BORDERLANDS_RUNTIME_BATCH_SIZE", "1000")
+    profile = RuntimeProfile.detect(RuntimeSettings())
+    assert profile.download_concurrency == 3
+    assert profile.max_connections == 6
+    assert profile.process_workers == 2
+    assert profile.batch_size == 1000
@@ -0,0 +1,69 @@
+"""
+Tests for the content deduplication of the Oryx snapshots.
+"""
+
+import datetime
+
+import polars as pl
+from prefect_aws import S3Bucket
+
+from borderlands.definitions import EquipmentLoss
+from borderlands.snapshots import compute_content_hash, get_latest_pointer
+
+
+def test_compute_content_hash(losses: pl.DataFrame):
+    """Tests the hash ignores row order, column order, and the as of date."""
+    content_hash = compute_content_hash(losses)
+    shuffled = losses.reverse().select(reversed(losses.columns))
+    assert compute_content_hash(shuffled) == content_hash
+
+    later = losses.with_columns(
+        pl.col(EquipmentLoss.as_of_date.name) + datetime.timedelta(days=1)
+    )
+    assert compute_content_hash(later) == content_hash
+
+    assert compute_content_hash(losses.head(-1)) != content_hash
+
+
+def test_upload_deduplicates(mock_buckets, bucket: S3Bucket, losses: pl.DataFrame):
+    """Tests unchanged snapshots only move the latest pointer."""
+    from flows.oryx import upload
+
+    first = upload.fn(losses, datetime.datetime(2023, 7, 24))
+    assert first.changed
+    assert first.previous_key is None
+    assert first.key == "oryx/year=2023/month=07/2023-07-24.parquet"
+
+    second = upload.fn(losses, datetime.datetime(2023, 7, 25))
+    assert not second.changed
+    assert second.key == first.key
+    assert not any(
+        o["Key"].endswith("2023-07-25.parquet") for o in bucket.list_objects()
+    )
+
+    pointer = get_latest_pointer()
+    assert pointer["key"] == first.key
+    assert pointer["as_of_date"] == "2023-07-24T00:00:00"
+    assert pointer["checked_at"] == "2023-07-25T00:00:00"
+
+    third = upload.fn(losses.head(-1), datetime.datetime(2023, 7, 26))
+    assert third.changed
+    assert third.previous_key == first.key
+    assert get_latest_pointer()["key"] == third.key
+
+
+def test_plan_snapshot(mock_buckets, bucket: S3Bucket, losses: pl.DataFrame):
+    """Tests planning a snapshot writes nothing, so it can run before the upload."""
+    from flows.oryx import plan_snapshot, write_snapshot
+
+    dt = datetime.datetime(2023, 7, 24)
+    snapshot = plan_snapshot.fn(losses, dt)
+    assert snapshot.changed
+    assert snapshot.key == "oryx/year=2023/month=07/2023-07-24.parquet"
+    assert get_latest_pointer() is None
+    assert not any(o["Key"] == snapshot.key for o in bucket.list_objects())
+
+    assert write_snapshot.fn(losses, snapshot, dt) == snapshot
+    assert get_latest_pointer()["key"] == snapshot.key
+    assert pl.read_parquet(bucket.read_path(snapshot.key)).height == len(losses)
+    assert not plan_snapshot.fn(losses, dt + datetime.timedelta(days=1)).changed
@@ -0,0 +1,35 @@
+"""
+Tests for staging releases in several formats.
+"""
+
+import json
+
+import polars as pl
+from prefect_aws import S3Bucket
+
+from borderlands.definitions import EquipmentLoss, oryx
+from borderlands.schema import Tag
+from borderlands.staging import FORMATS, MANIFEST_FILE, StagedDataset, stage_datasets
+
+
+def test_stage_datasets(mock_buckets, bucket: S3Bucket, tmp_path):
+    """Tests every format is staged from the release and listed in the manifest."""
+    bucket.copy_object("oryx/year=2023/month=07/2023-07-23.parquet", oryx.release_path)
+    staged = StagedDataset(oryx, exclude=[Tag.metadata, Tag.debug])
+    columns = EquipmentLoss.columns(exclude=[Tag.metadata, Tag.debug])
+
+    manifest = stage_datasets([staged], tmp_path, max_workers=2)
+    assert [f["format"] for f in manifest["files"]] == list(FORMATS)
+    assert all(f["rows"] == 9 for f in manifest["files"])
+    assert json.loads((tmp_path / MANIFEST_FILE).read_text()) == manifest
+
+    expected = pl.read_parquet(tmp_path / "Oryx.parquet")
+    assert expected.columns == columns
+    assert pl.read_ipc(tmp_path / "Oryx.arrow").equals(expected)
+    assert pl.read_ndjson(tmp_path / "Oryx.ndjson").equals(expected)
+    assert json.loads((tmp_path / "Oryx.json").read_text()) == expected.to_dicts()
+
+    csv = pl.read_csv(tmp_path / "Oryx.csv")
+    assert csv[EquipmentLoss.status.name].to_list() == [
+        ";".join(status) for status in expected[EquipmentLoss.status.name]
+    ]
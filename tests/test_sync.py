@@ -0,0 +1,77 @@
+"""
+Tests for the local mirror of the releases.
+"""
+
+import datetime
+
+import polars as pl
+from prefect_aws import S3Bucket
+
+from borderlands.definitions import EquipmentLoss, oryx
+from borderlands.releases import release_manifest, release_partitions
+from borderlands.schema import Tag
+from borderlands.sync import LocalMirror
+
+
+def release(df: pl.DataFrame, bucket: S3Bucket, content: bytes):
+    """Releases the frame's partitions and manifest."""
+    bucket.write_path(oryx.release_path, content)
+    release_partitions.fn(df, oryx)
+    release_manifest.fn(df, oryx)
+
+
+def test_sync(mock_buckets, bucket: S3Bucket, losses: pl.DataFrame, tmp_path):
+    """Tests only the changed partitions are fetched."""
+    mirror = LocalMirror(tmp_path, bucket)
+    partitions = losses.select(oryx.partition_by).n_unique()
+
+    release(losses, bucket, b"first")
+    result = mirror.sync(oryx)
+    assert result.fetched == partitions
+    dimensions = EquipmentLoss.columns(include=[Tag.dimension])
+    assert mirror.scan(oryx).collect().sort(dimensions).equals(losses.sort(dimensions))
+
+    result = mirror.sync(oryx)
+    assert result.fetched == 0
+    assert result.unchanged == partitions
+
+    # Drop one partition and change another
+    first, second = (
+        losses.select(oryx.partition_by).unique(maintain_order=True).rows()[:2]
+    )
+    changed = losses.filter(
+        ~((pl.col("country") == first[0]) & (pl.col("category") == first[1]))
+    ).with_columns(
+        pl.when((pl.col("country") == second[0]) & (pl.col("category") == second[1]))
+        .then(pl.lit("changed"))
+        .otherwise(pl.col("description"))
+        .alias("description")
+    )
+    release(changed, bucket, b"second")
+    result = mirror.sync(oryx)
+    assert result.fetched == 1
+    assert result.removed == 1
+    assert result.unchanged == partitions - 2
+    assert len(mirror.scan(oryx).collect()) == len(changed)
+
+
+def test_sync_next_day(mock_buckets, bucket: S3Bucket, losses: pl.DataFrame, tmp_path):
+    """Tests a new `as_of_date` alone does not refetch the partitions."""
+    mirror = LocalMirror(tmp_path, bucket)
+    partitions = losses.select(oryx.partition_by).n_unique()
+    release(losses, bucket, b"first")
+    mirror.sync(oryx)
+
+    first = losses.select(oryx.partition_by).row(0)
+    next_day = losses.with_columns(
+        pl.col("as_of_date") + datetime.timedelta(days=1),
+        pl.when((pl.col("country") == first[0]) & (pl.col("category") == first[1]))
+        .then(pl.lit("changed"))
+        .otherwise(pl.col("description"))
+        .alias("description"),
+    )
+    release(next_day, bucket, b"second")
+    result = mirror.sync(oryx)
+    assert result.fetched == 1
+    assert result.unchanged == partitions - 1
+    assert result.unchanged > 0
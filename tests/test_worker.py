@@ -0,0 +1,96 @@
+"""
+Tests for the warm worker and the resources it reuses between runs.
+"""
+
+import asyncio
+import threading
+
+from prefect_aws import S3Bucket
+
+from borderlands import assets
+from borderlands.blocks import blocks, load_bucket
+from borderlands.utilities import cache, web
+from borderlands.worker import Worker
+
+
+def test_worker_runs_when_triggered():
+    """Tests the worker runs once per trigger, survives failures, and stops."""
+    ran = threading.Event()
+    calls = []
+
+    def flow():
+        calls.append(len(calls))
+        ran.set()
+        if len(calls) == 1:
+            raise RuntimeError("The first run fails")
+
+    worker = Worker(flow)
+    thread = threading.Thread(target=worker.run, kwargs={"run_on_start": True})
+    thread.start()
+    assert ran.wait(5)
+    ran.clear()
+    worker.trigger()
+    assert ran.wait(5)
+    worker.stop()
+    thread.join(5)
+    assert not thread.is_alive()
+    assert worker.runs == 2
+
+
+def test_worker_runs_on_interval():
+    """Tests the worker runs without a trigger once the interval passes."""
+    ran = threading.Event()
+    worker = Worker(ran.set, interval=0.01)
+    thread = threading.Thread(target=worker.run)
+    thread.start()
+    assert ran.wait(5)
+    worker.stop()
+    thread.join(5)
+    assert not thread.is_alive()
+
+
+def test_load_bucket(bucket: S3Bucket):
+    """Tests the pipeline's bucket is reused rather than loaded again."""
+    assert load_bucket(blocks.bucket_block_name) is blocks.bucket
+    assert load_bucket(blocks.bucket_block_name) is load_bucket(
+        blocks.bucket_block_name
+    )
+
+
+def test_get_client():
+    """Tests requests in a loop share a client and each loop gets its own."""
+
+    async def get_clients():
+        first, second = web.get_client(), web.get_client()
+        await web.close_client()
+        return first, second
+
+    first, second = asyncio.run(get_clients())
+    assert first is second
+    assert first.is_closed
+    third, _ = asyncio.run(get_clients())
+    assert third is not first
+
+
+def test_client_scope():
+    """Tests scopes in a loop share a client that is closed when the last one exits."""
+
+    async def scoped():
+        async with web.client_scope() as outer:
+            async with web.client_scope() as inner:
+                assert inner is outer
+            assert not outer.is_closed
+        return outer
+
+    assert asyncio.run(scoped()).is_closed
+
+
+def test_get_asset_is_memoized(mock_buckets, monkeypatch, tmp_path):
+    """Tests unchanged assets are read from memory after the first call."""
+    monkeypatch.setattr(cache.settings, "enabled", True)
+    monkeypatch.setattr(cache, "cache", cache.LocalCache(tmp_path, 1024**2))
+    assets.read_cached_asset.cache_clear()
+
+    first = assets.get_asset("category_corrections.csv")
+    assert assets.get_asset("category_corrections.csv") == first
+    assert assets.read_cached_asset.cache_info().hits == 1
@@ -0,0 +1,59 @@
+"""
+Tests for the local read cache.
+"""
+
+from pathlib import Path
+
+import pytest
+from prefect_aws import S3Bucket
+
+from borderlands.utilities.cache import LocalCache
+
+
+@pytest.fixture
+def local_cache(tmp_path: Path) -> LocalCache:
+    """A local cache in a temporary directory."""
+    return LocalCache(tmp_path / "cache", max_bytes=1024)
+
+
+def test_cache_revalidates(mock_buckets, bucket: S3Bucket, local_cache: LocalCache):
+    """Tests cached objects are reused until the object changes."""
+    bucket.write_path("test.txt", b"first")
+    path = local_cache.get(bucket, "test.txt")
+    assert path.read_bytes() == b"first"
+
+    # The entry is reused rather than downloaded again
+    inode = path.stat().st_ino
+    assert local_cache.get(bucket, "test.txt") == path
+    assert path.stat().st_ino == inode
+
+    bucket.write_path("test.txt", b"second")
+    changed = local_cache.get(bucket, "test.txt")
+    assert changed != path
+    assert changed.read_bytes() == b"second"
+
+    # Copies of an object share the same entry
+    client = bucket.credentials.get_s3_client()
+    client.copy_object(
+        CopySource={"Bucket": bucket.bucket_name, "Key": "test.txt"},
+        Bucket=bucket.bucket_name,
+        Key="copy.txt",
+    )
+    assert local_cache.get(bucket, "copy.txt") == changed
+
+
+def test_cache_evicts_least_recently_used(
+    mock_buckets, bucket: S3Bucket, local_cache: LocalCache
+):
+    """Tests the least recently used entries are evicted to fit the size limit."""
+    for name in ("a", "b", "c"):
+        bucket.write_path(name, name.encode() * 400)
+
+    a = local_cache.get(bucket, "a")
+    b = local_cache.get(bucket, "b")
+    # Use 'a' so 'b' is the least recently used
+    local_cache.get(bucket, "a")
+    c = local_cache.get(bucket, "c")
+
+    assert not b.exists()
+    assert a.exists() and c.exists()
@@ -0,0 +1,45 @@
+"""
+Tests for reading the container's limits from its cgroup.
+"""
+
+from pathlib import Path
+
+from borderlands.utilities import cgroup
+
+
+def test_read_limits_v2(tmp_path: Path):
+    """Tests the cgroup v2 limits of an ECS task with 512 CPU units and 1 GiB."""
+    (tmp_path / "cpu.max").write_text("50000 100000\n")
+    (tmp_path / "memory.max").write_text(f"{1024**3}\n")
+    assert cgroup.read_cpu_limit(tmp_path) == 0.5
+    assert cgroup.read_memory_limit(tmp_path) == 1024**3
+    assert cgroup.get_cpu_count(tmp_path) == 0.5
+    assert cgroup.get_thread_count(root=tmp_path) == 1
+
+    (tmp_path / "cpu.max").write_text("max 100000\n")
+    (tmp_path / "memory.max").write_text("max\n")
+    assert cgroup.read_cpu_limit(tmp_path) is None
+    assert cgroup.read_memory_limit(tmp_path) is None
+
+
+def test_read_limits_v1(tmp_path: Path):
+    """Tests the cgroup v1 limits, where -1 and huge values mean unlimited."""
+    (tmp_path / "cpu").mkdir()
+    (tmp_path / "memory").mkdir()
+    (tmp_path / "cpu" / "cpu.cfs_quota_us").write_text("200000\n")
+    (tmp_path / "cpu" / "cpu.cfs_period_us").write_text("100000\n")
+    (tmp_path / "memory" / "memory.limit_in_bytes").write_text(f"{512 * 1024**2}\n")
+    assert cgroup.read_cpu_limit(tmp_path) == 2
+    assert cgroup.read_memory_limit(tmp_path) == 512 * 1024**2
+
+    (tmp_path / "cpu" / "cpu.cfs_quota_us").write_text("-1\n")
+    (tmp_path / "memory" / "memory.limit_in_bytes").write_text("9223372036854771712\n")
+    assert cgroup.read_cpu_limit(tmp_path) is None
+    assert cgroup.read_memory_limit(tmp_path) is None
+
+
+def test_missing_cgroup(tmp_path: Path):
+    """Tests the host's resources are used outside a container."""
+    assert cgroup.read_cpu_limit(tmp_path) is None
+    assert cgroup.get_cpu_count(tmp_path) >= 1
+    assert cgroup.get_memory(tmp_path) > 0
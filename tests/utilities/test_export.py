@@ -0,0 +1,57 @@
+"""
+Tests for the streaming JSON exports.
+"""
+
+import gzip
+import json
+
+import polars as pl
+import pytest
+
+from borderlands.utilities.export import write_json
+
+
+@pytest.fixture
+def df() -> pl.DataFrame:
+    """A frame spanning several batches."""
+    return pl.DataFrame(
+        {
+            "foo": list(range(25)),
+            "bar": ["line\nbreak" if i % 5 == 0 else None for i in range(25)],
+            "baz": [["a", "b"]] * 25,
+        }
+    )
+
+
+def test_write_ndjson(df: pl.DataFrame, tmp_path):
+    """Tests batches are written as newline-delimited JSON."""
+    path = tmp_path / "test.ndjson"
+    write_json(df.lazy(), path, batch_size=10)
+    assert pl.read_ndjson(path).equals(df)
+
+
+def test_write_json_array(df: pl.DataFrame, tmp_path):
+    """Tests batches are joined into one JSON array."""
+    path = tmp_path / "test.json"
+    write_json(df.lazy(), path, lines=False, batch_size=10)
+    assert json.loads(path.read_text()) == df.to_dicts()
+
+    path = tmp_path / "empty.json"
+    write_json(df.clear().lazy(), path, lines=False)
+    assert json.loads(path.read_text()) == []
+
+
+def test_write_json_gzip(df: pl.DataFrame, tmp_path):
+    """Tests batches compressed in parallel decompress as one stream."""
+    path = tmp_path / "test.json.gz"
+    write_json(
+        df.lazy(), path, lines=False, compression="gzip", batch_size=4, max_workers=3
+    )
+    with gzip.open(path, "rt") as f:
+        assert json.load(f) == df.to_dicts()
+
+
+def test_write_json_unknown_compression(df: pl.DataFrame, tmp_path):
+    """Tests unknown codecs are rejected."""
+    with pytest.raises(ValueError):
+        write_json(df.lazy(), tmp_path / "test.json", compression="brotli")
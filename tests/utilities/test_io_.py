@@ -0,0 +1,45 @@
+"""
+Tests for the input/output utilities.
+"""
+
+import polars as pl
+from prefect_aws import AwsCredentials, S3Bucket
+from prefect_aws.client_parameters import AwsClientParameters
+
+from borderlands.utilities import io_
+
+
+def test_get_storage_options():
+    """Tests the bucket's credentials are passed to Polars' S3 reader."""
+    bucket = S3Bucket(
+        bucket_name="borderlands-core",
+        credentials=AwsCredentials(
+            aws_access_key_id="key-id",
+            aws_secret_access_key="secret",
+            region_name="us-east-2",
+            aws_client_parameters=AwsClientParameters(
+                endpoint_url="http://localhost:9000"
+            ),
+        ),
+    )
+    assert io_.get_storage_options(bucket) == {
+        "aws_access_key_id": "key-id",
+        "aws_secret_access_key": "secret",
+        "aws_region": "us-east-2",
+        "aws_endpoint_url": "http://localhost:9000",
+    }
+
+
+def test_scan_parquet(endpoint_bucket: S3Bucket, test_data_path):
+    """Tests scans only fetch the ranges of the object the query needs."""
+    from tests.conftest import MockS3Handler
+
+    key = "oryx/year=2023/month=07/2023-07-23.parquet"
+    expected = pl.read_parquet(test_data_path / "buckets/borderlands-core" / key)
+
+    lf = io_.scan_parquet(endpoint_bucket, key)
+    df = lf.filter(pl.col("country") == "Russia").select("country", "model").collect()
+    assert df.equals(
+        expected.filter(pl.col("country") == "Russia").select("country", "model")
+    )
+    assert MockS3Handler.ranges and None not in MockS3Handler.ranges
@@ -0,0 +1,55 @@
+"""
+Tests for the streaming multipart uploads.
+"""
+
+import io
+import os
+
+import polars as pl
+import pytest
+from prefect_aws import S3Bucket
+
+from borderlands.utilities.multipart import (
+    MIN_PART_SIZE,
+    MultipartWriter,
+    upload_parquet,
+)
+
+
+def test_multipart_writer(mock_buckets, bucket: S3Bucket):
+    """Tests content spanning several parts is uploaded intact."""
+    content = os.urandom(2 * MIN_PART_SIZE + 1024)
+    with MultipartWriter(bucket, "test.bin", part_size=MIN_PART_SIZE) as f:
+        # Write in chunks that do not align with the parts
+        for i in range(0, len(content), 1_000_000):
+            f.write(content[i : i + 1_000_000])
+
+    assert bucket.read_path("test.bin") == content
+    assert f.bytes_written == len(content)
+
+
+def test_multipart_writer_small_object(mock_buckets, bucket: S3Bucket):
+    """Tests objects smaller than a part are uploaded without a multipart upload."""
+    with MultipartWriter(bucket, "test.txt") as f:
+        f.write(b"small")
+    assert bucket.read_path("test.txt") == b"small"
+
+
+def test_multipart_writer_aborts(mock_buckets, bucket: S3Bucket):
+    """Tests a failed write leaves no object or incomplete upload behind."""
+    with pytest.raises(RuntimeError):
+        with MultipartWriter(bucket, "test.bin", part_size=MIN_PART_SIZE) as f:
+            f.write(os.urandom(MIN_PART_SIZE + 1))
+            raise RuntimeError("Failed while writing")
+
+    client = bucket.credentials.get_s3_client()
+    assert not any(o["Key"] == "test.bin" for o in bucket.list_objects())
+    assert not client.list_multipart_uploads(Bucket=bucket.bucket_name).get("Uploads")
+
+
+def test_upload_parquet(mock_buckets, bucket: S3Bucket):
+    """Tests a DataFrame is streamed to the bucket as parquet."""
+    df = pl.DataFrame({"foo": [1, 2, 3], "bar": ["a", "b", "c"]})
+    key = upload_parquet(df, "test.parquet", bucket, compression="zstd")
+    assert key == "test.parquet"
+    assert pl.read_parquet(io.BytesIO(bucket.read_path(key))).equals(df)
@@ -0,0 +1,122 @@
+"""
+Tests for the persisted, content-keyed task results.
+"""
+
+import datetime
+import gzip
+from pathlib import Path
+from unittest import mock
+
+import polars as pl
+from prefect import flow, task
+from prefect.serializers import Serializer
+from prefect_aws import S3Bucket
+
+from borderlands.utilities.results import (
+    ParquetSerializer,
+    cached_result_options,
+    get_code_version,
+    hash_frame,
+)
+
+calls = []
+
+
+@task(**cached_result_options(ParquetSerializer()))
+def double(df: pl.DataFrame) -> pl.DataFrame:
+    calls.append(len(df))
+    return df.with_columns(pl.col("a") * 2)
+
+
+@flow
+def double_flow(df: pl.DataFrame) -> pl.DataFrame:
+    return double(df)
+
+
+def test_parquet_serializer():
+    """Tests frames round trip and the serializer is found by its type."""
+    df = pl.DataFrame({"a": [1, 2], "b": [["x"], []]})
+    serializer = Serializer(type="parquet")
+    assert isinstance(serializer, ParquetSerializer)
+    assert serializer.loads(serializer.dumps(df)).equals(df)
+
+
+def test_hash_frame():
+    """Tests the hash follows the content rather than the object."""
+    df = pl.DataFrame({"a": [1, 2], "b": ["x", None]})
+    assert hash_frame(df) == hash_frame(df.clone())
+    assert hash_frame(df) != hash_frame(df.reverse())
+    assert hash_frame(df) != hash_frame(df.with_columns(pl.col("a").cast(pl.Int32)))
+
+    # Nested columns are hashed too
+    df = pl.DataFrame(
+        {"a": [1, 2], "b": [["x"], None]}, schema={"a": pl.Int64, "b": pl.List(pl.Utf8)}
+    )
+    assert hash_frame(df) == hash_frame(df.clone())
+    assert hash_frame(df) != hash_frame(df.with_columns(pl.col("b").fill_null([])))
+
+
+def test_get_code_version():
+    """Tests the code version follows the source of every module."""
+    version = get_code_version("borderlands.oryx")
+    assert get_code_version("borderlands.oryx") == version
+    assert get_code_version("borderlands.oryx", "borderlands.parser.parser") != version
+
+
+def test_cached_result(mock_buckets, bucket: S3Bucket):
+    """Tests a rerun with the same content loads the persisted result."""
+    calls.clear()
+    df = pl.DataFrame({"a": [1, 2]})
+    first = double_flow(df)
+    second = double_flow(df.clone())
+    assert calls == [2]
+    assert second.equals(first)
+    assert any(o["Key"].startswith("results/double/") for o in bucket.list_objects())
+
+    double_flow(df.head(1))
+    assert calls == [2, 1]
+
+
+def test_asset_cache_key(mock_buckets, bucket: S3Bucket):
+    """Tests the asset loaders' cache keys change with the asset."""
+    from borderlands.assets import get_asset_version
+
+    version = get_asset_version("category_corrections.csv")
+    assert get_asset_version("category_corrections.csv") == version
+    bucket.write_path("assets/category_corrections.csv", b"old,new\n")
+    assert get_asset_version("category_corrections.csv") != version
+
+
+def test_cached_pre_processing(
+    mock_buckets, test_data_path: Path, flag_url_mapper: dict[str, str]
+):
+    """Tests the pre-processing task is keyed by its parsed page inside a flow, so
+    runs on other dates reuse it."""
+    from borderlands.assets import get_category_corrections
+    from borderlands.definitions import EquipmentLoss
+    from borderlands.oryx import (
+        assign_as_of_date,
+        parse_oryx_page,
+        pre_process_dataframe,
+    )
+
+    with gzip.open(test_data_path / "pages" / "ukraine.html.gz", "rt") as f:
+        df = parse_oryx_page(f.read(), "Ukraine")
+    assert df.schema[EquipmentLoss.status.name] == pl.List(pl.Utf8)
+
+    @flow
+    def pre_process_flow(df: pl.DataFrame, dt: datetime.datetime) -> pl.DataFrame:
+        df = pre_process_dataframe(df, flag_url_mapper, get_category_corrections.fn())
+        return assign_as_of_date(df, dt)
+
+    first = pre_process_flow(df, datetime.datetime(2023, 7, 23, 1))
+    assert len(first) == len(df)
+    with mock.patch("borderlands.oryx.assign_status") as assign_status:
+        second = pre_process_flow(df.clone(), datetime.datetime(2023, 7, 23, 2))
+    assign_status.assert_not_called()
+    assert second.drop(EquipmentLoss.as_of_date.name).equals(
+        first.drop(EquipmentLoss.as_of_date.name)
+    )
+    assert second[EquipmentLoss.as_of_date.name].unique().to_list() == [
+        datetime.datetime(2023, 7, 23, 2)
+    ]
@@ -0,0 +1,85 @@
+"""
+Tests for the function wrappers.
+"""
+
+import asyncio
+import collections
+
+import polars as pl
+import pytest
+
+from borderlands.oryx import assign_status
+from borderlands.utilities import wrappers
+
+
+@pytest.fixture
+def instrumentation():
+    """Enables instrumentation for the test."""
+    wrappers.pop_stage_metrics()
+    enabled = wrappers.instrumentation_enabled()
+    wrappers.enable_instrumentation()
+    yield
+    wrappers.enable_instrumentation(enabled)
+    wrappers.pop_stage_metrics()
+
+
+def test_instrument_disabled():
+    """Tests disabled instrumentation records nothing and leaves lazy frames lazy."""
+    enabled = wrappers.instrumentation_enabled()
+    wrappers.enable_instrumentation(False)
+    wrappers.pop_stage_metrics()
+    lf = assign_status(pl.DataFrame({"description": ["1, destroyed"]}))
+    assert isinstance(lf, pl.LazyFrame)
+    assert wrappers.pop_stage_metrics() == []
+    wrappers.enable_instrumentation(enabled)
+
+
+def test_instrument_pipe(instrumentation):
+    """Tests a lazy pipe is measured by the rows it takes and returns."""
+    df = pl.DataFrame({"description": ["1, destroyed", "2, damaged and captured"]})
+    lf = df.lazy().pipe(assign_status)
+    assert isinstance(lf, pl.LazyFrame)
+    assert lf.collect()["status"].to_list() == [["destroyed"], ["captured", "damaged"]]
+
+    (metrics,) = wrappers.pop_stage_metrics()
+    assert metrics.stage == "oryx.assign_status"
+    assert metrics.rows_in == metrics.rows_out == 2
+    assert metrics.bytes_out > 0
+    assert metrics.wall_seconds >= 0
+    assert metrics.peak_rss_delta >= 0
+
+
+def test_instrument_coroutine(instrumentation):
+    """Tests coroutines are measured and stages are totaled in the summary."""
+
+    @wrappers.instrument(name="upload")
+    async def upload(content: bytes) -> str:
+        await asyncio.sleep(0)
+        return "key"
+
+    for _ in range(3):
+        assert asyncio.run(upload(b"12345")) == "key"
+
+    (summary,) = wrappers.summarize_stage_metrics(wrappers.pop_stage_metrics())
+    assert summary["stage"] == "upload"
+    assert summary["calls"] == 3
+    assert summary["bytes_in"] == 15
+    assert summary["rows_in"] is None
+
+
+def test_collect_stage_metrics(instrumentation, monkeypatch):
+    """Tests collected metrics are kept apart and the uncollected ones are capped."""
+
+    @wrappers.instrument(name="stage")
+    def stage() -> None:
+        pass
+
+    with wrappers.collect_stage_metrics() as metrics:
+        stage()
+    assert [m.stage for m in metrics] == ["stage"]
+    assert wrappers.pop_stage_metrics() == []
+
+    monkeypatch.setattr(wrappers._recorder, "metrics", collections.deque(maxlen=2))
+    for _ in range(3):
+        stage()
+    assert len(wrappers.pop_stage_metrics()) == 2